@@ -1,4 +1,7 @@
+import json
+from typing import Optional
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from app.models.chat_dto import ChatRequest
 from app.services.implementation.chat_service import ChatService
 from app.services.interfaces.chat_service import IChatService
@@ -8,7 +11,41 @@ router = APIRouter()
 chat_service: IChatService = ChatService()
 
 
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
 @router.post("/", summary="Send a message and get AI response")
-def chat(req: ChatRequest):
-    reply = chat_service.get_response(req.user_id, req.message)
+async def chat(req: ChatRequest):
+    reply = await chat_service.get_response(req.user_id, req.message)
     return {"response": reply}
+
+
+@router.post("/stream", summary="Send a message and stream the AI response (SSE)")
+async def chat_stream(req: ChatRequest):
+    """Server-sent events: one `data: {"token": ...}` per generated token, then
+    `event: done` with the full response, or `event: error`."""
+
+    async def events():
+        tokens = []
+        try:
+            async for token in chat_service.stream_response(req.user_id, req.message):
+                tokens.append(token)
+                yield _sse({"token": token})
+        except Exception as e:
+            yield _sse({"error": str(e) or type(e).__name__}, event="error")
+            return
+        yield _sse({"response": "".join(tokens)}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/metrics", summary="Cache and session counters of the chatbot")
+def chat_metrics():
+    return chat_service.get_metrics()
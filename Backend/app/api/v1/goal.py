@@ -1,47 +1,51 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from uuid import UUID
 from typing import List
+from app.core.user_versions import conditional_get
 from app.models.goal_dto import CreateGoalRequest, GoalResponse, UpdateGoalRequest
-from app.services.implementation.goal_service import GoalService
-from app.infrastructure.implementation.goal_repository import GoalRepository
-from app.services.interfaces.goal_service import IGoalService
+from app.services.implementation.goal_service import AsyncGoalService
+from app.infrastructure.implementation.goal_repository import AsyncGoalRepository
+from app.services.interfaces.goal_service import IAsyncGoalService
 
 
 router = APIRouter()
-goal_service: IGoalService = GoalService(GoalRepository())
+goal_service: IAsyncGoalService = AsyncGoalService(AsyncGoalRepository())
 
 
 @router.post("/", response_model=GoalResponse)
-def create_goal(data: CreateGoalRequest):
-    goal = goal_service.create_goal(data)
+async def create_goal(data: CreateGoalRequest):
+    goal = await goal_service.create_goal(data)
     if not goal:
         raise HTTPException(status_code=400, detail="Goal creation failed")
     return goal
 
 
 @router.get("/{goal_id}", response_model=GoalResponse)
-def get_goal(goal_id: UUID):
-    goal = goal_service.get_goal(goal_id)
+async def get_goal(goal_id: UUID):
+    goal = await goal_service.get_goal(goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     return goal
 
 
 @router.get("/user/{user_id}", response_model=List[GoalResponse])
-def get_user_goals(user_id: UUID):
-    return goal_service.get_user_goals(user_id)
+async def get_user_goals(user_id: UUID, request: Request, response: Response):
+    not_modified = await conditional_get(request, response, user_id, "goals")
+    if not_modified:
+        return not_modified
+    return await goal_service.get_user_goals(user_id)
 
 
 @router.put("/{goal_id}", response_model=GoalResponse)
-def update_goal(goal_id: UUID, data: UpdateGoalRequest):
-    updated = goal_service.update_goal(goal_id, data)
+async def update_goal(goal_id: UUID, data: UpdateGoalRequest):
+    updated = await goal_service.update_goal(goal_id, data)
     if not updated:
         raise HTTPException(status_code=404, detail="Goal not found or update failed")
     return updated
 
 
 @router.delete("/{goal_id}", status_code=204)
-def delete_goal(goal_id: UUID):
-    success = goal_service.delete_goal(goal_id)
+async def delete_goal(goal_id: UUID):
+    success = await goal_service.delete_goal(goal_id)
     if not success:
         raise HTTPException(status_code=404, detail="Goal not found or delete failed")
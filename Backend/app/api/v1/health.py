@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Response
+from app.core.config import settings
+from app.core.providers import providers
+
+router = APIRouter()
+
+
+@router.get("/live", summary="Process is up and serving requests")
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready", summary="Which heavy subsystems are loaded")
+async def ready(response: Response):
+    subsystems = {name: p.status() for name, p in providers.items()}
+    # Only subsystems we were asked to warm gate readiness; the rest load on demand
+    waiting = [
+        name
+        for name in settings.WARMUP_PROVIDERS
+        if name in providers and not providers[name].ready
+    ]
+    if waiting:
+        response.status_code = 503
+    return {
+        "status": "ready" if not waiting else "warming",
+        "waiting_for": waiting,
+        "subsystems": subsystems,
+    }
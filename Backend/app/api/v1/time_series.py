@@ -1,20 +1,30 @@
 from fastapi import APIRouter, HTTPException
-from app.services.interfaces.time_series_service import ITimeSeriesService
-from app.services.implementation.time_series_service import TimeSeriesService
+from app.services.interfaces.time_series_service import IAsyncTimeSeriesService
+from app.services.implementation.time_series_service import AsyncTimeSeriesService
 from app.infrastructure.implementation.time_series_repository import (
-    TimeSeriesRepository,
+    AsyncTimeSeriesRepository,
+)
+from typing import List
+from app.models.time_series_dto import (
+    TimeSeriesPredictionResponse,
+    BatchPredictionRequest,
+    BatchPredictionItem,
 )
-from app.models.time_series_dto import TimeSeriesPredictionResponse
 
 router = APIRouter()
 
 # Dependency injection
-service: ITimeSeriesService = TimeSeriesService(TimeSeriesRepository())
+service: IAsyncTimeSeriesService = AsyncTimeSeriesService(AsyncTimeSeriesRepository())
+
+
+@router.post("/predict/batch", response_model=List[BatchPredictionItem])
+async def predict_user_expenses(req: BatchPredictionRequest):
+    return await service.get_next_month_predictions(req.user_ids)
 
 
 @router.get("/predict/{user_id}", response_model=TimeSeriesPredictionResponse)
-def predict_user_expense(user_id: str):
+async def predict_user_expense(user_id: str):
     try:
-        return service.get_next_month_prediction(user_id)
+        return await service.get_next_month_prediction(user_id)
     except HTTPException as e:
         raise e
@@ -1,66 +1,199 @@
-from typing import List
+import json
+from typing import Dict, List, Literal, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.llm_gateway import LLMTimeoutError
+from app.core.user_versions import conditional_get
+from app.domain.import_job import ImportJob
 from app.domain.transaction import Transaction
+from app.models.import_dto import ImportJobResponse
 from app.models.transaction_dto import (
     CreateTransactionRequest,
     TransactionResponse,
     UpdateTransactionRequest,
 )
-from app.services.implementation.transaction_service import TransactionService
-from app.services.interfaces.transaction_service import ITransactionService
+from app.services.implementation.transaction_service import AsyncTransactionService
+from app.services.implementation.import_service import ImportService
+from app.services.interfaces.transaction_service import IAsyncTransactionService
+from app.services.interfaces.import_service import IImportService
 from app.infrastructure.implementation.transaction_repository import (
-    TransactionRepository,
+    AsyncTransactionRepository,
 )
 
 router = APIRouter()
 
 # Dependency Injection
-transaction_service: ITransactionService = TransactionService(TransactionRepository())
+transaction_repository = AsyncTransactionRepository()
+transaction_service: IAsyncTransactionService = AsyncTransactionService(
+    transaction_repository
+)
+import_service: IImportService = ImportService(transaction_repository)
+
+
+async def _list_transactions(
+    response: Response,
+    filters: Dict[str, str],
+    limit: int,
+    cursor: Optional[str],
+    format: str,
+):
+    """One keyset page (next cursor in the X-Next-Cursor header), or every
+    row from `cursor` on as NDJSON when format=ndjson."""
+    if format == "ndjson":
+        try:
+            pages = transaction_service.stream_transactions(filters, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        async def ndjson():
+            async for rows in pages:
+                yield "".join(json.dumps(row) + "\n" for row in rows)
+
+        # A returned response does not pick up headers set on `response`
+        return StreamingResponse(
+            ndjson(), media_type="application/x-ndjson", headers=response.headers
+        )
+
+    try:
+        page = await transaction_service.get_transactions_page(filters, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+
+PageSize = Query(
+    settings.TRANSACTIONS_PAGE_SIZE, ge=1, le=settings.TRANSACTIONS_MAX_PAGE_SIZE
+)
+ListFormat = Literal["json", "ndjson"]
 
 
 @router.post("/", response_model=TransactionResponse)
-def create_transaction(data: CreateTransactionRequest):
-    created = transaction_service.create_transaction(data)
+async def create_transaction(data: CreateTransactionRequest):
+    try:
+        created = await transaction_service.create_transaction(data)
+    except LLMTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     if not created:
         raise HTTPException(status_code=400, detail="User creation failed")
     return TransactionResponse(**created.__dict__)
 
 
+def _job_response(job: ImportJob) -> ImportJobResponse:
+    return ImportJobResponse(
+        **job.__dict__,
+        progress=round(job.progress, 4),
+        rows_per_second=round(job.rows_per_second, 1),
+        elapsed_seconds=round(job.elapsed_seconds, 3),
+    )
+
+
+@router.post("/import", response_model=ImportJobResponse, status_code=202)
+async def import_transactions(
+    user_id: UUID = Query(...), file: UploadFile = File(...)
+):
+    """Start a bulk import of a CSV (date, category, amount[, description,
+    type]); poll GET /import/{job_id} for progress."""
+    try:
+        job = await import_service.start_import(user_id, file.file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _job_response(job)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: UUID):
+    job = import_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return _job_response(job)
+
+
+@router.post("/batch", response_model=List[TransactionResponse])
+async def create_transactions(data: CreateTransactionRequest):
+    """Create every transaction mentioned in one message, in one insert."""
+    try:
+        return await transaction_service.create_transactions(data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LLMTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+
+
+@router.get("/extraction/metrics")
+async def extraction_metrics():
+    return transaction_service.get_extraction_metrics()
+
+
 @router.get("/", response_model=List[TransactionResponse])
-def get_all():
-    return transaction_service.get_all_transactions()
+async def get_all(
+    response: Response,
+    limit: int = PageSize,
+    cursor: Optional[str] = None,
+    format: ListFormat = "json",
+):
+    return await _list_transactions(response, {}, limit, cursor, format)
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_by_id(transaction_id: UUID):
-    tx = transaction_service.get_transaction_by_id(transaction_id)
+async def get_by_id(transaction_id: UUID):
+    tx = await transaction_service.get_transaction_by_id(transaction_id)
     if not tx:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return tx
 
 
 @router.get("/user/{user_id}", response_model=List[TransactionResponse])
-def get_by_user(user_id: UUID):
-    return transaction_service.get_transactions_by_user_id(user_id)
+async def get_by_user(
+    user_id: UUID,
+    request: Request,
+    response: Response,
+    limit: int = PageSize,
+    cursor: Optional[str] = None,
+    format: ListFormat = "json",
+):
+    not_modified = await conditional_get(request, response, user_id, "transactions")
+    if not_modified:
+        return not_modified
+    filters = {"user_id": str(user_id)}
+    return await _list_transactions(response, filters, limit, cursor, format)
 
 
 @router.put("/", response_model=TransactionResponse)
-def update_transaction(data: UpdateTransactionRequest):
+async def update_transaction(data: UpdateTransactionRequest):
     tx = Transaction(**data.dict())
-    updated = transaction_service.update_transaction(tx)
+    updated = await transaction_service.update_transaction(tx)
     if not updated:
         raise HTTPException(status_code=404, detail="Transaction not updated")
     return updated
 
 
 @router.delete("/{transaction_id}", status_code=204)
-def delete_transaction(transaction_id: UUID):
-    success = transaction_service.delete_transaction(transaction_id)
+async def delete_transaction(transaction_id: UUID):
+    success = await transaction_service.delete_transaction(transaction_id)
     if not success:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
 
 @router.get("/category/{category_id}", response_model=List[TransactionResponse])
-def get_by_category(category_id: UUID):
-    return transaction_service.get_transactions_by_category_id(category_id)
+async def get_by_category(
+    category_id: UUID,
+    response: Response,
+    limit: int = PageSize,
+    cursor: Optional[str] = None,
+    format: ListFormat = "json",
+):
+    filters = {"category_id": str(category_id)}
+    return await _list_transactions(response, filters, limit, cursor, format)
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query, Request, Response
 from app.models.user_dto import (
     UserCreate,
     UserOut,
@@ -7,23 +7,33 @@ from app.models.user_dto import (
     LoginRequest,
     LoginResponse,
 )
-from app.services.implementation.user_service import UserService
-from app.services.interfaces.user_service import IUserService
-from app.infrastructure.implementation.user_repository import UserRepository
+from app.core.avatars import thumbnail_urls
+from app.core.user_versions import conditional_get
+from app.services.implementation.user_service import AsyncUserService
+from app.services.interfaces.user_service import IAsyncUserService
+from app.infrastructure.implementation.user_repository import AsyncUserRepository
 from app.domain.user import User
 from uuid import UUID, uuid4
-from passlib.context import CryptContext
 from fastapi import UploadFile
+from app.core.password_hasher import PasswordHasherBusy, password_hasher
 
 router = APIRouter()
 # Use interface for type hinting
-user_service: IUserService = UserService(UserRepository())
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+user_service: IAsyncUserService = AsyncUserService(AsyncUserRepository())
+
+
+async def _hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=503, detail=str(e), headers={"Retry-After": "1"}
+        )
 
 
 @router.post("/", response_model=UserOut, summary="Create new user")
-def create_user(user_dto: UserCreate):
-    hashed_pw = pwd_context.hash(user_dto.password)
+async def create_user(user_dto: UserCreate):
+    hashed_pw = await _hash_password(user_dto.password)
 
     user = User(
         user_id=uuid4(),
@@ -34,7 +44,7 @@ def create_user(user_dto: UserCreate):
         avatar_url=user_dto.avatar_url,
         password=hashed_pw,
     )
-    created = user_service.create_user(user)
+    created = await user_service.create_user(user)
     if not created:
         raise HTTPException(status_code=400, detail="User creation failed")
     return UserOut(**created.__dict__)
@@ -44,22 +54,30 @@ def create_user(user_dto: UserCreate):
 async def upload_profile_image(
     user_id: UUID = Query(...), file: UploadFile = File(...)
 ):
-    avatar_url = user_service.upload_avatar(user_id, file)
+    """Store a JPEG, PNG or WebP profile image; its thumbnails appear at the
+    returned URLs shortly after."""
+    try:
+        avatar_url = await user_service.upload_avatar(user_id, file)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not avatar_url:
         raise HTTPException(status_code=404, detail="User not found or upload failed")
-    return {"avatar_url": avatar_url}
+    return {"avatar_url": avatar_url, "thumbnails": thumbnail_urls(avatar_url)}
 
 
 @router.get("/{user_id}", response_model=UserOut)
-def get_user_by_id(user_id: UUID):
-    user = user_service.get_user_by_id(user_id)
+async def get_user_by_id(user_id: UUID, request: Request, response: Response):
+    not_modified = await conditional_get(request, response, user_id, "user")
+    if not_modified:
+        return not_modified
+    user = await user_service.get_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return UserOut(**user.__dict__)
 
 
 @router.put("/{user_id}", response_model=UserOut)
-def update_user(user_id: UUID, update_data: UserUpdate):
+async def update_user(user_id: UUID, update_data: UserUpdate):
     user = User(
         user_id=user_id,
         email=update_data.email,
@@ -68,15 +86,15 @@ def update_user(user_id: UUID, update_data: UserUpdate):
         data_of_birth=update_data.data_of_birth,
         avatar_url=update_data.avatar_url,
     )
-    updated = user_service.update_user(user)
+    updated = await user_service.update_user(user)
     if not updated:
         raise HTTPException(status_code=400, detail="Update failed")
     return UserOut(**updated.__dict__)
 
 
 @router.patch("/{user_id}", response_model=UserOut)
-def update_user_partial(user_id: UUID, update_data: UserUpdate):
-    existing_user = user_service.get_user_by_id(user_id)
+async def update_user_partial(user_id: UUID, update_data: UserUpdate):
+    existing_user = await user_service.get_user_by_id(user_id)
     if not existing_user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -92,10 +110,10 @@ def update_user_partial(user_id: UUID, update_data: UserUpdate):
     if update_data.data_of_birth is not None:
         existing_user.data_of_birth = update_data.data_of_birth
     if update_data.password:
-        hashed_pw = pwd_context.hash(update_data.password)
+        hashed_pw = await _hash_password(update_data.password)
         existing_user.password = hashed_pw  # You must add this to entity + repo
 
-    updated_user = user_service.update_user(existing_user)
+    updated_user = await user_service.update_user(existing_user)
     if not updated_user:
         raise HTTPException(status_code=400, detail="Failed to update user")
 
@@ -103,22 +121,22 @@ def update_user_partial(user_id: UUID, update_data: UserUpdate):
 
 
 @router.delete("/{user_id}")
-def delete_user(user_id: UUID):
-    success = user_service.delete_user(user_id)
+async def delete_user(user_id: UUID):
+    success = await user_service.delete_user(user_id)
     if not success:
         raise HTTPException(status_code=404, detail="Delete failed")
     return {"message": "User deleted successfully"}
 
 
 @router.get("/", response_model=List[UserOut], summary="Get all users")
-def get_all_users():
-    users = user_service.get_all_users()
+async def get_all_users():
+    users = await user_service.get_all_users()
     return [UserOut(**user.__dict__) for user in users]
 
 
 @router.post("/login", response_model=LoginResponse)
-def login(request: LoginRequest):
-    result = user_service.login(request.email, request.password)
+async def login(request: LoginRequest):
+    result = await user_service.login(request.email, request.password)
     if not result:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
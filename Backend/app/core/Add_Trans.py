@@ -13,6 +13,8 @@ from langchain_fireworks import Fireworks
 from datetime import datetime, timezone
 from dateparser import parse as date_parse
 from supabase import create_client, Client
+from app.core.category_catalog import category_catalog
+from app.core.llm_gateway import llm_gateway
 
 # 2. ENV Setup
 load_dotenv()
@@ -21,23 +23,25 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
 # 3. LLM & DB Initialization
-llm = Fireworks(api_key=API_KEY, model="accounts/fireworks/models/deepseek-v3", temperature=1.0, max_tokens=1024)
+llm = Fireworks(api_key=API_KEY, model="accounts/fireworks/models/deepseek-v3", temperature=1.0, max_tokens=2048)
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 # 4. Prompt for Transaction Extraction
 
-def process_transaction_with_llm(text):
-    transaction_prompt = """
-    Extract transaction details from the following text and classify the amount as either income or expense (TYPE).
+transaction_prompt = """
+    Extract every transaction mentioned in each message below and classify each amount as either income or expense (TYPE).
+    A single message can mention several transactions ("coffee 30, taxi 80 and lunch 120 today"); return one block per transaction.
     Extract date (handle relative dates like 'yesterday'), a description, and the category.
     If a specific date is not mentioned, assume today's date. If you can't classify the amount as either income or expense,
     assume it is expense and keep it uncategorized. Provide a natural response about the spending.
 
-    Text: {input_text}
+    Messages:
+    {messages}
 
     Current date: {current_date}
 
-    Format your response as follows:
+    Format your response as one block per transaction, separated by a line containing only ---:
+    MESSAGE: [number of the message the transaction comes from]
     CREATED_AT: [Extract the date, handle relative dates like 'this morning', 'yesterday', 'last week', etc. ISO8601 date, e.g., 2025-06-16T15:30:00Z],
     AMOUNT: [numeric amount],
     TYPE: [Income or Expense],
@@ -53,44 +57,91 @@ def process_transaction_with_llm(text):
     Make it sound natural and varied.]
 
     Example:
-    Input: "I got today 2,000 from upwork"
+    Messages:
+    1. I got today 2,000 from upwork
+    2. Bought lunch for 50 and a taxi for 30 yesterday
+
+    MESSAGE: 1
     CREATED_AT: 2024-01-30T00:00:00Z
     AMOUNT: 2000
     TYPE: Income
     CATEGORY: Freelance
     DESCRIPTION: upwork
     FEEDBACK: That’s wonderful—congrats on your Freelance job!
-
-    Input: "Bought lunch for 50 yesterday"
+    ---
+    MESSAGE: 2
     CREATED_AT: 2024-01-29T00:00:00Z
     AMOUNT: 50
     TYPE: Expense
     CATEGORY: Food
     DESCRIPTION: lunch
     FEEDBACK: That's a reasonable amount for lunch! If you're looking to save more, you might consider bringing lunch from home occasionally.
+    ---
+    MESSAGE: 2
+    CREATED_AT: 2024-01-29T00:00:00Z
+    AMOUNT: 30
+    TYPE: Expense
+    CATEGORY: Transportation
+    DESCRIPTION: taxi
+    FEEDBACK: A short taxi ride at a fair price—fine when time matters.
     """
 
+
+def _format_transaction_prompt(texts):
     current_date = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S+00')
-    formatted_prompt = transaction_prompt.format(
-        input_text=text,
+    messages = "\n    ".join(f"{i}. {text}" for i, text in enumerate(texts, start=1))
+    return transaction_prompt.format(
+        messages=messages,
         current_date=current_date
     )
+
+
+def process_transactions_with_llm(texts):
+    """One LLM call for one or more user messages (numbered from 1)."""
+    formatted_prompt = _format_transaction_prompt(texts)
     # Call LLM
     response = llm.invoke(formatted_prompt)
     return response
 
+
+def process_transaction_with_llm(text):
+    return process_transactions_with_llm([text])
+
+
+async def aprocess_transactions_with_llm(texts):
+    """Async variant through the LLM gateway (concurrency limit, deadline, hedging)."""
+    formatted_prompt = _format_transaction_prompt(texts)
+    return await llm_gateway.call(lambda: llm.ainvoke(formatted_prompt))
+
+
+async def aprocess_transaction_with_llm(text):
+    return await aprocess_transactions_with_llm([text])
+
 # 5. LLM Output Parser
 
-def parse_llm_response(response):
-    """Parse the LLM's output to get transaction fields."""
+_BLOCK_START = re.compile(r"^\s*(MESSAGE|CREATED_AT):", re.IGNORECASE | re.MULTILINE)
+
+
+def _split_blocks(response):
+    """Split the LLM output into one chunk of text per transaction."""
+    # Blocks start at MESSAGE: when the model numbered them, else at CREATED_AT:
+    starts = list(_BLOCK_START.finditer(response))
+    key = "MESSAGE" if any(m.group(1).upper() == "MESSAGE" for m in starts) else "CREATED_AT"
+    offsets = [m.start() for m in starts if m.group(1).upper() == key]
+    if not offsets:
+        return [response]
+    return [response[a:b] for a, b in zip(offsets, offsets[1:] + [len(response)])]
+
+
+def _parse_transaction_block(response, now):
+    """Parse one transaction block of the LLM's output."""
     # Extract CREATED_AT (or fallback to now)
-    now = datetime.now(timezone.utc)
     date_match = re.search(r"CREATED_AT:\s*([^\n]+)", response)
     date_str = date_match.group(1).strip() if date_match else None
     if not date_str or date_str.lower().startswith("unknown"):
         date_obj = now
     else:
-        date_obj = date_parse(date_str)
+        date_obj = date_parse(date_str.rstrip(","))
         if not date_obj:
             date_obj = now
         elif date_obj.tzinfo is None:
@@ -100,7 +151,7 @@ def parse_llm_response(response):
     created_at = date_obj.strftime('%Y-%m-%d %H:%M:%S+00')
 
     # Extract AMOUNT
-    amount_match = re.search(r"AMOUNT:\s*([\d.]+)", response, re.IGNORECASE)
+    amount_match = re.search(r"AMOUNT:\s*([\d.]+)", response.replace(",", ""), re.IGNORECASE)
     amount = float(amount_match.group(1)) if amount_match else 0.0
 
     # Extract TYPE
@@ -128,27 +179,59 @@ def parse_llm_response(response):
         "feedback": feedback
     }
 
+
+def parse_llm_response(response):
+    """Parse the LLM's output into a list of transaction dicts, one per block.
+
+    Each dict carries the 1-based `message` it was extracted from; blocks that
+    cannot be used have an "error" key instead of the transaction fields.
+    """
+    now = datetime.now(timezone.utc)
+    parsed = []
+    for block in _split_blocks(response):
+        message_match = re.search(r"MESSAGE:\s*(\d+)", block, re.IGNORECASE)
+        item = _parse_transaction_block(block, now)
+        item["message"] = int(message_match.group(1)) if message_match else 1
+        parsed.append(item)
+    return parsed
+
+
+def _group_by_message(parsed, texts):
+    grouped = [[] for _ in texts]
+    for item in parsed:
+        if 1 <= item["message"] <= len(texts):
+            grouped[item["message"] - 1].append(item)
+    return grouped
+
+
+def extract_transactions_batch(texts):
+    """Extract transactions for several messages with a single LLM call.
+
+    Returns one list of parsed transactions per input message, in order.
+    """
+    return _group_by_message(parse_llm_response(process_transactions_with_llm(texts)), texts)
+
+
+async def aextract_transactions_batch(texts):
+    """Async variant of extract_transactions_batch."""
+    return _group_by_message(parse_llm_response(await aprocess_transactions_with_llm(texts)), texts)
+
 # 6. Category ID Lookup
 
-UNCATEGORIZED_UUID = "b179e1a0-9215-4914-b5b1-7851452bc1be"
+def get_category_id(category_name: str, supabase=None):
+    """Lookup category_id from name. If not found, returns Uncategorized UUID.
 
-def get_category_id(category_name: str, supabase):
-    """Lookup category_id from name. If not found, returns Uncategorized UUID."""
-    if not category_name or category_name.lower() == "uncategorized":
-        return UNCATEGORIZED_UUID
-    cat_response = supabase.table("categories").select("category_id").eq("category_name", category_name).execute()
-    cat_data = cat_response.data
-    if cat_data:
-        return cat_data[0]["category_id"]
-    else:
-        return UNCATEGORIZED_UUID
+    Served from the shared in-process catalog; `supabase` is kept for callers
+    that still pass a client.
+    """
+    return category_catalog.resolve(category_name)
 
-# 7. Insert transaction into DB
+# 7. Insert transactions into DB
 
-def add_transaction_from_llm(llm_response, user_id, supabase):
-    if not llm_response or (isinstance(llm_response, str) and "error" in llm_response.lower()):
-        return "❌ Sorry, there was a problem extracting data from your input. Please try rephrasing."
-    extracted = parse_llm_response(llm_response)
+def _validate_extracted(extracted):
+    """Return the missing-field message for one parsed transaction, or None."""
+    if "error" in extracted:
+        return extracted["error"]
     description_valid = extracted["description"] not in (None, "", "No Description")
     amount_valid = extracted["amount"] > 0
     type_valid = extracted["transaction_type"] in ("Income", "Expense")
@@ -164,30 +247,46 @@ def add_transaction_from_llm(llm_response, user_id, supabase):
     if missing_fields:
         missing_str = ", ".join(missing_fields)
         return f"❌ Cannot add transaction: missing {missing_str}. Please provide complete details and try again."
+    return None
 
-    category_id = get_category_id(extracted["category"], supabase)
-    new_transaction = {
-        "user_id": user_id,
-        "category_id": category_id,
-        "description": extracted["description"],
-        "created_at": extracted["created_at"],
-        "amount": extracted["amount"],
-        "transaction_type": extracted["transaction_type"],  # "Income" or "Expense"
-    }
-    response = supabase.table("transactions").insert(new_transaction).execute()
 
-    user_reply = (
-        f"✅ Added {extracted['transaction_type'].lower()} transaction: {extracted['description']}, "
-        f"{extracted['amount']}, "
-        f"date: {extracted['created_at']}"
-    )
-    if extracted["category"]:
-        user_reply += f", category: {extracted['category']}."
-    else:
-        user_reply += "."
-    if extracted["feedback"]:
-        user_reply += f"\n💬 {extracted['feedback']}"
-    return user_reply
+def add_transaction_from_llm(llm_response, user_id, supabase):
+    if not llm_response or (isinstance(llm_response, str) and "error" in llm_response.lower()):
+        return "❌ Sorry, there was a problem extracting data from your input. Please try rephrasing."
+
+    replies = []
+    new_transactions = []
+    for extracted in parse_llm_response(llm_response):
+        problem = _validate_extracted(extracted)
+        if problem:
+            replies.append(problem)
+            continue
+
+        new_transactions.append({
+            "user_id": user_id,
+            "category_id": get_category_id(extracted["category"], supabase),
+            "description": extracted["description"],
+            "created_at": extracted["created_at"],
+            "amount": extracted["amount"],
+            "transaction_type": extracted["transaction_type"],  # "Income" or "Expense"
+        })
+        user_reply = (
+            f"✅ Added {extracted['transaction_type'].lower()} transaction: {extracted['description']}, "
+            f"{extracted['amount']}, "
+            f"date: {extracted['created_at']}"
+        )
+        if extracted["category"]:
+            user_reply += f", category: {extracted['category']}."
+        else:
+            user_reply += "."
+        if extracted["feedback"]:
+            user_reply += f"\n💬 {extracted['feedback']}"
+        replies.append(user_reply)
+
+    # All transactions of the message go in with a single insert
+    if new_transactions:
+        supabase.table("transactions").insert(new_transactions).execute()
+    return "\n".join(replies)
 
 # 8. Example usage/test calls
 if __name__ == "__main__":
@@ -196,6 +295,7 @@ if __name__ == "__main__":
     test_inputs = [
         "Received salary 8000 today",
         "Had dinner for 150 last night",
+        "Coffee 30, taxi 80 and lunch 120 today",
         "got 150",
         "Dinner today",
         "50 today",
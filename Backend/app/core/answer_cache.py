@@ -0,0 +1,141 @@
+"""
+Semantic cache for general chatbot answers
+- Only questions that do not depend on the asking user are cached; anything
+  in the first person ("my", "can I", "we"), a follow-up to earlier turns, or
+  any question asked once the user's session has chat history always runs
+  the user's chain
+- Keys are normalized question embeddings; a lookup hits when the cosine
+  similarity to a stored question reaches the threshold
+- Entries expire after a TTL, and all of them are dropped when the PDF index
+  fingerprint changes, since answers are built from that corpus
+- Hit/miss/bypass counters show how many chain runs the cache saved
+"""
+
+import re
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+# Any first-person word makes the answer depend on who asks: "can I", "should
+# we", "our budget", "i'm", "we've" (the apostrophe is a word boundary)
+_PERSONAL = re.compile(
+    r"\b(i|im|ive|me|my|mine|myself|we|us|our|ours|ourselves)\b",
+    re.IGNORECASE,
+)
+# Questions that lean on earlier turns cannot be answered on their own
+_FOLLOW_UP = re.compile(
+    r"^\s*(and|but|also|so|then|what about|how about|why not|why|explain that"
+    r"|explain this|explain it|elaborate|continue|go on|tell me more)\b"
+    r"|\b(elaborate|more detail|in detail|expand on|you said|you mentioned"
+    r"|your (last|previous) answer|(first|second|third|last|previous|that|this)"
+    r" (point|one|step|tip|option|answer))\b",
+    re.IGNORECASE,
+)
+MIN_WORDS = 3
+
+
+def is_general_question(question: str) -> bool:
+    """True when the answer cannot depend on who asks or on earlier turns."""
+    return (
+        len(question.split()) >= MIN_WORDS
+        and not _PERSONAL.search(question)
+        and not _FOLLOW_UP.search(question)
+    )
+
+
+class SemanticAnswerCache:
+    def __init__(self, threshold: float, ttl: float, max_entries: int):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.fingerprint: Optional[str] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._questions: List[str] = []
+        self._answers: List[str] = []
+        self._expires = np.empty(0)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._answers)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        return v / norm if norm else v
+
+    def set_fingerprint(self, fingerprint: Optional[str]) -> None:
+        """Drop every entry if the corpus behind the answers changed."""
+        with self._lock:
+            if fingerprint != self.fingerprint:
+                if self._answers:
+                    self.invalidations += 1
+                self._clear()
+                self.fingerprint = fingerprint
+
+    def _clear(self) -> None:
+        self._vectors = None
+        self._questions, self._answers = [], []
+        self._expires = np.empty(0)
+
+    def _keep(self, mask: np.ndarray) -> None:
+        self._vectors = self._vectors[mask]
+        self._questions = [q for q, k in zip(self._questions, mask) if k]
+        self._answers = [a for a, k in zip(self._answers, mask) if k]
+        self._expires = self._expires[mask]
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypassed += 1
+
+    def get(self, vector) -> Optional[str]:
+        q = self._normalize(vector)
+        with self._lock:
+            if self._answers:
+                alive = self._expires > time.time()
+                if not alive.all():
+                    self._keep(alive)
+            if self._answers:
+                scores = self._vectors @ q
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self.hits += 1
+                    return self._answers[best]
+            self.misses += 1
+            return None
+
+    def put(self, vector, question: str, answer: str) -> None:
+        q = self._normalize(vector)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = q[None, :]
+            else:
+                self._vectors = np.vstack([self._vectors, q])
+            self._questions.append(question)
+            self._answers.append(answer)
+            self._expires = np.append(self._expires, time.time() + self.ttl)
+            if len(self._answers) > self.max_entries:
+                # Oldest entries go first
+                mask = np.arange(len(self._answers)) >= (
+                    len(self._answers) - self.max_entries
+                )
+                self._keep(mask)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._answers),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "pdf_fingerprint": self.fingerprint,
+            }
@@ -0,0 +1,171 @@
+"""
+Avatar uploads
+- The upload is copied in 1 MB chunks to a temp file, capped at
+  AVATAR_MAX_BYTES, and storage streams it from there; the image is never held
+  in memory whole
+- The format comes from the file's leading bytes (JPEG, PNG or WebP), not from
+  the client's filename or content type
+- WebP thumbnails for AVATAR_THUMBNAIL_SIZES are rendered and uploaded after
+  the response, on AVATAR_THUMBNAIL_WORKERS threads (Pillow releases the GIL
+  while decoding and resizing). They live next to the original as
+  `<name>_<size>.webp`; until they exist clients fall back to the original
+"""
+
+import io
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.core.supabase import get_supabase
+
+logger = logging.getLogger(__name__)
+
+AVATAR_BUCKET = "avatars"
+THUMBNAIL_FORMAT = ("webp", "image/webp")
+
+
+def sniff_image_format(head: bytes) -> Optional[Tuple[str, str]]:
+    """File extension and content type of a supported image, from its first
+    12 bytes."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg", "image/jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png", "image/png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp", "image/webp"
+    return None
+
+
+def spool_avatar(upload: BinaryIO, max_bytes: int) -> Tuple[str, str, str]:
+    """Copy the upload to a temp file; returns its path, extension and
+    content type. The caller owns the file and removes it."""
+    head = upload.read(12)
+    image_format = sniff_image_format(head)
+    if image_format is None:
+        raise ValueError("Avatar must be a JPEG, PNG or WebP image")
+    ext, content_type = image_format
+    spool = tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False)
+    try:
+        with spool:
+            spool.write(head)
+            copied = len(head)
+            while chunk := upload.read(1024 * 1024):
+                copied += len(chunk)
+                if copied > max_bytes:
+                    raise ValueError(f"Avatar is larger than {max_bytes} bytes")
+                spool.write(chunk)
+    except BaseException:
+        os.remove(spool.name)
+        raise
+    return spool.name, ext, content_type
+
+
+def thumbnail_name(name: str, size: int) -> str:
+    return f"{name.rsplit('.', 1)[0]}_{size}.{THUMBNAIL_FORMAT[0]}"
+
+
+def thumbnail_urls(avatar_url: str) -> Dict[int, str]:
+    """Where the thumbnails of an uploaded avatar are, or will be, served."""
+    return {
+        size: thumbnail_name(avatar_url, size)
+        for size in settings.AVATAR_THUMBNAIL_SIZES
+    }
+
+
+def render_thumbnails(path: str, sizes: Iterable[int]) -> Dict[int, bytes]:
+    """WebP thumbnails of the image at `path`, fitted inside size x size."""
+    sizes = sorted(set(sizes), reverse=True)
+    thumbnails = {}
+    with Image.open(path) as original:
+        # JPEGs decode straight at the smallest 1/2..1/8 scale still at least
+        # as large as the biggest thumbnail
+        original.draft("RGB", (sizes[0], sizes[0]))
+        image = ImageOps.exif_transpose(original)
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+    # Largest first, each smaller size resized from the previous one
+    for size in sizes:
+        image.thumbnail((size, size))
+        out = io.BytesIO()
+        image.save(out, format="WEBP", quality=80)
+        thumbnails[size] = out.getvalue()
+    return thumbnails
+
+
+class AvatarThumbnailer:
+    def __init__(self, workers: int, sizes: Iterable[int]):
+        self.workers = workers
+        self.sizes = tuple(sizes)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="avatar-thumbnails"
+                )
+            return self._executor
+
+    def submit(self, path: str, name: str) -> None:
+        """Render and upload the thumbnails of the spooled avatar `path`,
+        stored as `name`, in the background. Takes ownership of `path`."""
+        if not self.sizes:
+            os.remove(path)
+            return
+        with self._lock:
+            self.pending += 1
+        self.executor.submit(self._run, path, name)
+
+    def _run(self, path: str, name: str) -> None:
+        ok = False
+        try:
+            bucket = get_supabase().storage.from_(AVATAR_BUCKET)
+            for size, data in render_thumbnails(path, self.sizes).items():
+                bucket.upload(
+                    path=thumbnail_name(name, size),
+                    file=data,
+                    file_options={"content-type": THUMBNAIL_FORMAT[1]},
+                )
+            ok = True
+        except Exception:
+            logger.exception("Avatar thumbnails for %s failed", name)
+        finally:
+            os.remove(path)
+            with self._lock:
+                self.pending -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "sizes": list(self.sizes),
+            "pending": self.pending,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+avatar_thumbnailer = AvatarThumbnailer(
+    workers=settings.AVATAR_THUMBNAIL_WORKERS,
+    sizes=settings.AVATAR_THUMBNAIL_SIZES,
+)
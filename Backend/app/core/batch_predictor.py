@@ -0,0 +1,131 @@
+"""
+Micro-batching for model calls
+- Concurrent requests are queued and collected for up to `max_wait_ms`
+- One batch call runs per batch of at most `max_batch_size` inputs; up to
+  `max_in_flight` batch calls run at once (1 for CPU-bound model calls, more
+  for I/O-bound ones such as LLM prompts)
+- The batch call runs in the threadpool so the event loop keeps serving;
+  coroutine functions are awaited directly
+- `BatchPredictor` stacks numpy inputs for the forecast model; `MicroBatcher`
+  takes any list-in/list-out function (e.g. one LLM prompt for many messages)
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        batch_fn: Callable[
+            [List[Any]], Union[Sequence[Any], Awaitable[Sequence[Any]]]
+        ],
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_in_flight: int = 1,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_in_flight = max(max_in_flight, 1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._calls = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one input and wait for its output."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        slots = asyncio.Semaphore(self.max_in_flight)
+        while True:
+            # A slot is taken before collecting, so while every slot is busy
+            # new inputs keep queueing up into the next, fuller batch
+            await slots.acquire()
+            batch = await self._collect()
+            call = asyncio.create_task(self._call(batch))
+            self._calls.add(call)
+            call.add_done_callback(self._calls.discard)
+            call.add_done_callback(lambda _: slots.release())
+
+    async def _call(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        inputs = [item for item, _ in batch]
+        try:
+            if asyncio.iscoroutinefunction(self.batch_fn):
+                outputs = await self.batch_fn(inputs)
+            else:
+                outputs = await run_in_threadpool(self.batch_fn, inputs)
+            if len(outputs) != len(batch):
+                raise RuntimeError(
+                    f"Batch call returned {len(outputs)} results "
+                    f"for {len(batch)} inputs"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), y in zip(batch, outputs):
+            if not future.done():
+                future.set_result(y)
+
+    def stats(self) -> dict:
+        avg = self.items / self.batches if self.batches else 0.0
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "in_flight": len(self._calls),
+            "max_in_flight": self.max_in_flight,
+            "avg_batch_size": round(avg, 2),
+        }
+
+
+class BatchPredictor(MicroBatcher):
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_size: int,
+        max_wait_ms: float,
+    ):
+        super().__init__(self._predict_stacked, max_batch_size, max_wait_ms)
+        self.predict_fn = predict_fn
+
+    def _predict_stacked(self, inputs: List[np.ndarray]) -> List[float]:
+        outputs = self.predict_fn(np.stack(inputs))
+        return [float(np.ravel(y)[0]) for y in outputs]
+
+    async def predict(self, x: np.ndarray) -> float:
+        """Queue one input (without the batch axis) and wait for its output."""
+        return await self.submit(x)
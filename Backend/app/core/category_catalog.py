@@ -0,0 +1,159 @@
+"""
+In-process catalog of the `categories` table
+- Loaded once per worker and reloaded after CATEGORY_CACHE_TTL seconds or `invalidate()`
+- Names are indexed after normalisation ("Food.", " food " -> "food") for O(1) lookups
+- Names that still miss fall back to the closest catalog name (difflib), memoised
+- Unknown names resolve to the Uncategorized category
+"""
+
+import difflib
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.supabase import get_supabase, get_async_postgrest
+
+logger = logging.getLogger(__name__)
+
+UNCATEGORIZED_UUID = "b179e1a0-9215-4914-b5b1-7851452bc1be"
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_category_name(name: str) -> str:
+    return _NON_ALNUM.sub("", name.lower())
+
+
+class CategoryCatalog:
+    def __init__(self, ttl: float, fuzzy_cutoff: float = 0.8):
+        self.ttl = ttl
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._by_id: Dict[str, str] = {}
+        self._by_name: Dict[str, str] = {}
+        # normalised miss -> resolved id (or None), cleared on every reload
+        self._fuzzy: Dict[str, Optional[str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    @property
+    def stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup, e.g. after categories change."""
+        self._loaded_at = None
+
+    def _install(self, rows: List[dict]) -> None:
+        by_id = {str(r["category_id"]): r["category_name"] for r in rows}
+        by_name = {normalize_category_name(n): i for i, n in by_id.items()}
+        with self._lock:
+            self._by_id, self._by_name = by_id, by_name
+            self._fuzzy = {}
+            self._loaded_at = time.monotonic()
+            self.reloads += 1
+
+    def refresh(self) -> None:
+        resp = (
+            get_supabase()
+            .table("categories")
+            .select("category_id, category_name")
+            .execute()
+        )
+        self._install(resp.data or [])
+
+    async def arefresh(self) -> None:
+        resp = await (
+            get_async_postgrest()
+            .from_("categories")
+            .select("category_id, category_name")
+            .execute()
+        )
+        self._install(resp.data or [])
+
+    def _lookup(self, name: Optional[str]) -> Optional[str]:
+        key = normalize_category_name(name or "")
+        if not key or key == "uncategorized":
+            return None
+        with self._lock:
+            category_id = self._by_name.get(key)
+            if category_id is not None:
+                self.exact_hits += 1
+                return category_id
+            if key not in self._fuzzy:
+                if len(self._fuzzy) >= 1024:
+                    self._fuzzy.clear()
+                self._fuzzy[key] = self._closest(key)
+            category_id = self._fuzzy[key]
+            if category_id is None:
+                self.misses += 1
+            else:
+                self.fuzzy_hits += 1
+            return category_id
+
+    def _closest(self, key: str) -> Optional[str]:
+        # "transport" / "healthcare": one catalog name is a prefix of the other
+        if len(key) >= 4:
+            prefixed = [
+                n for n in self._by_name if n.startswith(key) or key.startswith(n)
+            ]
+            if len(prefixed) == 1:
+                return self._by_name[prefixed[0]]
+        match = difflib.get_close_matches(
+            key, self._by_name.keys(), n=1, cutoff=self.fuzzy_cutoff
+        )
+        return self._by_name[match[0]] if match else None
+
+    def _reload_failed(self, error: Exception) -> None:
+        # Keep serving the previous catalog rather than failing the request
+        if not self._by_id:
+            raise error
+        # Retry in at most 30s instead of on every request
+        self._loaded_at = time.monotonic() - self.ttl + min(self.ttl, 30)
+        logger.warning(f"Category catalog reload failed, keeping old copy: {error}")
+
+    def ensure_fresh(self) -> None:
+        if self.stale:
+            try:
+                self.refresh()
+            except Exception as e:
+                self._reload_failed(e)
+
+    async def aensure_fresh(self) -> None:
+        if self.stale:
+            try:
+                await self.arefresh()
+            except Exception as e:
+                self._reload_failed(e)
+
+    def resolve(self, name: Optional[str]) -> str:
+        """category_id for an LLM/user supplied name, or the Uncategorized id."""
+        self.ensure_fresh()
+        return self._lookup(name) or UNCATEGORIZED_UUID
+
+    async def aresolve(self, name: Optional[str]) -> str:
+        await self.aensure_fresh()
+        return self._lookup(name) or UNCATEGORIZED_UUID
+
+    def name_of(self, category_id) -> Optional[str]:
+        self.ensure_fresh()
+        return self._by_id.get(str(category_id))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "categories": len(self._by_id),
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+            }
+
+
+category_catalog = CategoryCatalog(ttl=settings.CATEGORY_CACHE_TTL)
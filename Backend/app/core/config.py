@@ -10,6 +10,147 @@ class Settings:
     JWT_SECRET: str = os.getenv("JWT_SECRET", "secret")
     ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
     UPLOAD_FOLDER: str = os.path.join(os.path.dirname(__file__), "static")
+    PDF_INDEX_DIR: str = os.getenv(
+        "PDF_INDEX_DIR",
+        os.path.join(os.path.dirname(__file__), "VectorStore", "pdfs"),
+    )
+
+    # Embedding cache (set EMBEDDING_CACHE_PATH to "" to keep it memory-only)
+    EMBEDDING_CACHE_MAX_ITEMS: int = int(
+        os.getenv("EMBEDDING_CACHE_MAX_ITEMS", "20000")
+    )
+    EMBEDDING_CACHE_PATH: str = os.getenv(
+        "EMBEDDING_CACHE_PATH",
+        os.path.join(os.path.dirname(__file__), "VectorStore", "embeddings.sqlite3"),
+    )
+
+    # Chat sessions kept in memory per worker
+    CHAT_SESSION_MAX_ENTRIES: int = int(os.getenv("CHAT_SESSION_MAX_ENTRIES", "500"))
+    CHAT_SESSION_MAX_BYTES: int = int(
+        os.getenv("CHAT_SESSION_MAX_BYTES", str(256 * 1024 * 1024))
+    )
+    CHAT_SESSION_IDLE_TTL: float = float(os.getenv("CHAT_SESSION_IDLE_TTL", "1800"))
+
+    # Chatbot context: months of per-category totals in the financial digest,
+    # and whether every transaction is also embedded for retrieval
+    CHAT_SUMMARY_MONTHS: int = int(os.getenv("CHAT_SUMMARY_MONTHS", "6"))
+    CHAT_TRANSACTION_EMBEDDINGS: bool = os.getenv(
+        "CHAT_TRANSACTION_EMBEDDINGS", "false"
+    ).lower() in ("1", "true", "yes")
+    # Shared transaction vector index on disk, and the minimum seconds
+    # between saves
+    TRANSACTION_INDEX_DIR: str = os.getenv(
+        "TRANSACTION_INDEX_DIR",
+        os.path.join(os.path.dirname(__file__), "VectorStore", "transactions"),
+    )
+    TRANSACTION_INDEX_SAVE_INTERVAL: float = float(
+        os.getenv("TRANSACTION_INDEX_SAVE_INTERVAL", "60")
+    )
+
+    # Shared answers to general (not user-specific) chat questions: minimum
+    # cosine similarity to a cached question, seconds kept, entries per worker
+    # (0 disables the cache)
+    CHAT_ANSWER_CACHE_THRESHOLD: float = float(
+        os.getenv("CHAT_ANSWER_CACHE_THRESHOLD", "0.92")
+    )
+    CHAT_ANSWER_CACHE_TTL: float = float(os.getenv("CHAT_ANSWER_CACHE_TTL", "86400"))
+    CHAT_ANSWER_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("CHAT_ANSWER_CACHE_MAX_ENTRIES", "2000")
+    )
+
+    # "numpy" serves TimeSeries/lstm.npz without TensorFlow, "keras" loads lstm.h5
+    FORECAST_BACKEND: str = os.getenv("FORECAST_BACKEND", "numpy").lower()
+
+    # Seconds before the in-process category catalog is reloaded
+    CATEGORY_CACHE_TTL: float = float(os.getenv("CATEGORY_CACHE_TTL", "600"))
+
+    # Transaction listing: default/max page size, and rows per PostgREST page
+    # when streaming NDJSON
+    TRANSACTIONS_PAGE_SIZE: int = int(os.getenv("TRANSACTIONS_PAGE_SIZE", "100"))
+    TRANSACTIONS_MAX_PAGE_SIZE: int = int(
+        os.getenv("TRANSACTIONS_MAX_PAGE_SIZE", "500")
+    )
+    TRANSACTIONS_STREAM_PAGE_SIZE: int = int(
+        os.getenv("TRANSACTIONS_STREAM_PAGE_SIZE", "1000")
+    )
+
+    # Rule-based extraction answers inputs it is at least this sure about;
+    # anything above 1 sends every input to the LLM
+    FAST_PATH_MIN_CONFIDENCE: float = float(
+        os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.8")
+    )
+
+    # Extraction cache: entries per worker, seconds kept, and an optional SQLite
+    # file shared by the workers ("" keeps it memory-only)
+    EXTRACTION_CACHE_MAX_ITEMS: int = int(
+        os.getenv("EXTRACTION_CACHE_MAX_ITEMS", "5000")
+    )
+    EXTRACTION_CACHE_TTL: float = float(os.getenv("EXTRACTION_CACHE_TTL", "86400"))
+    EXTRACTION_CACHE_PATH: str = os.getenv("EXTRACTION_CACHE_PATH", "")
+
+    # LLM calls per worker: concurrent calls, deadline per call (retries
+    # included), seconds before a hedged second attempt (0 disables), attempts
+    # per call, and threads for the blocking work around the calls
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "30"))
+    LLM_HEDGE_AFTER: float = float(os.getenv("LLM_HEDGE_AFTER", "8"))
+    LLM_MAX_ATTEMPTS: int = int(os.getenv("LLM_MAX_ATTEMPTS", "2"))
+    LLM_THREAD_POOL_SIZE: int = int(os.getenv("LLM_THREAD_POOL_SIZE", "8"))
+
+    # Server-side LLM batching of transaction messages; 1 keeps one call each
+    LLM_BATCH_MAX_MESSAGES: int = int(os.getenv("LLM_BATCH_MAX_MESSAGES", "1"))
+    LLM_BATCH_MAX_WAIT_MS: float = float(os.getenv("LLM_BATCH_MAX_WAIT_MS", "50"))
+
+    # Bulk CSV import: rows per insert request, upload cap, jobs kept per worker
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    IMPORT_MAX_BYTES: int = int(os.getenv("IMPORT_MAX_BYTES", str(50 * 1024 * 1024)))
+    IMPORT_MAX_JOBS: int = int(os.getenv("IMPORT_MAX_JOBS", "100"))
+
+    # Forecast micro-batching
+    FORECAST_MAX_BATCH_SIZE: int = int(os.getenv("FORECAST_MAX_BATCH_SIZE", "64"))
+    FORECAST_MAX_WAIT_MS: float = float(os.getenv("FORECAST_MAX_WAIT_MS", "5"))
+    # How far back the monthly aggregation looks for 3 months with expenses
+    FORECAST_LOOKBACK_MONTHS: int = int(os.getenv("FORECAST_LOOKBACK_MONTHS", "24"))
+
+    # Seconds between passes that rebuild the monthly ledger totals from
+    # transactions and repair drift (0 disables)
+    LEDGER_RECONCILE_INTERVAL: float = float(
+        os.getenv("LEDGER_RECONCILE_INTERVAL", "86400")
+    )
+
+    # Heavy subsystems to load in the background at startup, e.g.
+    # "forecast_model,rag_chatbot". Anything not listed loads on first use.
+    WARMUP_PROVIDERS: list = [
+        name.strip()
+        for name in os.getenv("WARMUP_PROVIDERS", "").split(",")
+        if name.strip()
+    ]
+
+    # Password hashing: bcrypt cost factor for new hashes, hashing processes,
+    # and jobs queued or running per API worker before requests get a 503
+    PASSWORD_BCRYPT_ROUNDS: int = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_MAX_PENDING: int = int(
+        os.getenv("PASSWORD_HASH_MAX_PENDING", "32")
+    )
+
+    # Avatar uploads: size cap, thumbnail edge lengths in px ("" for none), and
+    # threads rendering thumbnails per API worker
+    AVATAR_MAX_BYTES: int = int(os.getenv("AVATAR_MAX_BYTES", str(10 * 1024 * 1024)))
+    AVATAR_THUMBNAIL_SIZES: list = [
+        int(size) for size in os.getenv("AVATAR_THUMBNAIL_SIZES", "64,256").split(",")
+        if size.strip()
+    ]
+    AVATAR_THUMBNAIL_WORKERS: int = int(os.getenv("AVATAR_THUMBNAIL_WORKERS", "2"))
+
+    # Async PostgREST connection pool
+    SUPABASE_POOL_MAX_CONNECTIONS: int = int(
+        os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "50")
+    )
+    SUPABASE_POOL_MAX_KEEPALIVE: int = int(
+        os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20")
+    )
+    SUPABASE_TIMEOUT: float = float(os.getenv("SUPABASE_TIMEOUT", "10"))
 
 
 settings = Settings()
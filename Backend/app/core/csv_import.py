@@ -0,0 +1,175 @@
+"""
+Streaming CSV parser and validator for bulk transaction imports
+- Reads the file lazily, `chunk_rows` rows at a time, so memory does not grow with it
+- Understands the Kaggle "Personal Budget Transactions" layout (date, category,
+  amount), plus optional description and type columns
+- Kaggle sub-categories (Restuarant, Taxi, ...) map onto the app's categories the
+  same way TimeSeries/forecasting.ipynb grouped them for training
+"""
+
+import csv
+import io
+import math
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from app.domain.transaction import Transaction, TransactionType
+
+KAGGLE_CATEGORY_MAP = {
+    sub: main
+    for main, subs in {
+        "Food": ["Restuarant", "Coffe", "Business lunch", "Market"],
+        "Fashion": ["Clothing"],
+        "Health": ["Health"],
+        "Transportation": [
+            "Travel",
+            "Taxi",
+            "Transport",
+            "Fuel",
+            "Rent Car",
+            "Motel",
+        ],
+        "Entertainment": ["Events", "joy", "Film/enjoyment", "Other", "Phone"],
+        "Education": ["business_expenses", "Tech", "Learning"],
+        "Lifestyle": ["Communal", "Sport"],
+    }.items()
+    for sub in subs
+}
+
+# Accepted header names for each field, compared lower-cased
+COLUMN_ALIASES = {
+    "date": ("date", "created_at", "transaction_date"),
+    "category": ("category", "category_name"),
+    "amount": ("amount",),
+    "description": ("description", "note", "details"),
+    "type": ("type", "transaction_type"),
+}
+REQUIRED_COLUMNS = ("date", "category", "amount")
+
+_DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S %z",  # Kaggle: 2022-07-06 05:57:10 +0000
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%d/%m/%Y %H:%M",
+)
+
+MAX_REPORTED_ERRORS = 50
+
+
+def parse_date(value: str) -> datetime:
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        for fmt in _DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"unrecognised date '{value}'")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _column_index(header: List[str]) -> Dict[str, int]:
+    names = [h.strip().lower() for h in header]
+    index = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in names:
+                index[field] = names.index(alias)
+                break
+    missing = [c for c in REQUIRED_COLUMNS if c not in index]
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+    return index
+
+
+class CsvTransactionReader:
+    """Yields (transactions, errors) per chunk of raw rows."""
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        user_id: UUID,
+        resolve_category: Callable[[str], str],
+        chunk_rows: int,
+    ):
+        self.stream = stream
+        self.user_id = user_id
+        self.resolve_category = resolve_category
+        self.chunk_rows = chunk_rows
+        # Raw category text -> category_id, filled as the file is read
+        self.category_ids: Dict[str, str] = {}
+        self._text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+        self._reader = csv.reader(self._text)
+        header = next(self._reader, None)
+        if header is None:
+            raise ValueError("CSV file is empty")
+        self._columns = _column_index(header)
+        self._now = datetime.now(timezone.utc)
+
+    @property
+    def bytes_read(self) -> int:
+        # Position of the underlying file; ahead of the parser by one buffer
+        return self.stream.tell()
+
+    def _category_id(self, raw: str) -> str:
+        category_id = self.category_ids.get(raw)
+        if category_id is None:
+            name = KAGGLE_CATEGORY_MAP.get(raw.strip(), raw)
+            category_id = self.category_ids[raw] = self.resolve_category(name)
+        return category_id
+
+    def _field(self, row: List[str], name: str) -> Optional[str]:
+        i = self._columns.get(name)
+        if i is None or i >= len(row):
+            return None
+        return row[i].strip() or None
+
+    def _to_transaction(self, row: List[str]) -> Transaction:
+        created_at = parse_date(self._field(row, "date") or "")
+        if created_at > self._now:
+            raise ValueError("date is in the future")
+
+        amount = float((self._field(row, "amount") or "").replace(",", ""))
+        if not math.isfinite(amount) or amount == 0:
+            raise ValueError("amount must be a non-zero number")
+        raw_type = self._field(row, "type")
+        if raw_type:
+            transaction_type = TransactionType(raw_type.capitalize())
+        else:
+            # No type column (the Kaggle export): every row is an expense
+            transaction_type = TransactionType.EXPENSE
+
+        category = self._field(row, "category") or ""
+        return Transaction(
+            transaction_id=uuid4(),
+            user_id=self.user_id,
+            category_id=self._category_id(category),
+            description=self._field(row, "description") or category or None,
+            created_at=created_at,
+            amount=abs(amount),
+            transaction_type=transaction_type,
+        )
+
+    def chunks(self) -> Iterator[Tuple[List[Transaction], List[str]]]:
+        while True:
+            transactions: List[Transaction] = []
+            errors: List[str] = []
+            for row in self._reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                try:
+                    transactions.append(self._to_transaction(row))
+                except ValueError as e:
+                    errors.append(f"line {self._reader.line_num}: {e}")
+                if len(transactions) + len(errors) >= self.chunk_rows:
+                    break
+            if not transactions and not errors:
+                return
+            yield transactions, errors
@@ -0,0 +1,138 @@
+"""
+Two-tier cache for embedding calls
+- Keys are the model name plus a sha256 of the text
+- Tier 1: bounded in-memory LRU per worker
+- Tier 2: SQLite file shared by all workers on the machine
+- Hit/miss counters show how many provider calls the cache saved
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        inner: Embeddings,
+        max_memory_items: Optional[int] = None,
+        db_path: Optional[str] = None,
+    ):
+        self.inner = inner
+        self.max_memory_items = max_memory_items or settings.EMBEDDING_CACHE_MAX_ITEMS
+        self.db_path = db_path if db_path is not None else settings.EMBEDDING_CACHE_PATH
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db() if self.db_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def model(self) -> str:
+        return getattr(self.inner, "model", type(self.inner).__name__)
+
+    def _open_db(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+        db.commit()
+        return db
+
+    def _key(self, kind: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model}:{kind}:{digest}"
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+            self.memory_hits += len(found)
+
+            missing = [k for k in dict.fromkeys(keys) if k not in found]
+            if self._db is not None and missing:
+                for start in range(0, len(missing), 500):
+                    batch = missing[start : start + 500]
+                    rows = self._db.execute(
+                        "SELECT key, vector FROM embeddings WHERE key IN (%s)"
+                        % ",".join("?" * len(batch)),
+                        batch,
+                    ).fetchall()
+                    for key, blob in rows:
+                        vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                        found[key] = vector
+                        self._remember(key, vector)
+                        self.disk_hits += 1
+        return found
+
+    def _store(self, items: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, vector)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [
+                        (key, np.asarray(vector, dtype=np.float32).tobytes())
+                        for key, vector in items.items()
+                    ],
+                )
+                self._db.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key("doc", text) for text in texts]
+        found = self._lookup(keys)
+
+        # Embed each distinct missing text once, in a single provider call
+        pending = {k: t for k, t in zip(keys, texts) if k not in found}
+        if pending:
+            vectors = self.inner.embed_documents(list(pending.values()))
+            fresh = dict(zip(pending.keys(), vectors))
+            with self._lock:
+                self.misses += len(fresh)
+            self._store(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key("query", text)
+        found = self._lookup([key])
+        if key in found:
+            return found[key]
+        vector = self.inner.embed_query(text)
+        with self._lock:
+            self.misses += 1
+        self._store({key: vector})
+        return vector
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "memory_items": len(self._memory),
+            }
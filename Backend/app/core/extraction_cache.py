@@ -0,0 +1,142 @@
+"""
+Cache for LLM transaction extraction
+- Keys are the normalized message text plus the UTC reference date the LLM
+  resolves relative dates against ("yesterday" is a different day tomorrow)
+- Values are the parsed transaction fields, not the raw LLM output
+- Tier 1: bounded in-memory LRU per worker with a TTL
+- Tier 2 (optional): SQLite file shared by all workers on the machine
+- Hit/miss counters show how many LLM calls the cache saved
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the extraction."""
+    return _SPACES.sub(" ", text).strip().rstrip(".!").lower()
+
+
+class ExtractionCache:
+    def __init__(
+        self,
+        max_memory_items: Optional[int] = None,
+        ttl: Optional[float] = None,
+        db_path: Optional[str] = None,
+    ):
+        self.max_memory_items = (
+            max_memory_items or settings.EXTRACTION_CACHE_MAX_ITEMS
+        )
+        self.ttl = ttl if ttl is not None else settings.EXTRACTION_CACHE_TTL
+        self.db_path = (
+            db_path if db_path is not None else settings.EXTRACTION_CACHE_PATH
+        )
+        # key -> (expires_at, parsed transactions)
+        self._memory: "OrderedDict[str, Tuple[float, List[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db() if self.db_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _open_db(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS extractions "
+            "(key TEXT PRIMARY KEY, parsed TEXT, expires_at REAL)"
+        )
+        db.commit()
+        return db
+
+    @staticmethod
+    def _key(text: str, reference: date) -> str:
+        digest = hashlib.sha256(normalize_message(text).encode("utf-8")).hexdigest()
+        return f"{reference.isoformat()}:{digest}"
+
+    @staticmethod
+    def reference_date(now: Optional[datetime] = None) -> date:
+        """The date the extraction prompt passes as "Current date"."""
+        return (now or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
+
+    def _remember(self, key: str, expires_at: float, parsed: List[dict]) -> None:
+        self._memory[key] = (expires_at, parsed)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str, now: Optional[datetime] = None) -> Optional[List[dict]]:
+        key = self._key(text, self.reference_date(now))
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return [dict(item) for item in entry[1]]
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT parsed, expires_at FROM extractions "
+                    "WHERE key = ? AND expires_at > ?",
+                    (key, time.time()),
+                ).fetchone()
+                if row is not None:
+                    parsed = json.loads(row[0])
+                    self._remember(key, row[1], parsed)
+                    self.disk_hits += 1
+                    return [dict(item) for item in parsed]
+
+            self.misses += 1
+            return None
+
+    def put(
+        self, text: str, parsed: List[dict], now: Optional[datetime] = None
+    ) -> None:
+        """Cache a successful extraction; results with errors are retried."""
+        if not parsed or any("error" in item for item in parsed):
+            return
+        key = self._key(text, self.reference_date(now))
+        expires_at = time.time() + self.ttl
+        parsed = [dict(item) for item in parsed]
+        with self._lock:
+            self._remember(key, expires_at, parsed)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO extractions (key, parsed, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, json.dumps(parsed), expires_at),
+                )
+                self._db.execute(
+                    "DELETE FROM extractions WHERE expires_at <= ?", (time.time(),)
+                )
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            total = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "memory_items": len(self._memory),
+            }
+
+
+extraction_cache = ExtractionCache()
@@ -0,0 +1,267 @@
+"""
+Rule-based transaction extraction that runs before the LLM
+- Handles short inputs such as "lunch 50 yesterday" or "salary 8000 today"
+- Amount by regex, relative dates through dateparser, category and type from
+  keywords for the categories the LLM prompt lists
+- Every result carries a confidence; below FAST_PATH_MIN_CONFIDENCE the input
+  goes to the LLM as before
+- Counters for the hit rate and the LLM latency the hits avoided
+"""
+
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from dateparser import parse as date_parse
+
+from app.core.config import settings
+
+# Keyword -> category, following the category list in the extraction prompt
+EXPENSE_KEYWORDS = {
+    "Food": [
+        "lunch", "dinner", "breakfast", "brunch", "coffee", "cafe", "restaurant",
+        "food", "groceries", "grocery", "supermarket", "market", "pizza",
+        "burger", "snack", "snacks", "meal", "juice", "bakery", "takeaway",
+    ],
+    "Transportation": [
+        "taxi", "uber", "careem", "bus", "metro", "train", "fuel", "gas",
+        "petrol", "parking", "transport", "flight", "toll",
+    ],
+    "Health": [
+        "doctor", "pharmacy", "medicine", "medicines", "hospital", "clinic",
+        "dentist", "checkup", "vitamins",
+    ],
+    "Entertainment": [
+        "movie", "movies", "cinema", "netflix", "spotify", "concert", "game",
+        "games", "party", "outing",
+    ],
+    "Fashion": [
+        "clothes", "shoes", "shirt", "tshirt", "dress", "jacket", "jeans",
+        "bag", "sneakers", "watch",
+    ],
+    "Lifestyle": [
+        "gym", "haircut", "salon", "barber", "rent", "electricity", "internet",
+        "phone", "bills", "bill", "furniture",
+    ],
+    "Education": [
+        "course", "courses", "book", "books", "tuition", "school", "university",
+        "udemy", "lesson", "lessons",
+    ],
+}
+INCOME_KEYWORDS = {
+    "Salary": ["salary", "paycheck", "wage", "wages"],
+    "Freelance": ["freelance", "upwork", "fiverr", "client", "gig"],
+    # "interest", "investment" and "stocks" are paid as often as earned; those
+    # inputs go to the LLM
+    "Investments": ["dividend", "dividends"],
+    "Bonus": ["bonus"],
+    "Refunds": ["refund", "refunded", "cashback"],
+}
+KEYWORD_CATEGORY: Dict[str, Tuple[str, str]] = {
+    **{w: (c, "Expense") for c, words in EXPENSE_KEYWORDS.items() for w in words},
+    **{w: (c, "Income") for c, words in INCOME_KEYWORDS.items() for w in words},
+}
+
+# Verbs that say which way the money went; one contradicting the keyword's
+# type ("paid 3000 wages") sends the input to the LLM
+DIRECTION_WORDS = {
+    **{w: "Expense" for w in ("spent", "spend", "paid", "pay", "bought", "buy")},
+    **{w: "Income" for w in ("received", "receive", "earned", "earn")},
+}
+
+# Words that carry no information of their own
+FILLER_WORDS = {
+    "i", "a", "an", "the", "my", "for", "on", "at", "in", "of", "to", "from",
+    "and", "with", "had", "got", "get", "some", "new", "egp", "le", "usd",
+    "pounds", "pound", "dollars", "ago", "day", "days", "week", "weeks",
+}
+
+_AMOUNT = re.compile(
+    r"(?<![\w.])(?:[$£€])?(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{1,2}))?(k)?(?![\w.])",
+    re.IGNORECASE,
+)
+_WEEKDAY = r"(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+_DATE_PHRASE = re.compile(
+    r"\b(today|tonight|this (?:morning|afternoon|evening)|last night"
+    r"|(?:the )?day before yesterday|yesterday"
+    r"|\d+ (?:days?|weeks?|months?) ago|last (?:week|month)"
+    rf"|(?:last |on )?{_WEEKDAY}"
+    r"|\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?)\b",
+    re.IGNORECASE,
+)
+# Anything pointing at the future or a range is left to the LLM
+_FUTURE = re.compile(r"\b(tomorrow|next|after|later|in \d+)\b", re.IGNORECASE)
+_WORD = re.compile(r"[a-z]+")
+_ISO_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")
+_NUMERIC_DATE = re.compile(r"(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?")
+# Older dates are more likely a misreading than a late entry
+MAX_DATE_AGE = timedelta(days=366)
+
+
+def _numeric_date(phrase: str, now: datetime) -> Optional[datetime]:
+    """A date written in digits, or None if it is invalid or could be read
+    either way round.
+
+    Dates are day first, but "5/3" may still mean May 3rd, so a short date is
+    only trusted when its day is above 12 or equals the month. Without a year
+    it is the latest such date not after `now`.
+    """
+    iso = _ISO_DATE.fullmatch(phrase)
+    if iso:
+        year, month, day = (int(part) for part in iso.groups())
+        years = [year]
+    else:
+        numeric = _NUMERIC_DATE.fullmatch(phrase)
+        if numeric is None:
+            return None
+        day, month = int(numeric.group(1)), int(numeric.group(2))
+        if day <= 12 and day != month:
+            return None
+        year = numeric.group(3)
+        if year is None:
+            years = [now.year, now.year - 1]
+        else:
+            years = [int(year) + 2000 if len(year) == 2 else int(year)]
+    for year in years:
+        try:
+            date = datetime(year, month, day, tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        if date <= now or len(years) == 1:
+            return date
+    return None
+
+
+def _resolve_date(phrase: Optional[str], now: datetime) -> Optional[datetime]:
+    if phrase is None:
+        return now
+    phrase = phrase.lower()
+    if re.fullmatch(r"[\d/-]+", phrase):
+        return _numeric_date(phrase, now)
+    if phrase in ("today", "tonight") or phrase.startswith("this "):
+        return now
+    if phrase == "last night":
+        return now - timedelta(days=1)
+    # dateparser reads "last monday" as nothing, "monday" as the last one
+    phrase = re.sub(rf"^(?:last|on) (?={_WEEKDAY})", "", phrase)
+    parsed = date_parse(
+        phrase,
+        languages=["en"],
+        settings={
+            "RELATIVE_BASE": now.replace(tzinfo=None),
+            "PREFER_DATES_FROM": "past",
+            "DATE_ORDER": "DMY",
+        },
+    )
+    if parsed is None:
+        return None
+    return parsed.replace(tzinfo=timezone.utc)
+
+
+def extract_rule_based(text: str, now: Optional[datetime] = None) -> Optional[dict]:
+    """Parse `text` like one LLM block, or None if it is clearly not simple.
+
+    The result has the fields of `parse_llm_response` items plus `confidence`.
+    """
+    now = now or datetime.now(timezone.utc)
+    if _FUTURE.search(text):
+        return None
+
+    dates = list(_DATE_PHRASE.finditer(text))
+    if len(dates) > 1:
+        return None
+    date_phrase = dates[0].group(0) if dates else None
+    rest = _DATE_PHRASE.sub(" ", text)
+
+    amounts = list(_AMOUNT.finditer(rest))
+    if len(amounts) != 1:
+        # No amount, or several transactions in one message
+        return None
+    whole, cents, thousands = amounts[0].groups()
+    amount = float(whole.replace(",", "") + (f".{cents}" if cents else ""))
+    if thousands:
+        amount *= 1000
+    if amount <= 0:
+        return None
+    rest = _AMOUNT.sub(" ", rest)
+
+    words = _WORD.findall(rest.lower())
+    hits = [w for w in words if w in KEYWORD_CATEGORY]
+    if len({KEYWORD_CATEGORY[w] for w in hits}) != 1:
+        return None
+    category, transaction_type = KEYWORD_CATEGORY[hits[0]]
+    if any(DIRECTION_WORDS.get(w, transaction_type) != transaction_type for w in words):
+        return None
+    unknown = [
+        w
+        for w in words
+        if w not in KEYWORD_CATEGORY and w not in FILLER_WORDS
+        and w not in DIRECTION_WORDS
+    ]
+
+    created_at = _resolve_date(date_phrase, now)
+    if created_at is None or not now - MAX_DATE_AGE <= created_at <= now:
+        return None
+
+    # Amount and a single category are required; unknown words lower trust
+    confidence = 0.5 + 0.3 + (0.2 if date_phrase else 0.1) - 0.1 * len(unknown)
+    description = " ".join([*unknown[:1], hits[0]]) if unknown else hits[0]
+    return {
+        "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S+00"),
+        "amount": amount,
+        "transaction_type": transaction_type,
+        "category": category,
+        "description": description,
+        "feedback": f"Logged {description} ({category}) for {amount:g}.",
+        "message": 1,
+        "confidence": round(max(confidence, 0.0), 2),
+    }
+
+
+class FastPathExtractor:
+    def __init__(self, min_confidence: float):
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.hits = 0
+        self.rule_seconds = 0.0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def extract(self, text: str) -> Optional[List[dict]]:
+        """Parsed transactions when the rules are confident, else None."""
+        start = time.perf_counter()
+        result = extract_rule_based(text)
+        elapsed = time.perf_counter() - start
+        hit = result is not None and result["confidence"] >= self.min_confidence
+        with self._lock:
+            self.attempts += 1
+            self.rule_seconds += elapsed
+            if hit:
+                self.hits += 1
+        return [result] if hit else None
+
+    def record_llm_call(self, seconds: float) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            avg_llm = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+            avg_rule = self.rule_seconds / self.attempts if self.attempts else 0.0
+            hit_rate = self.hits / self.attempts if self.attempts else 0.0
+            return {
+                "attempts": self.attempts,
+                "hits": self.hits,
+                "hit_rate": round(hit_rate, 4),
+                "avg_rule_ms": round(avg_rule * 1000, 3),
+                "avg_llm_ms": round(avg_llm * 1000, 1),
+                # Each hit skipped one LLM call of average duration
+                "llm_seconds_saved": round(self.hits * max(avg_llm - avg_rule, 0), 1),
+            }
+
+
+fast_extractor = FastPathExtractor(settings.FAST_PATH_MIN_CONFIDENCE)
@@ -0,0 +1,168 @@
+"""
+Per-user financial digest for the chatbot prompt
+- Built from the user's transaction rows with vectorized pandas, no embeddings
+- Monthly totals per category, year-to-date totals, top merchants by
+  description, income/expense ratio and category trends
+- `frame_fingerprint` lets callers rebuild the digest only when rows changed
+"""
+
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = [
+    "transaction_id",
+    "created_at",
+    "amount",
+    "transaction_type",
+    "category_id",
+    "description",
+]
+TOP_MERCHANTS = 5
+TREND_MONTHS = 3
+# Category changes smaller than this are not called out as trends
+TREND_MIN_CHANGE = 0.1
+
+
+def transactions_frame(
+    rows: List[dict], category_name: Callable[[str], Optional[str]]
+) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df["created_at"] = pd.to_datetime(
+        df["created_at"], utc=True, errors="coerce", format="ISO8601"
+    )
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
+    df = df.dropna(subset=["created_at", "amount"])
+
+    ids = df["category_id"].astype(str)
+    names = {cid: category_name(cid) or "Uncategorized" for cid in ids.unique()}
+    df["category"] = ids.map(names)
+    df["type"] = df["transaction_type"].astype(str).str.capitalize()
+    df["merchant"] = df["description"].fillna("").astype(str).str.strip().str.lower()
+    df["month"] = df["created_at"].dt.tz_localize(None).dt.to_period("M")
+    return df
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Order-independent hash of the rows the digest is built from."""
+    if df.empty:
+        return "0"
+    hashed = pd.util.hash_pandas_object(df[COLUMNS].astype(str), index=False)
+    return f"{len(df)}:{hashed.to_numpy().sum(dtype=np.uint64):x}"
+
+
+def _money(value: float) -> str:
+    return f"{value:,.0f}"
+
+
+def _breakdown(totals: pd.Series) -> str:
+    totals = totals[totals > 0].sort_values(ascending=False)
+    return ", ".join(f"{name} {_money(value)}" for name, value in totals.items())
+
+
+def build_digest(df: pd.DataFrame, now: datetime, months: int) -> str:
+    """Compact plain-text summary of `df` (see transactions_frame)."""
+    if df.empty:
+        return "The user has no recorded transactions yet."
+
+    expenses = df[df["type"] == "Expense"]
+    income = df[df["type"] == "Income"]
+    current = pd.Period(now.strftime("%Y-%m"), "M")
+    lines = [
+        f"As of {now:%Y-%m-%d}, amounts in EGP, {len(df)} transactions since "
+        f"{df['created_at'].min():%Y-%m-%d}."
+    ]
+
+    # Income vs expenses, all time and this year
+    total_income = income["amount"].sum()
+    total_expenses = expenses["amount"].sum()
+    overall = (
+        f"All time: income {_money(total_income)}, expenses "
+        f"{_money(total_expenses)}, net {_money(total_income - total_expenses)}"
+    )
+    if total_income > 0:
+        overall += f"; expenses are {total_expenses / total_income:.0%} of income"
+    lines.append(overall + ".")
+
+    year = df["created_at"].dt.year == now.year
+    ytd_expenses = expenses[year[expenses.index]]
+    ytd_income = income[year[income.index]]
+    lines.append(
+        f"This year ({now.year}): income {_money(ytd_income['amount'].sum())} "
+        f"({_breakdown(ytd_income.groupby('category')['amount'].sum()) or 'none'}); "
+        f"expenses {_money(ytd_expenses['amount'].sum())} "
+        f"({_breakdown(ytd_expenses.groupby('category')['amount'].sum()) or 'none'})."
+    )
+
+    # Monthly totals per category for the most recent months
+    recent = pd.period_range(current - (months - 1), current, freq="M")
+    by_month = (
+        expenses[expenses["month"].isin(recent)]
+        .pivot_table(index="month", columns="category", values="amount", aggfunc="sum")
+        .reindex(recent, fill_value=0)
+        .fillna(0)
+    )
+    income_by_month = income.groupby("month")["amount"].sum()
+    lines.append(f"Monthly totals (last {months} months):")
+    for month in recent:
+        spent = by_month.loc[month]
+        lines.append(
+            f"- {month}: expenses {_money(spent.sum())}"
+            f"{f' ({_breakdown(spent)})' if spent.sum() > 0 else ''}, "
+            f"income {_money(income_by_month.get(month, 0.0))}"
+        )
+
+    # Where the money goes, by description
+    last_year = expenses[expenses["month"] > current - 12]
+    merchants = (
+        last_year[last_year["merchant"] != ""]
+        .groupby("merchant")["amount"]
+        .agg(["sum", "count"])
+        .nlargest(TOP_MERCHANTS, "sum")
+    )
+    if not merchants.empty:
+        lines.append(
+            "Top merchants (last 12 months): "
+            + ", ".join(
+                f"{name} {_money(row['sum'])} ({int(row['count'])}x)"
+                for name, row in merchants.iterrows()
+            )
+            + "."
+        )
+
+    # Last complete months against the ones before them
+    latest = pd.period_range(current - TREND_MONTHS, current - 1, freq="M")
+    earlier = pd.period_range(
+        current - 2 * TREND_MONTHS, current - TREND_MONTHS - 1, freq="M"
+    )
+    now_totals = expenses[expenses["month"].isin(latest)].groupby("category")[
+        "amount"
+    ].sum()
+    before_totals = expenses[expenses["month"].isin(earlier)].groupby("category")[
+        "amount"
+    ].sum()
+    if before_totals.sum() > 0:
+        change = now_totals.sum() / before_totals.sum() - 1
+        trend = (
+            f"Trend: expenses averaged {_money(now_totals.sum() / TREND_MONTHS)}"
+            f"/month over {latest[0]}..{latest[-1]}, {change:+.0%} vs the "
+            f"{TREND_MONTHS} months before"
+        )
+        by_category = (
+            now_totals.reindex(before_totals.index, fill_value=0) / before_totals - 1
+        ).dropna()
+        rising = by_category[by_category >= TREND_MIN_CHANGE].nlargest(3)
+        falling = by_category[by_category <= -TREND_MIN_CHANGE].nsmallest(3)
+        if not rising.empty:
+            trend += "; rising: " + ", ".join(
+                f"{name} {value:+.0%}" for name, value in rising.items()
+            )
+        if not falling.empty:
+            trend += "; falling: " + ", ".join(
+                f"{name} {value:+.0%}" for name, value in falling.items()
+            )
+        lines.append(trend + ".")
+
+    return "\n".join(lines)
@@ -0,0 +1,114 @@
+"""
+Per-user monthly ledger totals kept next to `transactions`
+- `ledger_monthly_totals` holds one row per (user, UTC month, category, type)
+  with the summed amount and the transaction count (sql/ledger_monthly_totals.sql)
+- Transaction writes send signed deltas: +row on create, -old +new on edit,
+  -row on delete; `apply_ledger_deltas` applies them atomically in the database
+- `LedgerReconciler` recomputes the totals from `transactions` with
+  `reconcile_ledger_totals` at startup and then periodically, logs any drift
+  and repairs it
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.supabase import get_async_postgrest
+
+logger = logging.getLogger(__name__)
+
+APPLY_RPC = "apply_ledger_deltas"
+RECONCILE_RPC = "reconcile_ledger_totals"
+# Columns of `transactions` a delta is computed from
+LEDGER_COLUMNS = "user_id, category_id, created_at, amount, transaction_type"
+
+LedgerKey = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+def ledger_month(created_at) -> Optional[str]:
+    """First day of the UTC month of `created_at` (datetime or ISO string)."""
+    if created_at is None:
+        return None
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return f"{created_at.year:04d}-{created_at.month:02d}-01"
+
+
+def _key(row: dict) -> LedgerKey:
+    category_id = row.get("category_id")
+    return (
+        str(row["user_id"]),
+        ledger_month(row.get("created_at")),
+        str(category_id) if category_id is not None else None,
+        row.get("transaction_type"),
+    )
+
+
+def ledger_deltas(
+    added: Iterable[dict] = (), removed: Iterable[dict] = ()
+) -> List[dict]:
+    """Signed per-key changes for transaction rows that were added/removed.
+
+    An edit is the old row removed plus the new row added; keys that net to
+    nothing (e.g. only the description changed) are left out.
+    """
+    totals: Dict[LedgerKey, List[float]] = defaultdict(lambda: [0.0, 0])
+    for rows, sign in ((added, 1), (removed, -1)):
+        for row in rows:
+            entry = totals[_key(row)]
+            entry[0] += sign * float(row.get("amount") or 0.0)
+            entry[1] += sign
+    return [
+        {
+            "user_id": user_id,
+            "month": month,
+            "category_id": category_id,
+            "transaction_type": transaction_type,
+            "amount": amount,
+            "tx_count": count,
+        }
+        for (user_id, month, category_id, transaction_type), (amount, count)
+        in totals.items()
+        if count or abs(amount) > 1e-9
+    ]
+
+
+class LedgerReconciler:
+    def __init__(self, interval: float):
+        # 0 turns the periodic pass off
+        self.interval = interval
+
+    async def run_once(
+        self, user_id: Optional[str] = None, fix: bool = True
+    ) -> List[dict]:
+        """Recompute totals (of one user, or everyone) and return the drift."""
+        response = await (
+            get_async_postgrest()
+            .rpc(RECONCILE_RPC, {"p_user_id": user_id, "p_fix": fix})
+            .execute()
+        )
+        drift = response.data or []
+        if drift:
+            logger.warning(
+                f"Ledger drift on {len(drift)} keys"
+                f"{' (repaired)' if fix else ''}, e.g. {drift[0]}"
+            )
+        return drift
+
+    async def run_forever(self) -> None:
+        # The first pass runs at startup, so writes that reached `transactions`
+        # without their deltas (e.g. while the API was down) show up right away
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Ledger reconciliation failed")
+            await asyncio.sleep(self.interval)
+
+
+ledger_reconciler = LedgerReconciler(settings.LEDGER_RECONCILE_INTERVAL)
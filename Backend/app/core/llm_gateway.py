@@ -0,0 +1,231 @@
+"""
+Async gateway for LLM calls
+- At most LLM_MAX_CONCURRENCY calls are in flight per worker; further callers
+  wait on a semaphore instead of holding a threadpool slot
+- Every call has a deadline (LLM_TIMEOUT seconds, retries included)
+- An attempt still running after LLM_HEDGE_AFTER seconds gets a hedged second
+  attempt if a slot is free; the first answer wins and the other is cancelled
+- Failed attempts are retried while the deadline allows, up to
+  LLM_MAX_ATTEMPTS attempts per call
+- Streams hold one slot under the same deadline but are never hedged or
+  retried, since chunks already sent cannot be taken back
+- Blocking work around the calls (sync SDKs, retrieval) runs on a dedicated
+  thread pool, so the LLM never takes the threadpool that serves /users,
+  /budgets and /goals
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Set, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        max_concurrency: int,
+        timeout: float,
+        hedge_after: float,
+        max_attempts: int,
+        pool_size: int,
+    ):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        # 0 turns hedging off
+        self.hedge_after = hedge_after
+        self.max_attempts = max(max_attempts, 1)
+        self.pool_size = pool_size
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.attempts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size, thread_name_prefix="llm"
+                )
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run_blocking(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run blocking work on the LLM pool instead of the request threadpool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(fn, *args)
+        )
+
+    async def _attempt(self, make_call: Callable[[], Awaitable[T]]) -> T:
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.attempts += 1
+        try:
+            return await make_call()
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def _can_hedge(self, pending: Set[asyncio.Future], launched: int) -> bool:
+        return (
+            self.hedge_after > 0
+            and len(pending) == 1
+            and launched < self.max_attempts
+            and not self._get_semaphore().locked()
+        )
+
+    async def call(self, make_call: Callable[[], Awaitable[T]]) -> T:
+        """Await `make_call()` within the deadline, hedging and retrying.
+
+        `make_call` is invoked once per attempt, so it must start a fresh call
+        each time (e.g. `lambda: llm.ainvoke(prompt)`).
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        self.calls += 1
+        pending: Set[asyncio.Future] = set()
+        hedge: Optional[asyncio.Future] = None
+        launched = 0
+        last_launch = 0.0
+        error: Optional[BaseException] = None
+        try:
+            while True:
+                now = loop.time()
+                if now >= deadline:
+                    self.timeouts += 1
+                    raise LLMTimeoutError(
+                        f"LLM call timed out after {self.timeout:g}s"
+                    ) from error
+                if not pending:
+                    if launched >= self.max_attempts:
+                        self.failures += 1
+                        raise error
+                    if launched:
+                        self.retries += 1
+                    pending.add(asyncio.ensure_future(self._attempt(make_call)))
+                    launched += 1
+                    last_launch = now
+
+                wait = deadline - now
+                can_hedge = self._can_hedge(pending, launched)
+                if can_hedge:
+                    wait = min(wait, max(last_launch + self.hedge_after - now, 0))
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                    logger.warning(f"LLM attempt failed: {error!r}")
+
+                if not done and can_hedge and self._can_hedge(pending, launched):
+                    self.hedges += 1
+                    hedge = asyncio.ensure_future(self._attempt(make_call))
+                    pending.add(hedge)
+                    launched += 1
+                    last_launch = loop.time()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def stream(
+        self, make_stream: Callable[[], AsyncIterator[T]]
+    ) -> AsyncIterator[T]:
+        """Iterate `make_stream()` holding one slot, within the deadline."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        semaphore = self._get_semaphore()
+        self.calls += 1
+        self.waiting += 1
+        try:
+            async with asyncio.timeout_at(deadline):
+                await semaphore.acquire()
+        except TimeoutError:
+            self.timeouts += 1
+            raise LLMTimeoutError(f"LLM call timed out after {self.timeout:g}s")
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.attempts += 1
+        iterator = make_stream()
+        try:
+            while True:
+                # The deadline only covers waiting on the model, not our caller
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+                except TimeoutError:
+                    self.timeouts += 1
+                    raise LLMTimeoutError(
+                        f"LLM stream timed out after {self.timeout:g}s"
+                    )
+                yield item
+        except LLMTimeoutError:
+            raise
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+
+llm_gateway = LLMGateway(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    timeout=settings.LLM_TIMEOUT,
+    hedge_after=settings.LLM_HEDGE_AFTER,
+    max_attempts=settings.LLM_MAX_ATTEMPTS,
+    pool_size=settings.LLM_THREAD_POOL_SIZE,
+)
@@ -0,0 +1,176 @@
+"""
+NumPy-only inference for the expense LSTM
+- `export_npz` copies the weights of lstm.h5 and the scaler statistics into one .npz
+- `NumpyLSTM` / `NumpyScaler` mirror the `predict` / `transform` calls the
+  forecast repository makes, so serving does not need TensorFlow
+- When TensorFlow is installed, the export also stores Keras predictions for
+  seeded inputs (`reference_inputs` / `reference_outputs`); tests check the
+  NumPy forward pass against them without TensorFlow
+
+Export (needs h5py and joblib; TensorFlow only for the reference outputs):
+    python -m app.core.lstm_numpy app/core/TimeSeries/lstm.h5 \
+        app/core/TimeSeries/scaler.save app/core/TimeSeries/lstm.npz
+"""
+
+import json
+import sys
+
+import numpy as np
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    # tanh form avoids overflow warnings from exp() on large inputs
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+# Inputs scored by Keras at export time
+REFERENCE_SAMPLES = 64
+
+_ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+}
+
+
+def export_npz(h5_path: str, scaler_path: str, out_path: str) -> None:
+    """Write LSTM/Dense weights (in layer order) and scaler stats to `out_path`."""
+    import h5py
+    import joblib
+
+    arrays = {}
+    layers = []
+    with h5py.File(h5_path, "r") as f:
+        config = json.loads(f.attrs["model_config"])
+        weights = f["model_weights"]
+        for layer in config["config"]["layers"]:
+            kind, cfg = layer["class_name"], layer["config"]
+            if kind not in ("LSTM", "Dense"):
+                # InputLayer and Dropout have no weights at inference time
+                continue
+            group = weights[cfg["name"]]
+            names = [
+                n.decode() if isinstance(n, bytes) else n
+                for n in group.attrs["weight_names"]
+            ]
+            i = len(layers)
+            for name in names:
+                short = name.split("/")[-1].split(":")[0]
+                arrays[f"layer{i}_{short}"] = np.asarray(group[name], dtype=np.float32)
+            layers.append(
+                {
+                    "type": kind,
+                    "activation": cfg.get("activation", "linear"),
+                    "recurrent_activation": cfg.get("recurrent_activation"),
+                    "return_sequences": cfg.get("return_sequences", False),
+                }
+            )
+
+    scaler = joblib.load(scaler_path)
+    arrays["scaler_mean"] = np.asarray(scaler.mean_, dtype=np.float64)
+    arrays["scaler_scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+    arrays["layers"] = np.array(json.dumps(layers))
+    arrays.update(_keras_reference(h5_path, scaler))
+    np.savez_compressed(out_path, **arrays)
+
+
+def reference_inputs(n: int = REFERENCE_SAMPLES) -> np.ndarray:
+    """Seeded (n, 3, 7) monthly category totals in the range the app sees."""
+    return np.random.default_rng(42).uniform(0, 2500, size=(n, 3, 7))
+
+
+def _keras_reference(h5_path: str, scaler) -> dict:
+    try:
+        from tensorflow.keras.models import load_model
+    except ImportError:
+        print("TensorFlow not installed, exporting without reference outputs")
+        return {}
+    raw = reference_inputs()
+    scaled = scaler.transform(raw.reshape(-1, raw.shape[-1])).reshape(raw.shape)
+    outputs = load_model(h5_path).predict(scaled, verbose=0)
+    return {
+        "reference_inputs": raw,
+        "reference_outputs": np.asarray(outputs, dtype=np.float64),
+    }
+
+
+class NumpyScaler:
+    """StandardScaler.transform with the exported mean/scale."""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class NumpyLSTM:
+    """Forward pass of the Sequential LSTM/Dense stack, batched over axis 0."""
+
+    def __init__(self, layers: list, weights: dict):
+        self.layers = layers
+        self.weights = weights
+
+    def _lstm(self, i: int, layer: dict, x: np.ndarray) -> np.ndarray:
+        kernel = self.weights[f"layer{i}_kernel"]
+        recurrent = self.weights[f"layer{i}_recurrent_kernel"]
+        bias = self.weights[f"layer{i}_bias"]
+        act = _ACTIVATIONS[layer["activation"]]
+        rec_act = _ACTIVATIONS[layer["recurrent_activation"]]
+
+        batch, steps, _ = x.shape
+        units = recurrent.shape[0]
+        # Input projection for every time step in a single matmul
+        x_proj = x @ kernel + bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        outputs = []
+        for t in range(steps):
+            z = x_proj[:, t] + h @ recurrent
+            # Keras gate order: input, forget, cell, output
+            i_gate = rec_act(z[:, :units])
+            f_gate = rec_act(z[:, units : 2 * units])
+            c_hat = act(z[:, 2 * units : 3 * units])
+            o_gate = rec_act(z[:, 3 * units :])
+            c = f_gate * c + i_gate * c_hat
+            h = o_gate * act(c)
+            outputs.append(h)
+        return np.stack(outputs, axis=1) if layer["return_sequences"] else h
+
+    def predict(self, x, **kwargs) -> np.ndarray:
+        """Same contract as keras Model.predict: (n, steps, features) -> (n, 1)."""
+        out = np.asarray(x, dtype=np.float32)
+        for i, layer in enumerate(self.layers):
+            if layer["type"] == "LSTM":
+                out = self._lstm(i, layer, out)
+            else:
+                kernel = self.weights[f"layer{i}_kernel"]
+                bias = self.weights[f"layer{i}_bias"]
+                out = _ACTIVATIONS[layer["activation"]](out @ kernel + bias)
+        return out
+
+
+def load_npz(path: str):
+    """Return (NumpyLSTM, NumpyScaler) from an exported .npz file."""
+    with np.load(path) as data:
+        arrays = {k: data[k] for k in data.files if not k.startswith("reference_")}
+    layers = json.loads(str(arrays.pop("layers")))
+    scaler = NumpyScaler(arrays.pop("scaler_mean"), arrays.pop("scaler_scale"))
+    return NumpyLSTM(layers, arrays), scaler
+
+
+def load_reference(path: str):
+    """(raw inputs, Keras outputs) stored by `export_npz`, or None."""
+    with np.load(path) as data:
+        if "reference_outputs" not in data.files:
+            return None
+        return data["reference_inputs"], data["reference_outputs"]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        sys.exit("usage: python -m app.core.lstm_numpy <h5> <scaler> <out.npz>")
+    export_npz(*sys.argv[1:])
+    print(f"Wrote {sys.argv[3]}")
@@ -0,0 +1,56 @@
+"""
+Keyset (cursor) pagination over (created_at, transaction_id)
+- Rows are ordered newest first; rows without created_at come last
+- A cursor is the opaque, URL-safe encoding of the last row's sort key
+- `keyset_filter` turns a decoded cursor into a PostgREST filter
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+Keyset = Tuple[Optional[str], str]
+
+
+def encode_cursor(created_at: Optional[str], transaction_id: str) -> str:
+    raw = json.dumps([created_at, str(transaction_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Keyset:
+    """Raises ValueError for anything `encode_cursor` did not produce."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, transaction_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    # Both values end up inside a PostgREST filter, so only accept real ones
+    try:
+        UUID(transaction_id)
+        if created_at is not None:
+            datetime.fromisoformat(created_at)
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return created_at, transaction_id
+
+
+def keyset_filter(query, after: Keyset):
+    """Restrict an ordered transactions query to the rows after `after`."""
+    created_at, transaction_id = after
+    if created_at is None:
+        # Already in the trailing NULL block: only the id still orders rows
+        return query.is_("created_at", "null").lt("transaction_id", transaction_id)
+    # Values are quoted because timestamps contain ':' and '.'
+    return query.or_(
+        f'created_at.lt."{created_at}",'
+        f'and(created_at.eq."{created_at}",transaction_id.lt.{transaction_id}),'
+        "created_at.is.null"
+    )
+
+
+def ordered(query):
+    return query.order("created_at", desc=True, nullsfirst=False).order(
+        "transaction_id", desc=True
+    )
@@ -0,0 +1,107 @@
+"""
+Password hashing off the request path
+- bcrypt hashes and verifications run on a dedicated ProcessPoolExecutor of
+  PASSWORD_HASH_WORKERS processes, so a signup burst never takes the request
+  threadpool or the API process's CPU time
+- At most PASSWORD_HASH_MAX_PENDING jobs are queued or running per API worker;
+  past that callers get PasswordHasherBusy right away instead of queueing
+- New hashes use PASSWORD_BCRYPT_ROUNDS; existing hashes keep verifying with
+  the cost recorded in them
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# One context per cost factor, per pool process
+_contexts: Dict[int, CryptContext] = {}
+
+
+def _context(rounds: int) -> CryptContext:
+    if rounds not in _contexts:
+        _contexts[rounds] = CryptContext(
+            schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds
+        )
+    return _contexts[rounds]
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify(password: str, hashed: str) -> bool:
+    return _context(settings.PASSWORD_BCRYPT_ROUNDS).verify(password, hashed)
+
+
+class PasswordHasherBusy(RuntimeError):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that runs an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _submit(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many password operations in progress")
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._submit(_verify, password, hashed)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "rounds": self.rounds,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
@@ -0,0 +1,172 @@
+"""
+Persistent FAISS index for the PDF knowledge base
+- Chunks are embedded once and saved to disk next to a manifest of PDF hashes
+- On startup the saved index is loaded into memory
+- Only PDFs that were added or changed are re-embedded; removed PDFs are dropped
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+from filelock import FileLock
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.vectorstores import FAISS
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _embedding_model_name(embeddings) -> str:
+    return getattr(embeddings, "model", type(embeddings).__name__)
+
+
+def _load_manifest(index_dir: str) -> dict:
+    path = os.path.join(index_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(index_dir: str, manifest: dict) -> None:
+    path = os.path.join(index_dir, MANIFEST_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _clear_index(index_dir: str) -> None:
+    """Remove the saved index and manifest, so nothing stale is loaded later."""
+    for name in (MANIFEST_FILE, "index.faiss", "index.pkl"):
+        path = os.path.join(index_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _split_pdf(path: str, sha256: str):
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP
+    )
+    chunks = splitter.split_documents(PyPDFLoader(path).load())
+    texts = [chunk.page_content for chunk in chunks]
+    metadatas = [
+        {"source": os.path.basename(path), "page": chunk.metadata.get("page")}
+        for chunk in chunks
+    ]
+    # The file name keeps ids unique when two PDFs have the same content
+    name = os.path.basename(path)
+    ids = [f"{name}:{sha256[:16]}:{i}" for i in range(len(chunks))]
+    return texts, metadatas, ids
+
+
+def pdf_index_fingerprint(index_dir: Optional[str] = None) -> Optional[str]:
+    """Short hash of what the saved index was built from, or None if there is none.
+
+    It changes whenever a PDF is added, edited or removed, or the embedding
+    model or chunking changes.
+    """
+    manifest = _load_manifest(index_dir or settings.PDF_INDEX_DIR)
+    if not manifest:
+        return None
+    encoded = json.dumps(manifest, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def load_or_build_pdf_index(
+    pdf_paths: List[str], embeddings, index_dir: Optional[str] = None
+) -> Optional[FAISS]:
+    """Return the PDF vector store, embedding only what changed since last run."""
+    index_dir = index_dir or settings.PDF_INDEX_DIR
+    os.makedirs(index_dir, exist_ok=True)
+
+    # One worker rebuilds, the others wait and then load the saved result
+    with FileLock(os.path.join(index_dir, ".lock")):
+        manifest = _load_manifest(index_dir)
+        model_name = _embedding_model_name(embeddings)
+        if manifest and (
+            manifest.get("embedding_model") != model_name
+            or manifest.get("chunk_size") != CHUNK_SIZE
+            or manifest.get("chunk_overlap") != CHUNK_OVERLAP
+        ):
+            logger.info("PDF index settings changed, rebuilding from scratch.")
+            manifest = {}
+
+        vector_store = None
+        if manifest and os.path.exists(os.path.join(index_dir, "index.faiss")):
+            vector_store = FAISS.load_local(
+                index_dir, embeddings, allow_dangerous_deserialization=True
+            )
+        else:
+            manifest = {}
+
+        indexed: Dict[str, dict] = manifest.get("files", {})
+        current = {
+            os.path.basename(p): (p, _file_sha256(p))
+            for p in pdf_paths
+            if os.path.exists(p)
+        }
+
+        stale_ids = []
+        for name, entry in list(indexed.items()):
+            if name not in current or current[name][1] != entry["sha256"]:
+                stale_ids.extend(entry["chunk_ids"])
+                del indexed[name]
+
+        changed = [name for name in current if name not in indexed]
+        if not stale_ids and not changed:
+            logger.info("PDF vector store loaded from %s.", index_dir)
+            return vector_store
+
+        if stale_ids and vector_store is not None:
+            vector_store.delete(stale_ids)
+
+        for name in changed:
+            path, sha256 = current[name]
+            texts, metadatas, ids = _split_pdf(path, sha256)
+            indexed[name] = {"sha256": sha256, "chunk_ids": ids}
+            if not texts:
+                continue
+            vectors = embeddings.embed_documents(texts)
+            if vector_store is None:
+                vector_store = FAISS.from_embeddings(
+                    list(zip(texts, vectors)), embeddings, metadatas=metadatas, ids=ids
+                )
+            else:
+                vector_store.add_embeddings(
+                    list(zip(texts, vectors)), metadatas=metadatas, ids=ids
+                )
+            logger.info("Embedded %d chunks from %s.", len(texts), name)
+
+        manifest = {
+            "embedding_model": model_name,
+            "chunk_size": CHUNK_SIZE,
+            "chunk_overlap": CHUNK_OVERLAP,
+            "files": indexed,
+        }
+        if vector_store is None or not vector_store.index_to_docstore_id:
+            logger.warning("No PDF documents loaded.")
+            _clear_index(index_dir)
+            return None
+
+        vector_store.save_local(index_dir)
+        _save_manifest(index_dir, manifest)
+        logger.info("PDF vector store saved to %s.", index_dir)
+        return vector_store
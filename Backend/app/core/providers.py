@@ -0,0 +1,87 @@
+"""
+Lazy providers for heavy subsystems
+- TensorFlow and the RAG stack are imported/built on first use, not at startup
+- Each provider can be warmed in the background and reports its own status
+- `providers` is the registry read by the readiness endpoint
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LazyProvider(Generic[T]):
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self.factory = factory
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+        self._loading = False
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    def get(self) -> T:
+        if self._value is not None:
+            return self._value
+        with self._lock:
+            if self._value is None:
+                self._loading = True
+                start = time.perf_counter()
+                try:
+                    self._value = self.factory()
+                    self.error = None
+                except Exception as e:
+                    self.error = str(e)
+                    raise
+                finally:
+                    self._loading = False
+                self.load_seconds = round(time.perf_counter() - start, 3)
+                logger.info(f"{self.name} ready in {self.load_seconds}s")
+        return self._value
+
+    async def warm(self) -> None:
+        try:
+            await run_in_threadpool(self.get)
+        except Exception as e:
+            logger.error(f"Warm-up of {self.name} failed: {e}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "loading": self._loading,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+def _load_forecast_model():
+    from app.infrastructure.implementation.time_series_repository import (
+        load_ml_models,
+    )
+
+    return load_ml_models()
+
+
+def _create_chatbot():
+    from app.core.rag_model import FinancialChatbot
+
+    return FinancialChatbot()
+
+
+forecast_model = LazyProvider("forecast_model", _load_forecast_model)
+rag_chatbot = LazyProvider("rag_chatbot", _create_chatbot)
+
+providers: Dict[str, LazyProvider] = {
+    p.name: p for p in (forecast_model, rag_chatbot)
+}
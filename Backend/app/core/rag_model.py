@@ -1,18 +1,25 @@
 import os
 import logging
+import time
+from collections import deque
 from dotenv import load_dotenv
-from datetime import datetime
-from langchain_fireworks import Fireworks, FireworksEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_fireworks import ChatFireworks, Fireworks, FireworksEmbeddings
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationBufferMemory
 from langchain.prompts import PromptTemplate
 from langchain.retrievers import EnsembleRetriever
-from langchain.schema import Document
-from supabase import create_client
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.vectorstores import FAISS
-from typing import Dict, Any
+from app.core.answer_cache import SemanticAnswerCache, is_general_question
+from app.core.category_catalog import category_catalog
+from app.core.embedding_cache import CachedEmbeddings
+from app.core.config import settings
+from app.core.llm_gateway import llm_gateway
+from app.core.financial_summary import build_digest, frame_fingerprint, transactions_frame
+from app.core.pdf_index import load_or_build_pdf_index, pdf_index_fingerprint
+from app.core.session_store import SessionStore
+from app.core.supabase import get_supabase
+from app.core.transaction_index import SharedTransactionIndex
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Any, List
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
@@ -29,7 +36,13 @@ if not all([api_key, supabase_url, supabase_key]):
 
 # Initialize LLM and embeddings
 llm = Fireworks(api_key=api_key, model="accounts/fireworks/models/deepseek-v3", temperature=1.0, max_tokens=512, top_p=0.9, frequency_penalty=0.5)
-embeddings = FireworksEmbeddings(api_key=api_key)
+# Same model and sampling as a chat model, which can stream the answer token by token;
+# `llm` still condenses follow-up questions, so only answer tokens are streamed
+answer_llm = ChatFireworks(
+    api_key=api_key, model="accounts/fireworks/models/deepseek-v3", temperature=1.0, max_tokens=512,
+    model_kwargs={"top_p": 0.9, "frequency_penalty": 0.5},
+)
+embeddings = CachedEmbeddings(FireworksEmbeddings(api_key=api_key))
 
 # PDF files
 pdf_files = [
@@ -40,123 +53,96 @@ pdf_files = [
     ]
 ]
 
+def _estimate_session_bytes(session) -> int:
+    """Rough size of a session: digest and chat history (vectors live in the shared index)."""
+    size = len(session["summary"])
+    size += sum(len(str(m.content)) for m in session["memory"].chat_memory.messages)
+    return size
+
+
 class FinancialChatbot:
     def __init__(self):
         self.pdf_vector_store = None
-        self.user_sessions = {}
+        # Seconds from request to first streamed token, most recent streams
+        self.first_token_seconds = deque(maxlen=1000)
+        self.streams = 0
+        self.answer_cache = SemanticAnswerCache(
+            threshold=settings.CHAT_ANSWER_CACHE_THRESHOLD,
+            ttl=settings.CHAT_ANSWER_CACHE_TTL,
+            max_entries=settings.CHAT_ANSWER_CACHE_MAX_ENTRIES,
+        )
+        self.general_chain = None
+        # Per-transaction embeddings are opt-in; the digest covers the usual questions
+        self.transaction_index = (
+            SharedTransactionIndex(embeddings, settings.TRANSACTION_INDEX_DIR)
+            if settings.CHAT_TRANSACTION_EMBEDDINGS else None
+        )
+        self.user_sessions = SessionStore(
+            max_entries=settings.CHAT_SESSION_MAX_ENTRIES,
+            max_bytes=settings.CHAT_SESSION_MAX_BYTES,
+            idle_ttl=settings.CHAT_SESSION_IDLE_TTL,
+            sizeof=_estimate_session_bytes,
+        )
         self._initialize_pdf_knowledge_base()
 
     def _initialize_pdf_knowledge_base(self):
         try:
-            documents = []
-            for pdf in pdf_files:
-                if os.path.exists(pdf):
-                    loader = PyPDFLoader(pdf)
-                    documents.extend(loader.load())
-            if not documents:
-                logger.warning("No PDF documents loaded.")
-                return
-
-            splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-            chunks = splitter.split_documents(documents)
-            texts = [chunk.page_content for chunk in chunks]
-            pdf_embeddings = embeddings.embed_documents(texts)
-
-            self.pdf_vector_store = FAISS.from_texts(texts=texts, embedding=embeddings)
-            logger.info("PDF vector store initialized.")
+            self.pdf_vector_store = load_or_build_pdf_index(pdf_files, embeddings)
         except Exception as e:
             logger.error(f"PDF init failed: {e}")
+        if self.pdf_vector_store:
+            self.general_chain = self._build_general_chain()
 
     def _fetch_user_transactions(self, user_id: str):
-        supabase = create_client(supabase_url, supabase_key)
         try:
-            response = supabase.table("transactions").select("*").eq("user_id", user_id).execute()
-            return response.data
+            response = get_supabase().table("transactions").select("*").eq("user_id", user_id).execute()
+            return response.data or []
         except Exception as e:
             logger.error(f"Failed fetching transactions for user {user_id}: {e}")
-            return []
-
-    def _create_user_transaction_vector_store(self, user_id: str):
-        data = self._fetch_user_transactions(user_id)
-        if not data:
-            return None, None
-
-        raw_docs = []
-        latest_date = None
-
-        for tx in data:
-            created = tx.get("created_at")
-            if created:
-                created_dt = datetime.fromisoformat(created)
-                latest_date = max(latest_date, created_dt) if latest_date else created_dt
-
-            raw_docs.append(
-                Document(
-                    page_content=(
-                        f"Transaction ID: {tx.get('transaction_id', 'Unknown')}\n"
-                        f"Date: {tx.get('created_at', 'Unknown date')}\n"
-                        f"Type: {tx.get('transaction_type', 'Unknown')}\n"
-                        f"Amount: {tx.get('amount', 0)} EGP\n"
-                        f"Category ID: {tx.get('category_id', 'Unknown')}\n"
-                        f"Description: {tx.get('description', 'No description')}"
-                    ),
-                    metadata={"source": "transactions", "user_id": user_id}
-                )
-            )
-
-        splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
-        chunks = [chunk for doc in raw_docs for chunk in splitter.split_documents([doc])]
-
-        texts = [chunk.page_content for chunk in chunks]
-        tx_embeddings = embeddings.embed_documents(texts)
-
-        tx_vector_store = FAISS.from_texts(texts=texts, embedding=embeddings)
-        return tx_vector_store, latest_date
-
-    def _get_or_create_user_session(self, user_id: str):
-        session = self.user_sessions.get(user_id)
-        need_refresh = False
-
-        # Check if there's newer transaction data
-        new_data = self._fetch_user_transactions(user_id)
-        latest = None
-        if new_data:
-            for tx in new_data:
-                if tx.get("created_at"):
-                    dt = datetime.fromisoformat(tx["created_at"])
-                    latest = max(latest, dt) if latest else dt
-
-        if session:
-            last_checked = session.get("last_transaction_check")
-            if latest and last_checked and latest > last_checked:
-                logger.info(f"Detected new transactions for {user_id}, refreshing...")
-                self.refresh_user_data(user_id)
-                need_refresh = True
-
-        if user_id not in self.user_sessions or need_refresh:
-            tx_vector_store, latest_tx_time = self._create_user_transaction_vector_store(user_id)
-
-            retrievers = []
-            weights = []
-
-            if self.pdf_vector_store:
-                retrievers.append(self.pdf_vector_store.as_retriever(search_kwargs={"k": 5}))
-                weights.append(0.5)
-
-            if tx_vector_store:
-                retrievers.append(tx_vector_store.as_retriever(search_kwargs={"k": 3}))
-                weights.append(0.5)
-
-            combined_retriever = (
-                EnsembleRetriever(retrievers=retrievers, weights=weights)
-                if len(retrievers) > 1 else retrievers[0]
-            )
-
-            prompt = PromptTemplate.from_template("""
+            return None
+
+    def _refresh_summary(self, user_id: str, session, rows: List[dict]):
+        """Rebuild the digest only when the user's transactions changed."""
+        df = transactions_frame(rows, category_catalog.name_of)
+        fingerprint = frame_fingerprint(df)
+        if fingerprint == session["summary_fingerprint"]:
+            return
+        session["summary"] = build_digest(df, datetime.now(timezone.utc), settings.CHAT_SUMMARY_MONTHS)
+        session["summary_fingerprint"] = fingerprint
+        logger.info(f"Financial summary for {user_id} rebuilt from {len(df)} transactions")
+
+    def _sync_user_transaction_index(self, user_id: str, data: List[dict]):
+        embedded, removed = self.transaction_index.sync(user_id, data)
+        if embedded or removed:
+            logger.info(f"Transaction index for {user_id}: +{embedded} embedded, -{removed} removed")
+            self.transaction_index.save(min_interval=settings.TRANSACTION_INDEX_SAVE_INTERVAL)
+
+    def _build_chain(self, user_id: str):
+        retrievers = []
+        weights = []
+
+        if self.pdf_vector_store:
+            retrievers.append(self.pdf_vector_store.as_retriever(search_kwargs={"k": 5}))
+            weights.append(0.5)
+
+        if self.transaction_index is not None:
+            retrievers.append(self.transaction_index.as_retriever(user_id, k=3))
+            weights.append(0.5)
+
+        combined_retriever = (
+            EnsembleRetriever(retrievers=retrievers, weights=weights)
+            if len(retrievers) > 1 else retrievers[0]
+        )
+
+        prompt = PromptTemplate.from_template("""
 You are a helpful financial assistant. Use the following context to help the user:
 Context includes:
 - General advice from PDFs
-- Their transaction history (if available)
+- A summary of their finances computed from all of their transactions
+- Individual transactions (if available)
+
+Financial Summary:
+{financial_summary}
 
 Context:
 {context}
@@ -170,47 +156,237 @@ Current Question:
 Respond with short, personalized, actionable advice.
 """)
 
-            memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-
-            chain = ConversationalRetrievalChain.from_llm(
-                llm=llm,
-                retriever=combined_retriever,
-                memory=memory,
-                chain_type="stuff",
-                combine_docs_chain_kwargs={"prompt": prompt},
-                output_key="answer",
-            )
-
-            self.user_sessions[user_id] = {
-                "chain": chain,
-                "memory": memory,
-                "last_transaction_check": latest_tx_time or datetime.now(),
+        # No memory on the chain: the history is passed in and the turn saved
+        # once, so a hedged or retried call cannot record it twice
+        return ConversationalRetrievalChain.from_llm(
+            llm=answer_llm,
+            condense_question_llm=llm,
+            retriever=combined_retriever,
+            chain_type="stuff",
+            combine_docs_chain_kwargs={"prompt": prompt},
+            output_key="answer",
+        )
+
+    def _build_general_chain(self):
+        """PDF-only chain for general questions; its answers are safe to share."""
+        prompt = PromptTemplate.from_template("""
+You are a helpful financial assistant. Use the following general advice to answer the question.
+
+Context:
+{context}
+
+Question:
+{question}
+
+Respond with short, actionable advice that applies to anyone.
+""")
+        return ConversationalRetrievalChain.from_llm(
+            llm=answer_llm,
+            retriever=self.pdf_vector_store.as_retriever(search_kwargs={"k": 5}),
+            chain_type="stuff",
+            combine_docs_chain_kwargs={"prompt": prompt},
+            output_key="answer",
+        )
+
+    def _general_question_vector(self, question: str, user_id: str):
+        """Embedding of `question` when the answer cache applies to it, else None."""
+        if self.general_chain is None or self.answer_cache.max_entries <= 0:
+            return None
+        # Mid-conversation, a question may lean on earlier turns in ways no
+        # pattern catches, so it always goes to the user's chain
+        if not is_general_question(question) or self._has_chat_history(user_id):
+            self.answer_cache.record_bypass()
+            return None
+        # Answers built from an older PDF corpus are dropped
+        self.answer_cache.set_fingerprint(pdf_index_fingerprint())
+        return embeddings.embed_query(question)
+
+    def _has_chat_history(self, user_id: str) -> bool:
+        session = self.user_sessions.get(user_id)
+        return session is not None and bool(session["memory"].chat_memory.messages)
+
+    @staticmethod
+    def _general_inputs(question: str) -> Dict[str, Any]:
+        return {"question": question, "chat_history": []}
+
+    def _save_general_turn(self, user_id: str, question: str, answer: str):
+        # Only an ongoing conversation needs the turn; no session is built for it
+        session = self.user_sessions.get(user_id)
+        if session is not None:
+            self._save_turn(user_id, session, question, answer)
+
+    def _get_or_create_user_session(self, user_id: str):
+        session = self.user_sessions.get(user_id)
+        is_new = session is None
+        if is_new:
+            session = {
+                # The transaction retriever searches the shared index by user id,
+                # so the chain never needs a rebuild when transactions change
+                "chain": self._build_chain(user_id),
+                "memory": ConversationBufferMemory(memory_key="chat_history", return_messages=True),
+                "summary": "No transaction data available.",
+                "summary_fingerprint": None,
             }
 
-        return self.user_sessions[user_id]
+        data = self._fetch_user_transactions(user_id)
+        # On a failed fetch keep the current digest and vectors rather than wiping them
+        if data is not None:
+            self._refresh_summary(user_id, session, data)
+            if self.transaction_index is not None:
+                # Embeds only new/edited transactions and drops deleted ones
+                self._sync_user_transaction_index(user_id, data)
+
+        if is_new:
+            self.user_sessions.put(user_id, session)
+        else:
+            self.user_sessions.touch(user_id)
+        return session
 
     def get_chat_response(self, question: str, user_id: str) -> Dict[str, Any]:
+        logger.info(f"Incoming chat: {user_id} -> {question}")
         if not user_id:
             return {"error": "User ID is required", "answer": None}
 
         try:
+            vector = self._general_question_vector(question, user_id)
+            if vector is not None:
+                answer = self.answer_cache.get(vector)
+                if answer is None:
+                    answer = self.general_chain.invoke(self._general_inputs(question))["answer"]
+                    self.answer_cache.put(vector, question, answer)
+                self._save_general_turn(user_id, question, answer)
+                return {"answer": answer}
+
             session = self._get_or_create_user_session(user_id)
-            result = session["chain"].invoke({"question": question})
+            result = session["chain"].invoke(self._chain_inputs(session, question))
+            self._save_turn(user_id, session, question, result["answer"])
             return {"answer": result["answer"]}
         except Exception as e:
             logger.error(f"Chat error for user {user_id}: {e}")
             return {"error": str(e), "answer": None}
 
-    def refresh_user_data(self, user_id: str):
-        if user_id in self.user_sessions:
-            del self.user_sessions[user_id]
-            logger.info(f"User session refreshed: {user_id}")
+    async def aget_chat_response(self, question: str, user_id: str) -> Dict[str, Any]:
+        """Async variant: the chain call goes through the LLM gateway and the
+        blocking session sync runs on the gateway's own pool."""
+        logger.info(f"Incoming chat: {user_id} -> {question}")
+        if not user_id:
+            return {"error": "User ID is required", "answer": None}
 
+        try:
+            vector = await llm_gateway.run_blocking(self._general_question_vector, question, user_id)
+            if vector is not None:
+                answer = self.answer_cache.get(vector)
+                if answer is None:
+                    inputs = self._general_inputs(question)
+                    result = await llm_gateway.call(lambda: self.general_chain.ainvoke(inputs))
+                    answer = result["answer"]
+                    self.answer_cache.put(vector, question, answer)
+                self._save_general_turn(user_id, question, answer)
+                return {"answer": answer}
+
+            session = await llm_gateway.run_blocking(self._get_or_create_user_session, user_id)
+            inputs = self._chain_inputs(session, question)
+            result = await llm_gateway.call(lambda: session["chain"].ainvoke(inputs))
+            self._save_turn(user_id, session, question, result["answer"])
+            return {"answer": result["answer"]}
+        except Exception as e:
+            logger.error(f"Chat error for user {user_id}: {e}")
+            return {"error": str(e) or type(e).__name__, "answer": None}
+
+    async def astream_chat_response(self, question: str, user_id: str) -> AsyncIterator[str]:
+        """Yield answer tokens as the model generates them.
 
-# Initialize
-financial_chatbot = FinancialChatbot()
+        The turn is saved to memory once the answer is complete; a stream that is
+        abandoned or fails leaves the memory untouched.
+        """
+        logger.info(f"Incoming chat stream: {user_id} -> {question}")
+        if not user_id:
+            raise ValueError("User ID is required")
+
+        start = time.perf_counter()
+        answer: List[str] = []
+        vector = await llm_gateway.run_blocking(self._general_question_vector, question, user_id)
+        if vector is not None:
+            cached = self.answer_cache.get(vector)
+            if cached is not None:
+                self.first_token_seconds.append(time.perf_counter() - start)
+                yield cached
+                answer.append(cached)
+            else:
+                chain_tokens = self._astream_chain(self.general_chain, self._general_inputs(question), start, answer)
+                async for token in chain_tokens:
+                    yield token
+                self.answer_cache.put(vector, question, answer[0])
+            self.streams += 1
+            self._save_general_turn(user_id, question, answer[0])
+            return
+
+        session = await llm_gateway.run_blocking(self._get_or_create_user_session, user_id)
+        chain_tokens = self._astream_chain(session["chain"], self._chain_inputs(session, question), start, answer)
+        async for token in chain_tokens:
+            yield token
+        self.streams += 1
+        self._save_turn(user_id, session, question, answer[0])
+
+    async def _astream_chain(self, chain, inputs, start: float, answer: List[str]) -> AsyncIterator[str]:
+        """Yield the answer tokens of one chain run; the full answer goes to `answer`."""
+        events = llm_gateway.stream(lambda: chain.astream_events(inputs, version="v2"))
+        tokens = []
+        final = None
+        async for event in events:
+            if event["event"] == "on_chat_model_stream":
+                token = event["data"]["chunk"].content
+                if not token:
+                    continue
+                if not tokens:
+                    self.first_token_seconds.append(time.perf_counter() - start)
+                tokens.append(token)
+                yield token
+            elif event["event"] == "on_chain_end" and not event.get("parent_ids"):
+                final = event["data"]["output"]["answer"]
+
+        if final is None:
+            final = "".join(tokens)
+        elif not tokens:
+            # The model answered in one piece instead of streaming
+            self.first_token_seconds.append(time.perf_counter() - start)
+            yield final
+        answer.append(final)
+
+    def _stream_metrics(self) -> Dict[str, Any]:
+        ttft = sorted(self.first_token_seconds)
+        if not ttft:
+            return {"streams": self.streams, "ttft_p50_ms": None, "ttft_p95_ms": None}
+        return {
+            "streams": self.streams,
+            "ttft_p50_ms": round(ttft[len(ttft) // 2] * 1000, 1),
+            "ttft_p95_ms": round(ttft[min(int(len(ttft) * 0.95), len(ttft) - 1)] * 1000, 1),
+        }
+
+    @staticmethod
+    def _chain_inputs(session, question: str) -> Dict[str, Any]:
+        return {
+            "question": question,
+            "chat_history": list(session["memory"].chat_memory.messages),
+            "financial_summary": session["summary"],
+        }
+
+    def _save_turn(self, user_id: str, session, question: str, answer: str):
+        session["memory"].save_context({"question": question}, {"answer": answer})
+        self.user_sessions.touch(user_id)
+
+    def refresh_user_data(self, user_id: str):
+        if self.user_sessions.pop(user_id) is not None:
+            logger.info(f"User session refreshed: {user_id}")
 
-# API wrapper
-def get_chat_response(question: str, user_id: str) -> Dict[str, Any]:
-    logger.info(f"Incoming chat: {user_id} -> {question}")
-    return financial_chatbot.get_chat_response(question, user_id)
\ No newline at end of file
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "embedding_cache": embeddings.stats(),
+            "sessions": self.user_sessions.metrics(),
+            "llm_gateway": llm_gateway.stats(),
+            "streaming": self._stream_metrics(),
+            "answer_cache": self.answer_cache.stats(),
+            "transaction_index": (
+                self.transaction_index.stats() if self.transaction_index is not None else None
+            ),
+        }
@@ -0,0 +1,118 @@
+"""
+Bounded store for per-user chat sessions
+- Least-recently-used entries are evicted past a max entry count or byte budget
+- Entries idle for longer than the TTL are dropped on access and on insert
+- Counters for size, evictions (by reason) and rebuilds of evicted sessions
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SessionStore:
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        idle_ttl: float,
+        sizeof: Callable[[Any], int],
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.sizeof = sizeof
+        # key -> [value, last_used, size]
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        # Recently evicted keys, to tell rebuilds apart from first-time sessions
+        self._evicted: "OrderedDict[Hashable, None]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.evictions = {"lru": 0, "bytes": 0, "ttl": 0}
+        self.rebuilds = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] > self.idle_ttl:
+                self._evict(key, "ttl")
+                return None
+            entry[1] = time.monotonic()
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            elif key in self._evicted:
+                del self._evicted[key]
+                self.rebuilds += 1
+            size = self.sizeof(value)
+            self._entries[key] = [value, time.monotonic(), size]
+            self._bytes += size
+            self._enforce_limits()
+
+    def touch(self, key: Hashable) -> None:
+        """Re-measure an entry after it grew (new messages, new vectors)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            size = self.sizeof(entry[0])
+            self._bytes += size - entry[2]
+            entry[2] = size
+            self._enforce_limits()
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            return self._remove(key)
+
+    def _remove(self, key: Hashable) -> Any:
+        value, _, size = self._entries.pop(key)
+        self._bytes -= size
+        return value
+
+    def _evict(self, key: Hashable, reason: str) -> None:
+        self._remove(key)
+        self.evictions[reason] += 1
+        self._evicted[key] = None
+        while len(self._evicted) > max(self.max_entries, 1) * 4:
+            self._evicted.popitem(last=False)
+
+    def _enforce_limits(self) -> None:
+        # Entries are kept in last-used order, so idle ones sit at the front
+        now = time.monotonic()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if now - entry[1] <= self.idle_ttl:
+                break
+            self._evict(key, "ttl")
+        while len(self._entries) > self.max_entries:
+            self._evict(next(iter(self._entries)), "lru")
+        # Never evict the most recent entry for bytes alone
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            self._evict(next(iter(self._entries)), "bytes")
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "approx_bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": dict(self.evictions),
+                "rebuilds": self.rebuilds,
+            }
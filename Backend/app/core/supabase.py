@@ -1,7 +1,31 @@
+import httpx
+from postgrest import AsyncPostgrestClient
 from supabase import create_client, Client
 from app.core.config import settings
 
 _supabase: Client = None
+_async_postgrest: AsyncPostgrestClient = None
+
+
+class _PooledAsyncPostgrestClient(AsyncPostgrestClient):
+    """PostgREST client whose HTTP session has a bounded connection pool."""
+
+    def create_session(
+        self, base_url, headers, timeout, verify=True, proxy=None
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SUPABASE_POOL_MAX_KEEPALIVE,
+            ),
+        )
 
 
 def get_supabase() -> Client:
@@ -9,3 +33,25 @@ def get_supabase() -> Client:
     if _supabase is None:
         _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
     return _supabase
+
+
+def get_async_postgrest() -> AsyncPostgrestClient:
+    """Shared async client for table queries, created on first use."""
+    global _async_postgrest
+    if _async_postgrest is None:
+        _async_postgrest = _PooledAsyncPostgrestClient(
+            f"{settings.SUPABASE_URL}/rest/v1",
+            headers={
+                "apikey": settings.SUPABASE_KEY,
+                "Authorization": f"Bearer {settings.SUPABASE_KEY}",
+            },
+            timeout=settings.SUPABASE_TIMEOUT,
+        )
+    return _async_postgrest
+
+
+async def close_async_postgrest() -> None:
+    global _async_postgrest
+    if _async_postgrest is not None:
+        await _async_postgrest.aclose()
+        _async_postgrest = None
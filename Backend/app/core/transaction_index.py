@@ -0,0 +1,294 @@
+"""
+Shared transaction vector index for all chat users
+- One FAISS IndexIDMap2 holds every user's transaction vectors; a user_id ->
+  vector-id mapping scopes each search to one user
+- Per user, a (created_at, transaction_id) watermark and a content hash per
+  transaction mean a sync embeds only new or edited transactions
+- Transactions are added and removed by transaction_id
+- The index and its mappings are saved to disk, so memory grows with the
+  number of vectors, not with the number of users
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import faiss
+import numpy as np
+from filelock import FileLock
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.retrievers import BaseRetriever
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "transactions.faiss"
+META_FILE = "transactions.pkl"
+
+_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=100)
+
+
+def transaction_document(tx: dict, user_id: str) -> Document:
+    return Document(
+        page_content=(
+            f"Transaction ID: {tx.get('transaction_id', 'Unknown')}\n"
+            f"Date: {tx.get('created_at', 'Unknown date')}\n"
+            f"Type: {tx.get('transaction_type', 'Unknown')}\n"
+            f"Amount: {tx.get('amount', 0)} EGP\n"
+            f"Category ID: {tx.get('category_id', 'Unknown')}\n"
+            f"Description: {tx.get('description', 'No description')}"
+        ),
+        metadata={
+            "source": "transactions",
+            "user_id": user_id,
+            "transaction_id": tx.get("transaction_id"),
+        },
+    )
+
+
+def _watermark_key(tx: dict) -> Tuple[str, str]:
+    # PostgREST returns created_at in one ISO format, so string order is time order
+    return (tx.get("created_at") or "", tx.get("transaction_id") or "")
+
+
+def _digest(doc: Document) -> str:
+    return hashlib.sha256(doc.page_content.encode()).hexdigest()
+
+
+class SharedTransactionIndex:
+    """Inner-product index over normalized vectors (cosine similarity).
+
+    Searches are always scoped to one user, so they gather that user's vectors
+    by id and score them exactly: the cost follows the user's own transaction
+    count, never the size of the shared index.
+    """
+
+    def __init__(self, embeddings, index_dir: Optional[str] = None):
+        self.embeddings = embeddings
+        self.index_dir = index_dir
+        self.index: Optional[faiss.IndexIDMap2] = None
+        self._lock = threading.RLock()
+        self._next_id = 0
+        # vector id -> (text, metadata)
+        self._docs: Dict[int, Tuple[str, dict]] = {}
+        self._user_vectors: Dict[str, Set[int]] = {}
+        self._tx_vectors: Dict[str, List[int]] = {}
+        self._tx_user: Dict[str, str] = {}
+        self._user_txs: Dict[str, Set[str]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._watermarks: Dict[str, Tuple[str, str]] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        if index_dir:
+            self._load()
+
+    def __len__(self) -> int:
+        return 0 if self.index is None else self.index.ntotal
+
+    @property
+    def users(self) -> int:
+        return len(self._user_vectors)
+
+    def _ensure_index(self, dim: int) -> faiss.IndexIDMap2:
+        if self.index is None:
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        return self.index
+
+    def sync(self, user_id: str, rows: List[dict]) -> Tuple[int, int]:
+        """Bring a user's vectors in line with `rows`; returns (embedded, removed)."""
+        with self._lock:
+            watermark = self._watermarks.get(user_id)
+            known = set(self._user_txs.get(user_id, ()))
+        seen = set()
+        to_embed: List[Tuple[str, Document]] = []
+        for tx in rows:
+            tx_id = tx.get("transaction_id")
+            if not tx_id:
+                continue
+            seen.add(tx_id)
+            doc = transaction_document(tx, user_id)
+            is_new = watermark is None or _watermark_key(tx) > watermark
+            if not is_new and tx_id in known:
+                # Only rows at or below the watermark can be edits
+                if _digest(doc) == self._hashes.get(tx_id):
+                    continue
+            to_embed.append((tx_id, doc))
+
+        removed = [tx_id for tx_id in known if tx_id not in seen]
+        self.remove_transactions(removed)
+        self.add_documents(user_id, to_embed)
+
+        if rows:
+            newest = max(_watermark_key(tx) for tx in rows)
+            with self._lock:
+                if watermark is None or newest > watermark:
+                    self._watermarks[user_id] = newest
+        return len(to_embed), len(removed)
+
+    def add_documents(self, user_id: str, docs: List[Tuple[str, Document]]) -> None:
+        """Embed and add (transaction_id, document) pairs, replacing old vectors."""
+        if not docs:
+            return
+        texts, metadatas, owners = [], [], []
+        for tx_id, doc in docs:
+            for chunk in _splitter.split_documents([doc]):
+                texts.append(chunk.page_content)
+                metadatas.append(chunk.metadata)
+                owners.append(tx_id)
+
+        # Embed outside the lock; the provider call is the slow part. Nothing
+        # is recorded before it succeeds, so after a failed call the next sync
+        # still sees these transactions as missing and embeds them again
+        vectors = np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+        faiss.normalize_L2(vectors)
+
+        with self._lock:
+            self._remove([tx_id for tx_id, _ in docs])
+            ids = np.arange(self._next_id, self._next_id + len(texts), dtype=np.int64)
+            self._next_id += len(texts)
+            self._ensure_index(vectors.shape[1]).add_with_ids(vectors, ids)
+            user_vectors = self._user_vectors.setdefault(user_id, set())
+            for vid, text, metadata, tx_id in zip(ids, texts, metadatas, owners):
+                vid = int(vid)
+                self._docs[vid] = (text, metadata)
+                self._tx_vectors.setdefault(tx_id, []).append(vid)
+                self._tx_user[tx_id] = user_id
+                user_vectors.add(vid)
+            self._user_txs.setdefault(user_id, set()).update(owners)
+            for tx_id, doc in docs:
+                self._hashes[tx_id] = _digest(doc)
+            self._dirty = True
+
+    def remove_transactions(self, tx_ids: List[str]) -> None:
+        if not tx_ids:
+            return
+        with self._lock:
+            self._remove(tx_ids)
+
+    def _remove(self, tx_ids: List[str]) -> None:
+        ids = []
+        for tx_id in tx_ids:
+            vids = self._tx_vectors.pop(tx_id, [])
+            user_id = self._tx_user.pop(tx_id, None)
+            self._hashes.pop(tx_id, None)
+            user_vectors = self._user_vectors.get(user_id, set())
+            for vid in vids:
+                self._docs.pop(vid, None)
+                user_vectors.discard(vid)
+            self._user_txs.get(user_id, set()).discard(tx_id)
+            if user_id is not None and not user_vectors:
+                self._user_vectors.pop(user_id, None)
+                self._user_txs.pop(user_id, None)
+            ids.extend(vids)
+        if ids and self.index is not None:
+            self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+            self._dirty = True
+
+    def search(self, user_id: str, query: str, k: int) -> List[Document]:
+        vector = np.asarray([self.embeddings.embed_query(query)], dtype=np.float32)
+        faiss.normalize_L2(vector)
+        with self._lock:
+            ids = np.fromiter(self._user_vectors.get(user_id, ()), dtype=np.int64)
+            if not len(ids) or self.index is None:
+                return []
+            scores = self.index.reconstruct_batch(ids) @ vector[0]
+            docs = []
+            for i in np.argsort(-scores)[:k]:
+                text, metadata = self._docs[int(ids[i])]
+                docs.append(Document(page_content=text, metadata=dict(metadata)))
+            return docs
+
+    def as_retriever(self, user_id: str, k: int) -> "UserTransactionRetriever":
+        return UserTransactionRetriever(index=self, user_id=user_id, k=k)
+
+    def _paths(self) -> Tuple[str, str, str]:
+        return (
+            os.path.join(self.index_dir, INDEX_FILE),
+            os.path.join(self.index_dir, META_FILE),
+            os.path.join(self.index_dir, ".lock"),
+        )
+
+    def _load(self) -> None:
+        index_path, meta_path, lock_path = self._paths()
+        os.makedirs(self.index_dir, exist_ok=True)
+        with FileLock(lock_path):
+            if not (os.path.exists(index_path) and os.path.exists(meta_path)):
+                return
+            with open(meta_path, "rb") as f:
+                meta = pickle.load(f)
+            if meta.get("embedding_model") != self._model_name():
+                logger.info("Transaction index built with another model, ignoring it.")
+                return
+            self.index = faiss.read_index(index_path)
+        self._next_id = meta["next_id"]
+        self._docs = meta["docs"]
+        self._tx_vectors = meta["tx_vectors"]
+        self._tx_user = meta["tx_user"]
+        self._hashes = meta["hashes"]
+        self._watermarks = meta["watermarks"]
+        for tx_id, vids in self._tx_vectors.items():
+            user_id = self._tx_user[tx_id]
+            self._user_vectors.setdefault(user_id, set()).update(vids)
+            self._user_txs.setdefault(user_id, set()).add(tx_id)
+        logger.info(
+            f"Transaction index loaded: {len(self)} vectors, {self.users} users"
+        )
+
+    def _model_name(self) -> str:
+        return getattr(self.embeddings, "model", type(self.embeddings).__name__)
+
+    def save(self, min_interval: float = 0.0) -> bool:
+        """Write the index if it changed and `min_interval` seconds have passed."""
+        if not self.index_dir or self.index is None:
+            return False
+        with self._lock:
+            if not self._dirty or time.monotonic() - self._saved_at < min_interval:
+                return False
+            index_bytes = faiss.serialize_index(self.index)
+            meta = pickle.dumps(
+                {
+                    "embedding_model": self._model_name(),
+                    "next_id": self._next_id,
+                    "docs": self._docs,
+                    "tx_vectors": self._tx_vectors,
+                    "tx_user": self._tx_user,
+                    "hashes": self._hashes,
+                    "watermarks": self._watermarks,
+                }
+            )
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+        index_path, meta_path, lock_path = self._paths()
+        with FileLock(lock_path):
+            for path, data in ((index_path, index_bytes.tobytes()), (meta_path, meta)):
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "vectors": len(self),
+                "users": self.users,
+                "transactions": len(self._tx_vectors),
+            }
+
+
+class UserTransactionRetriever(BaseRetriever):
+    """Retriever over one user's slice of the shared index."""
+
+    index: SharedTransactionIndex
+    user_id: str
+    k: int = 3
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.index.search(self.user_id, query, self.k)
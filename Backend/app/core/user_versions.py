@@ -0,0 +1,93 @@
+"""
+Per-user data versions for conditional GETs
+- `user_versions` holds one counter per user, bumped from a global sequence by
+  every write through the repositories (sql/user_versions.sql)
+- User-scoped reads turn it into a weak ETag; a matching If-None-Match is
+  answered with 304 after that one primary-key lookup, before any row is
+  fetched or serialized
+- The version is read before the rows and bumped after the write, so a read
+  racing a write can pair fresh rows with an old ETag (refetched next time),
+  never stale rows with a new one
+"""
+
+import logging
+from typing import Iterable, List, Optional
+from uuid import UUID
+
+from fastapi import Request, Response
+
+from app.core.supabase import get_supabase, get_async_postgrest
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_TABLE = "user_versions"
+BUMP_RPC = "bump_user_versions"
+# Clients may keep the payload but must revalidate it before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def _ids(user_ids: Iterable) -> List[str]:
+    return sorted({str(user_id) for user_id in user_ids if user_id})
+
+
+# Bumps run after the write went through, so a failure is logged rather than
+# raised; the user's next successful write moves the version again
+def bump_user_versions(user_ids: Iterable) -> None:
+    ids = _ids(user_ids)
+    if not ids:
+        return
+    try:
+        get_supabase().rpc(BUMP_RPC, {"p_user_ids": ids}).execute()
+    except Exception:
+        logger.exception("Bumping user versions failed")
+
+
+async def abump_user_versions(user_ids: Iterable) -> None:
+    ids = _ids(user_ids)
+    if not ids:
+        return
+    try:
+        await get_async_postgrest().rpc(BUMP_RPC, {"p_user_ids": ids}).execute()
+    except Exception:
+        logger.exception("Bumping user versions failed")
+
+
+async def get_user_version(user_id: UUID) -> int:
+    response = await (
+        get_async_postgrest()
+        .table(VERSIONS_TABLE)
+        .select("version")
+        .eq("user_id", str(user_id))
+        .limit(1)
+        .execute()
+    )
+    return response.data[0]["version"] if response.data else 0
+
+
+def weak_etag(scope: str, version: int) -> str:
+    return f'W/"{scope}.{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of `etag` against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+async def conditional_get(
+    request: Request, response: Response, user_id: UUID, scope: str
+) -> Optional[Response]:
+    """A 304 response if the client's copy of `scope` is current, else None
+    with the ETag set on `response` for the full answer."""
+    etag = weak_etag(scope, await get_user_version(user_id))
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -17,3 +17,19 @@ class Budget:
         self.category_id = category_id
         self.allocated_amount = allocated_amount
         self.created_at = created_at
+
+
+class BudgetSpending:
+    def __init__(
+        self,
+        budget_id: UUID,
+        category_id: UUID,
+        allocated_amount: float,
+        spent: float,
+        category_name: Optional[str] = None,
+    ):
+        self.budget_id = budget_id
+        self.category_id = category_id
+        self.allocated_amount = allocated_amount
+        self.spent = spent
+        self.category_name = category_name
@@ -0,0 +1,46 @@
+import time
+from typing import List, Optional
+from uuid import UUID
+from enum import Enum
+
+
+class ImportStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ImportJob:
+    def __init__(self, job_id: UUID, user_id: UUID, total_bytes: int):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.status = ImportStatus.RUNNING
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.rows_rejected = 0
+        self.errors: List[str] = []
+        self.detail: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def progress(self) -> float:
+        if self.status == ImportStatus.COMPLETED:
+            return 1.0
+        return min(self.bytes_read / self.total_bytes, 1.0) if self.total_bytes else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.rows_inserted / elapsed if elapsed > 0 else 0.0
+
+    def finish(self, status: ImportStatus, detail: Optional[str] = None) -> None:
+        self.status = status
+        self.detail = detail
+        self.finished_at = time.monotonic()
@@ -1,10 +1,26 @@
 from typing import Optional, List
 from uuid import UUID
-from app.domain.budget import Budget
-from app.infrastructure.interfaces.budget_repository import IBudgetRepository
-from app.core.supabase import get_supabase
+from app.domain.budget import Budget, BudgetSpending
+from app.infrastructure.interfaces.budget_repository import (
+    IBudgetRepository,
+    IAsyncBudgetRepository,
+)
+from app.core.supabase import get_supabase, get_async_postgrest
+from app.core.user_versions import abump_user_versions, bump_user_versions
 from datetime import datetime
 
+BUDGET_STATUS_RPC = "budget_status"
+
+
+def _status_params(
+    user_id: UUID, period_start: datetime, period_end: datetime
+) -> dict:
+    return {
+        "p_user_id": str(user_id),
+        "p_period_start": period_start.isoformat(),
+        "p_period_end": period_end.isoformat(),
+    }
+
 
 class BudgetRepository(IBudgetRepository):
     def create_budget(self, budget: Budget) -> Optional[Budget]:
@@ -16,6 +32,7 @@ class BudgetRepository(IBudgetRepository):
         }
         response = get_supabase().table("budgets").insert(data).execute()
         if response.data:
+            bump_user_versions([budget.user_id])
             return budget
         return None
 
@@ -55,6 +72,7 @@ class BudgetRepository(IBudgetRepository):
             .eq("budget_id", str(budget.budget_id))
             .execute()
         )
+        bump_user_versions(row["user_id"] for row in response.data or [])
         return budget if response.data else None
 
     def delete_budget(self, budget_id: UUID) -> bool:
@@ -65,6 +83,7 @@ class BudgetRepository(IBudgetRepository):
             .eq("budget_id", str(budget_id))
             .execute()
         )
+        bump_user_versions(row["user_id"] for row in response.data or [])
         return bool(response.data)
 
     def get_budget_by_category_id(self, category_id: UUID) -> List[Budget]:
@@ -76,3 +95,98 @@ class BudgetRepository(IBudgetRepository):
             .execute()
         )
         return [Budget(**record) for record in response.data] if response.data else []
+
+    def get_budget_spending(
+        self, user_id: UUID, period_start: datetime, period_end: datetime
+    ) -> List[BudgetSpending]:
+        response = (
+            get_supabase()
+            .rpc(BUDGET_STATUS_RPC, _status_params(user_id, period_start, period_end))
+            .execute()
+        )
+        return [BudgetSpending(**row) for row in response.data or []]
+
+
+class AsyncBudgetRepository(IAsyncBudgetRepository):
+    async def create_budget(self, budget: Budget) -> Optional[Budget]:
+        data = {
+            "budget_id": str(budget.budget_id),
+            "user_id": str(budget.user_id),
+            "category_id": str(budget.category_id),
+            "allocated_amount": budget.allocated_amount,
+        }
+        response = await get_async_postgrest().table("budgets").insert(data).execute()
+        if response.data:
+            await abump_user_versions([budget.user_id])
+            return budget
+        return None
+
+    async def get_all_budgets(self) -> List[Budget]:
+        response = await get_async_postgrest().table("budgets").select("*").execute()
+        return [Budget(**item) for item in response.data] if response.data else []
+
+    async def get_budget_by_id(self, budget_id: UUID) -> Optional[Budget]:
+        response = await (
+            get_async_postgrest()
+            .table("budgets")
+            .select("*")
+            .eq("budget_id", str(budget_id))
+            .single()
+            .execute()
+        )
+        return Budget(**response.data) if response.data else None
+
+    async def get_budgets_by_user(self, user_id: UUID) -> List[Budget]:
+        response = await (
+            get_async_postgrest()
+            .table("budgets")
+            .select("*")
+            .eq("user_id", str(user_id))
+            .execute()
+        )
+        return [Budget(**item) for item in response.data] if response.data else []
+
+    async def update_budget(self, budget: Budget) -> Optional[Budget]:
+        data = {
+            "allocated_amount": budget.allocated_amount,
+        }
+        response = await (
+            get_async_postgrest()
+            .table("budgets")
+            .update(data)
+            .eq("budget_id", str(budget.budget_id))
+            .execute()
+        )
+        await abump_user_versions(row["user_id"] for row in response.data or [])
+        return budget if response.data else None
+
+    async def delete_budget(self, budget_id: UUID) -> bool:
+        response = await (
+            get_async_postgrest()
+            .table("budgets")
+            .delete()
+            .eq("budget_id", str(budget_id))
+            .execute()
+        )
+        await abump_user_versions(row["user_id"] for row in response.data or [])
+        return bool(response.data)
+
+    async def get_budget_by_category_id(self, category_id: UUID) -> List[Budget]:
+        response = await (
+            get_async_postgrest()
+            .table("budgets")
+            .select("*")
+            .eq("category_id", str(category_id))
+            .execute()
+        )
+        return [Budget(**record) for record in response.data] if response.data else []
+
+    async def get_budget_spending(
+        self, user_id: UUID, period_start: datetime, period_end: datetime
+    ) -> List[BudgetSpending]:
+        response = await (
+            get_async_postgrest()
+            .rpc(BUDGET_STATUS_RPC, _status_params(user_id, period_start, period_end))
+            .execute()
+        )
+        return [BudgetSpending(**row) for row in response.data or []]
@@ -1,11 +1,26 @@
 from typing import List, Optional
-from app.infrastructure.interfaces.goal_repository import IGoalRepository
+from app.infrastructure.interfaces.goal_repository import (
+    IGoalRepository,
+    IAsyncGoalRepository,
+)
 from app.domain.goal import Goal
 from uuid import UUID, uuid4
-from app.core.supabase import get_supabase
+from app.core.supabase import get_supabase, get_async_postgrest
+from app.core.user_versions import abump_user_versions, bump_user_versions
 from datetime import datetime
 
 
+def _row_to_goal(row: dict) -> Goal:
+    return Goal(
+        goal_id=UUID(row["goal_id"]),
+        user_id=UUID(row["user_id"]),
+        goal_name=row["goal_name"],
+        target_amount=row["target_amount"],
+        amount_saved=row["amount_saved"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+    )
+
+
 class GoalRepository(IGoalRepository):
     def create_goal(self, goal: Goal) -> Optional[Goal]:
         data = {
@@ -17,7 +32,10 @@ class GoalRepository(IGoalRepository):
             "created_at": goal.created_at.isoformat(),
         }
         response = get_supabase().table("goals").insert(data).execute()
-        return goal if response.data else None
+        if not response.data:
+            return None
+        bump_user_versions([goal.user_id])
+        return goal
 
     def get_goal(self, goal_id: UUID) -> Optional[Goal]:
         response = (
@@ -71,6 +89,7 @@ class GoalRepository(IGoalRepository):
             .execute()
         )
         if response.data:
+            bump_user_versions(row["user_id"] for row in response.data)
             updated = response.data[0]
             return Goal(
                 goal_id=UUID(updated["goal_id"]),
@@ -86,4 +105,67 @@ class GoalRepository(IGoalRepository):
         response = (
             get_supabase().table("goals").delete().eq("goal_id", str(goal_id)).execute()
         )
+        bump_user_versions(row["user_id"] for row in response.data or [])
+        return bool(response.data)
+
+
+class AsyncGoalRepository(IAsyncGoalRepository):
+    async def create_goal(self, goal: Goal) -> Optional[Goal]:
+        data = {
+            "goal_id": str(goal.goal_id),
+            "user_id": str(goal.user_id),
+            "goal_name": goal.goal_name,
+            "target_amount": goal.target_amount,
+            "amount_saved": goal.amount_saved,
+            "created_at": goal.created_at.isoformat(),
+        }
+        response = await get_async_postgrest().table("goals").insert(data).execute()
+        if not response.data:
+            return None
+        await abump_user_versions([goal.user_id])
+        return goal
+
+    async def get_goal(self, goal_id: UUID) -> Optional[Goal]:
+        response = await (
+            get_async_postgrest()
+            .table("goals")
+            .select("*")
+            .eq("goal_id", str(goal_id))
+            .limit(1)
+            .execute()
+        )
+        return _row_to_goal(response.data[0]) if response.data else None
+
+    async def get_goals_by_user(self, user_id: UUID) -> List[Goal]:
+        response = await (
+            get_async_postgrest()
+            .table("goals")
+            .select("*")
+            .eq("user_id", str(user_id))
+            .execute()
+        )
+        return [_row_to_goal(row) for row in response.data]
+
+    async def update_goal(self, goal_id: UUID, goal_data: dict) -> Optional[Goal]:
+        response = await (
+            get_async_postgrest()
+            .table("goals")
+            .update(goal_data)
+            .eq("goal_id", str(goal_id))
+            .execute()
+        )
+        if not response.data:
+            return None
+        await abump_user_versions(row["user_id"] for row in response.data)
+        return _row_to_goal(response.data[0])
+
+    async def delete_goal(self, goal_id: UUID) -> bool:
+        response = await (
+            get_async_postgrest()
+            .table("goals")
+            .delete()
+            .eq("goal_id", str(goal_id))
+            .execute()
+        )
+        await abump_user_versions(row["user_id"] for row in response.data or [])
         return bool(response.data)
@@ -0,0 +1,129 @@
+"""
+Sources for the monthly per-category expense totals the forecast needs
+- `PostgrestMonthlyExpenseSource` calls the `monthly_category_expenses` function
+  defined in sql/monthly_category_expenses.sql
+- `SqliteMonthlyExpenseSource` computes the same result from raw transactions
+  on a local SQLite file so the contract can be exercised without Supabase
+"""
+
+import sqlite3
+import threading
+from typing import Iterable, List
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.supabase import get_async_postgrest
+from app.infrastructure.interfaces.monthly_expense_source import (
+    IMonthlyExpenseSource,
+)
+
+RPC_NAME = "monthly_category_expenses"
+
+
+class PostgrestMonthlyExpenseSource(IMonthlyExpenseSource):
+    async def monthly_category_expenses(
+        self, user_ids: List[str], months: int, lookback_months: int
+    ) -> List[dict]:
+        resp = await (
+            get_async_postgrest()
+            .rpc(
+                RPC_NAME,
+                {
+                    "p_user_ids": user_ids,
+                    "p_months": months,
+                    "p_lookback_months": lookback_months,
+                },
+            )
+            .execute()
+        )
+        return resp.data or []
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    category_id TEXT PRIMARY KEY,
+    category_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    category_id TEXT,
+    description TEXT,
+    created_at TEXT,
+    amount REAL,
+    transaction_type TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_user_type_created_at_idx
+    ON transactions (user_id, transaction_type, created_at);
+"""
+
+# created_at is stored as ISO-8601 text; julianday() normalises any UTC offset
+SQLITE_MONTHLY_QUERY = """
+WITH monthly AS (
+    SELECT
+        t.user_id,
+        strftime('%Y-%m-01', t.created_at) AS month,
+        c.category_name,
+        SUM(t.amount) AS total
+    FROM transactions t
+    JOIN categories c ON c.category_id = t.category_id
+    WHERE t.user_id IN ({placeholders})
+      AND t.transaction_type = 'Expense'
+      AND julianday(t.created_at)
+          >= julianday('now', 'start of month', '-' || :lookback || ' months')
+      AND julianday(t.created_at) < julianday('now', 'start of month')
+    GROUP BY 1, 2, 3
+),
+ranked AS (
+    SELECT
+        m.*,
+        DENSE_RANK() OVER (PARTITION BY m.user_id ORDER BY m.month DESC) AS recency
+    FROM monthly m
+)
+SELECT user_id, month, category_name, total
+FROM ranked
+WHERE recency <= :months
+ORDER BY user_id, month, category_name
+"""
+
+
+class SqliteMonthlyExpenseSource(IMonthlyExpenseSource):
+    def __init__(self, db_path: str = ":memory:"):
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(SQLITE_SCHEMA)
+        self._lock = threading.Lock()
+
+    def insert_categories(self, rows: Iterable[dict]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO categories (category_id, category_name) "
+                "VALUES (:category_id, :category_name)",
+                list(rows),
+            )
+            self._db.commit()
+
+    def insert_transactions(self, rows: Iterable[dict]) -> None:
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO transactions (transaction_id, user_id, "
+                "category_id, description, created_at, amount, transaction_type) "
+                "VALUES (:transaction_id, :user_id, :category_id, :description, "
+                ":created_at, :amount, :transaction_type)",
+                [{"description": None, **row} for row in rows],
+            )
+            self._db.commit()
+
+    def query(self, user_ids: List[str], months: int, lookback_months: int):
+        sql = SQLITE_MONTHLY_QUERY.format(
+            placeholders=",".join(f":u{i}" for i in range(len(user_ids)))
+        )
+        params = {f"u{i}": uid for i, uid in enumerate(user_ids)}
+        params.update(months=months, lookback=lookback_months)
+        with self._lock:
+            return [dict(row) for row in self._db.execute(sql, params)]
+
+    async def monthly_category_expenses(
+        self, user_ids: List[str], months: int, lookback_months: int
+    ) -> List[dict]:
+        return await run_in_threadpool(self.query, user_ids, months, lookback_months)
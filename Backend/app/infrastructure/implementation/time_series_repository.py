@@ -1,87 +1,118 @@
-from app.infrastructure.interfaces.time_series_repository import ITimeSeriesRepository
+from app.infrastructure.interfaces.time_series_repository import (
+    ITimeSeriesRepository,
+    IAsyncTimeSeriesRepository,
+)
 from app.models.time_series_dto import (
     TimeSeriesPredictionResponse,
     MonthlyExpense,
     ExpenseBreakdown,
+    BatchPredictionItem,
 )
+from app.core.batch_predictor import BatchPredictor
+from app.core.config import settings
+from app.core.lstm_numpy import load_npz
 from app.core.supabase import get_supabase
+from app.infrastructure.implementation.monthly_expense_source import (
+    PostgrestMonthlyExpenseSource,
+    RPC_NAME,
+)
+from app.infrastructure.interfaces.monthly_expense_source import (
+    IMonthlyExpenseSource,
+)
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+import asyncio
 import pandas as pd
 import numpy as np
 import joblib
 import os
-from datetime import datetime
-from tensorflow.keras.models import load_model
+from typing import List, Optional, Tuple
+from app.core.providers import forecast_model
 
+EXPECTED_CATEGORIES = [
+    "Education",
+    "Entertainment",
+    "Fashion",
+    "Food",
+    "Lifestyle",
+    "Transportation",
+    "Health",
+]
+# The LSTM reads a window of 3 complete months
+HISTORY_MONTHS = 3
 
-class TimeSeriesRepository(ITimeSeriesRepository):
-    def __init__(self):
-        self.supabase = get_supabase()
-        self.model = None
-        self.scaler = None
-        self.load_ml_models()
 
-    def load_ml_models(self):
+def load_ml_models():
+    """Load the model and scaler. Called once, through `forecast_model`.
+
+    FORECAST_BACKEND=numpy serves the exported lstm.npz without TensorFlow;
+    FORECAST_BACKEND=keras loads the original lstm.h5.
+    """
+    base = os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "core", "TimeSeries")
+    )
+    if settings.FORECAST_BACKEND == "numpy":
+        return load_npz(os.path.join(base, "lstm.npz"))
+
+    # TensorFlow takes seconds to import, so only pull it in here
+    from tensorflow.keras.models import load_model
+
+    model = load_model(os.path.join(base, "lstm.h5"))
+    scaler = joblib.load(os.path.join(base, "scaler.save"))
+    return model, scaler
+
+
+class _LstmForecaster:
+    """Model access and the pandas/LSTM part shared by both repositories."""
+
+    def _models(self):
         try:
-            base = os.path.abspath(
-                os.path.join(
-                    os.path.dirname(__file__), "..", "..", "core", "TimeSeries"
-                )
-            )
-            self.model = load_model(os.path.join(base, "lstm.h5"))
-            self.scaler = joblib.load(os.path.join(base, "scaler.save"))
+            return forecast_model.get()
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Model loading failed: {e}")
 
-    def get_next_month_prediction(self, user_id: str) -> TimeSeriesPredictionResponse:
-        df = self._fetch_data(user_id)
-        df["created_at"] = (
-            pd.to_datetime(df["created_at"]).dt.to_period("M").dt.to_timestamp()
-        )
+    @property
+    def model(self):
+        return self._models()[0]
 
-        cat_map = (
-            self.supabase.from_("categories")
-            .select("category_id, category_name")
-            .execute()
-            .data
-        )
-        cat_df = pd.DataFrame(cat_map)
-        df = df.merge(cat_df, on="category_id", how="left").dropna(
-            subset=["category_name"]
-        )
+    @property
+    def scaler(self):
+        return self._models()[1]
 
+    def _prepare_features(
+        self, monthly: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Pivot the database's monthly per-category totals and scale them."""
         grouped = (
-            df.groupby(["created_at", "category_name"])["amount"]
-            .sum()
-            .unstack(fill_value=0)
+            monthly.pivot_table(
+                index="month",
+                columns="category_name",
+                values="total",
+                aggfunc="sum",
+                fill_value=0,
+            )
+            .rename(index=pd.Timestamp)
             .sort_index()
         )
-        expected = [
-            "Education",
-            "Entertainment",
-            "Fashion",
-            "Food",
-            "Lifestyle",
-            "Transportation",
-            "Health",
-        ]
+        expected = EXPECTED_CATEGORIES
         X = pd.DataFrame(index=grouped.index)
         for col in expected:
             X[col] = grouped.get(col, 0)
         X["Expenses"] = X[expected].sum(axis=1)
 
-        today = pd.Timestamp(datetime.today().date())
-        if X.index[-1].month == today.month:
-            X = X.iloc[:-1]
-        if len(X) < 3:
+        if len(X) < HISTORY_MONTHS:
             raise HTTPException(
                 status_code=400, detail="Need at least 3 months of data"
             )
 
-        last3 = X.tail(3)
+        last3 = X.tail(HISTORY_MONTHS)
         scaled = self.scaler.transform(last3[expected])
-        pred = float(self.model.predict(np.expand_dims(scaled, axis=0))[0, 0])
+        return last3, scaled
 
+    def _make_response(
+        self, user_id: str, last3: pd.DataFrame, pred: float
+    ) -> TimeSeriesPredictionResponse:
+        expected = EXPECTED_CATEGORIES
         next_month_ts = last3.index.max() + pd.offsets.MonthBegin(1)
         history = [
             MonthlyExpense(
@@ -100,15 +131,89 @@ class TimeSeriesRepository(ITimeSeriesRepository):
             history=history,
         )
 
+    def _build_prediction(
+        self, user_id: str, monthly: pd.DataFrame
+    ) -> TimeSeriesPredictionResponse:
+        last3, scaled = self._prepare_features(monthly)
+        pred = float(self.model.predict(np.expand_dims(scaled, axis=0))[0, 0])
+        return self._make_response(user_id, last3, pred)
+
+
+class TimeSeriesRepository(_LstmForecaster, ITimeSeriesRepository):
+    def __init__(self):
+        self.supabase = get_supabase()
+        super().__init__()
+
+    def get_next_month_prediction(self, user_id: str) -> TimeSeriesPredictionResponse:
+        return self._build_prediction(user_id, self._fetch_data(user_id))
+
     def _fetch_data(self, user_id: str) -> pd.DataFrame:
-        resp = (
-            self.supabase.from_("transactions")
-            .select("category_id, amount, created_at")
-            .eq("user_id", user_id)
-            .eq("transaction_type", "Expense")
-            .order("created_at")
-            .execute()
-        )
+        resp = self.supabase.rpc(
+            RPC_NAME,
+            {
+                "p_user_ids": [user_id],
+                "p_months": HISTORY_MONTHS,
+                "p_lookback_months": settings.FORECAST_LOOKBACK_MONTHS,
+            },
+        ).execute()
         if not resp.data:
             raise HTTPException(status_code=404, detail="No expense data")
         return pd.DataFrame(resp.data)
+
+
+class AsyncTimeSeriesRepository(_LstmForecaster, IAsyncTimeSeriesRepository):
+    def __init__(self, source: Optional[IMonthlyExpenseSource] = None):
+        super().__init__()
+        # Monthly totals are aggregated by the database, not from raw rows
+        self.source = source or PostgrestMonthlyExpenseSource()
+        # Concurrent forecasts share one model call instead of one call each
+        self.batcher = BatchPredictor(
+            self._predict_batch,
+            max_batch_size=settings.FORECAST_MAX_BATCH_SIZE,
+            max_wait_ms=settings.FORECAST_MAX_WAIT_MS,
+        )
+
+    def _predict_batch(self, inputs: np.ndarray) -> np.ndarray:
+        return self.model.predict(inputs, verbose=0)
+
+    async def get_next_month_prediction(
+        self, user_id: str
+    ) -> TimeSeriesPredictionResponse:
+        rows = await self._fetch_data([user_id])
+        if not rows:
+            raise HTTPException(status_code=404, detail="No expense data")
+        return await self._predict_frame(user_id, pd.DataFrame(rows))
+
+    async def get_next_month_predictions(
+        self, user_ids: List[str]
+    ) -> List[BatchPredictionItem]:
+        rows = await self._fetch_data(user_ids)
+        frames = (
+            {uid: frame for uid, frame in pd.DataFrame(rows).groupby("user_id")}
+            if rows
+            else {}
+        )
+
+        async def predict_one(user_id: str) -> BatchPredictionItem:
+            if user_id not in frames:
+                return BatchPredictionItem(user_id=user_id, error="No expense data")
+            try:
+                prediction = await self._predict_frame(user_id, frames[user_id])
+                return BatchPredictionItem(user_id=user_id, prediction=prediction)
+            except HTTPException as e:
+                return BatchPredictionItem(user_id=user_id, error=e.detail)
+
+        return list(await asyncio.gather(*(predict_one(u) for u in user_ids)))
+
+    async def _predict_frame(
+        self, user_id: str, monthly: pd.DataFrame
+    ) -> TimeSeriesPredictionResponse:
+        # pandas is CPU bound; keep it off the event loop
+        last3, scaled = await run_in_threadpool(self._prepare_features, monthly)
+        pred = await self.batcher.predict(scaled)
+        return self._make_response(user_id, last3, pred)
+
+    async def _fetch_data(self, user_ids: List[str]) -> List[dict]:
+        return await self.source.monthly_category_expenses(
+            user_ids, HISTORY_MONTHS, settings.FORECAST_LOOKBACK_MONTHS
+        )
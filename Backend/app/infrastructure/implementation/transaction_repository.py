@@ -1,29 +1,79 @@
-from typing import List, Optional
-from app.infrastructure.interfaces.transaction_repository import ITransactionRepository
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+from app.infrastructure.interfaces.transaction_repository import (
+    ITransactionRepository,
+    IAsyncTransactionRepository,
+)
 from app.domain.transaction import Transaction, TransactionType
-from app.core.supabase import create_client, get_supabase
+from app.core.ledger import APPLY_RPC, LEDGER_COLUMNS, ledger_deltas
+from app.core.pagination import Keyset, keyset_filter, ordered
+from app.core.supabase import create_client, get_supabase, get_async_postgrest
+from app.core.user_versions import abump_user_versions, bump_user_versions
+from postgrest.types import ReturnMethod
 from uuid import UUID
 import os
 
+logger = logging.getLogger(__name__)
 
+# Exactly the fields of TransactionResponse, so rows can be streamed as-is
+LIST_COLUMNS = (
+    "transaction_id, user_id, category_id, description, created_at, amount, "
+    "transaction_type"
+)
+
+
+def _to_row(transaction: Transaction) -> dict:
+    return {
+        "transaction_id": str(transaction.transaction_id),
+        "user_id": str(transaction.user_id),
+        "category_id": str(transaction.category_id),
+        "description": transaction.description,
+        "created_at": transaction.created_at.isoformat(),
+        "amount": transaction.amount,
+        "transaction_type": transaction.transaction_type.value,
+    }
+
+
+# The transaction write has already happened when the deltas are sent, so a
+# failure is logged and left for the next ledger reconciliation to repair
+def _apply_ledger(deltas: List[dict]) -> None:
+    if not deltas:
+        return
+    try:
+        get_supabase().rpc(APPLY_RPC, {"p_deltas": deltas}).execute()
+    except Exception:
+        logger.exception("Applying ledger deltas failed")
+
+
+async def _aapply_ledger(deltas: List[dict]) -> None:
+    if not deltas:
+        return
+    try:
+        await get_async_postgrest().rpc(APPLY_RPC, {"p_deltas": deltas}).execute()
+    except Exception:
+        logger.exception("Applying ledger deltas failed")
 
 
 class TransactionRepository(ITransactionRepository):
     def create_transaction(self, transaction: Transaction) -> Optional[Transaction]:
-        data = {
-            "transaction_id": str(transaction.transaction_id),
-            "user_id": str(transaction.user_id),
-            "category_id": str(transaction.category_id),
-            "description": transaction.description,
-            "created_at": transaction.created_at.isoformat(),
-            "amount": transaction.amount,
-            "transaction_type": transaction.transaction_type.value,
-        }
+        data = _to_row(transaction)
         response = get_supabase().table("transactions").insert(data).execute()
         if response.data:
+            _apply_ledger(ledger_deltas(added=response.data))
+            bump_user_versions([transaction.user_id])
             return transaction
         return None
 
+    def _ledger_rows(self, transaction_id: UUID) -> List[dict]:
+        response = (
+            get_supabase().table("transactions")
+            .select(LEDGER_COLUMNS)
+            .eq("transaction_id", str(transaction_id))
+            .execute()
+        )
+        return response.data or []
+
     def get_transaction_by_id(self, transaction_id: UUID) -> Optional[Transaction]:
         response = (
             get_supabase().table("transactions")
@@ -54,6 +104,7 @@ class TransactionRepository(ITransactionRepository):
         )
 
     def update_transaction(self, transaction: Transaction) -> Optional[Transaction]:
+        before = self._ledger_rows(transaction.transaction_id)
         response = (
             get_supabase().table("transactions")
             .update(
@@ -67,7 +118,11 @@ class TransactionRepository(ITransactionRepository):
             .eq("transaction_id", str(transaction.transaction_id))
             .execute()
         )
-        return transaction if response.data else None
+        if not response.data:
+            return None
+        _apply_ledger(ledger_deltas(added=response.data, removed=before))
+        bump_user_versions(row["user_id"] for row in response.data)
+        return transaction
 
     def delete_transaction(self, transaction_id: UUID) -> bool:
         response = (
@@ -76,6 +131,8 @@ class TransactionRepository(ITransactionRepository):
             .eq("transaction_id", str(transaction_id))
             .execute()
         )
+        _apply_ledger(ledger_deltas(removed=response.data or []))
+        bump_user_versions(row["user_id"] for row in response.data or [])
         return bool(response.data)
     
     
@@ -89,3 +146,167 @@ class TransactionRepository(ITransactionRepository):
         return (
             [Transaction(**record) for record in response.data] if response.data else []
         )
+
+
+class AsyncTransactionRepository(IAsyncTransactionRepository):
+    async def create_transaction(
+        self, transaction: Transaction
+    ) -> Optional[Transaction]:
+        data = _to_row(transaction)
+        response = (
+            await get_async_postgrest().table("transactions").insert(data).execute()
+        )
+        if response.data:
+            await _aapply_ledger(ledger_deltas(added=response.data))
+            await abump_user_versions([transaction.user_id])
+            return transaction
+        return None
+
+    async def create_transactions(self, transactions: List[Transaction]) -> int:
+        """Insert all rows in one request; returns how many were written."""
+        if not transactions:
+            return 0
+        rows = [_to_row(t) for t in transactions]
+        await (
+            get_async_postgrest()
+            .table("transactions")
+            .insert(rows, returning=ReturnMethod.minimal)
+            .execute()
+        )
+        await _aapply_ledger(ledger_deltas(added=rows))
+        await abump_user_versions(row["user_id"] for row in rows)
+        return len(transactions)
+
+    async def _ledger_rows(self, transaction_id: UUID) -> List[dict]:
+        response = await (
+            get_async_postgrest()
+            .table("transactions")
+            .select(LEDGER_COLUMNS)
+            .eq("transaction_id", str(transaction_id))
+            .execute()
+        )
+        return response.data or []
+
+    async def get_transaction_by_id(
+        self, transaction_id: UUID
+    ) -> Optional[Transaction]:
+        response = await (
+            get_async_postgrest()
+            .table("transactions")
+            .select("*")
+            .eq("transaction_id", str(transaction_id))
+            .single()
+            .execute()
+        )
+        if response.data:
+            return Transaction(**response.data)
+        return None
+
+    async def get_transactions_by_user_id(self, user_id: UUID) -> List[Transaction]:
+        response = await (
+            get_async_postgrest()
+            .table("transactions")
+            .select("*")
+            .eq("user_id", str(user_id))
+            .execute()
+        )
+        return (
+            [Transaction(**record) for record in response.data] if response.data else []
+        )
+
+    async def get_all_transactions(self) -> List[Transaction]:
+        response = (
+            await get_async_postgrest().table("transactions").select("*").execute()
+        )
+        return (
+            [Transaction(**record) for record in response.data] if response.data else []
+        )
+
+    async def update_transaction(
+        self, transaction: Transaction
+    ) -> Optional[Transaction]:
+        before = await self._ledger_rows(transaction.transaction_id)
+        response = await (
+            get_async_postgrest()
+            .table("transactions")
+            .update(
+                {
+                    "category_id": str(transaction.category_id),
+                    "description": transaction.description,
+                    "amount": transaction.amount,
+                    "transaction_type": transaction.transaction_type.value,
+                }
+            )
+            .eq("transaction_id", str(transaction.transaction_id))
+            .execute()
+        )
+        if not response.data:
+            return None
+        await _aapply_ledger(ledger_deltas(added=response.data, removed=before))
+        await abump_user_versions(row["user_id"] for row in response.data)
+        return transaction
+
+    async def delete_transaction(self, transaction_id: UUID) -> bool:
+        response = await (
+            get_async_postgrest()
+            .table("transactions")
+            .delete()
+            .eq("transaction_id", str(transaction_id))
+            .execute()
+        )
+        await _aapply_ledger(ledger_deltas(removed=response.data or []))
+        await abump_user_versions(row["user_id"] for row in response.data or [])
+        return bool(response.data)
+
+    async def get_transactions_by_category_id(
+        self, category_id: UUID
+    ) -> List[Transaction]:
+        response = await (
+            get_async_postgrest()
+            .table("transactions")
+            .select("*")
+            .eq("category_id", str(category_id))
+            .execute()
+        )
+        return (
+            [Transaction(**record) for record in response.data] if response.data else []
+        )
+
+    async def list_transactions(
+        self, filters: Dict[str, str], limit: int, after: Optional[Keyset] = None
+    ) -> List[dict]:
+        query = get_async_postgrest().table("transactions").select(LIST_COLUMNS)
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        if after is not None:
+            query = keyset_filter(query, after)
+        response = await ordered(query).limit(limit).execute()
+        return response.data or []
+
+    async def stream_transactions(
+        self, filters: Dict[str, str], page_size: int, after: Optional[Keyset] = None
+    ) -> AsyncIterator[List[dict]]:
+        """Yield pages in keyset order; the next page is fetched while the
+        caller consumes the current one."""
+        pending = asyncio.ensure_future(
+            self.list_transactions(filters, page_size, after)
+        )
+        try:
+            while True:
+                rows = await pending
+                if len(rows) == page_size:
+                    last = rows[-1]
+                    pending = asyncio.ensure_future(
+                        self.list_transactions(
+                            filters,
+                            page_size,
+                            (last["created_at"], last["transaction_id"]),
+                        )
+                    )
+                if rows:
+                    yield rows
+                if len(rows) < page_size:
+                    return
+        finally:
+            # Client went away mid-stream: drop the prefetch
+            pending.cancel()
@@ -1,11 +1,30 @@
-from app.infrastructure.interfaces.user_repository import IUserRepository
+from app.infrastructure.interfaces.user_repository import (
+    IUserRepository,
+    IAsyncUserRepository,
+)
 from app.domain.user import User
-from app.core.supabase import get_supabase
+from app.core.avatars import AVATAR_BUCKET, avatar_thumbnailer, spool_avatar
+from app.core.config import settings
+from app.core.supabase import get_supabase, get_async_postgrest
+from app.core.user_versions import abump_user_versions, bump_user_versions
+import os
 from uuid import UUID
 from typing import List, Optional
 from datetime import datetime
 from uuid import uuid4
 from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+
+def _row_to_user(user: dict) -> User:
+    return User(
+        user_id=UUID(user["user_id"]),
+        email=user["email"],
+        full_name=user["full_name"],
+        phonenumber=user.get("phonenumber"),
+        data_of_birth=user.get("data_of_birth"),
+        avatar_url=user.get("avatar_url"),
+    )
 
 
 class UserRepository(IUserRepository):
@@ -22,6 +41,7 @@ class UserRepository(IUserRepository):
         }
         response = get_supabase().table("users").insert(data).execute()
         if response.data:
+            bump_user_versions(row["user_id"] for row in response.data)
             return user
         return None
 
@@ -71,6 +91,7 @@ class UserRepository(IUserRepository):
         )
         if not result.data:
             return None
+        bump_user_versions([user.user_id])
         return user
 
     def delete_user(self, user_id: UUID) -> bool:
@@ -82,38 +103,45 @@ class UserRepository(IUserRepository):
                 .eq("user_id", str(user_id))
                 .execute()
             )
+            if result.data:
+                bump_user_versions([user_id])
             return bool(result.data)
         except Exception as e:
             print(f"Delete error: {e}")
             return False
 
     def upload_avatar(self, user_id: UUID, file: UploadFile) -> Optional[str]:
-        supabase = get_supabase()
-
-        file_ext = file.filename.split(".")[-1]
-        filename = f"{uuid4()}.{file_ext}"
-        file_bytes = file.file.read()
+        # Raises ValueError for files over the cap or in no supported format
+        path, ext, content_type = spool_avatar(file.file, settings.AVATAR_MAX_BYTES)
+        filename = f"{uuid4()}.{ext}"
+        bucket = get_supabase().storage.from_(AVATAR_BUCKET)
 
         try:
-            supabase.storage.from_("avatars").upload(
-                path=filename,
-                file=file_bytes,
-                file_options={"content-type": file.content_type},
+            bucket.upload(
+                path=filename, file=path, file_options={"content-type": content_type}
             )
-            public_url = supabase.storage.from_("avatars").get_public_url(filename)
+            public_url = bucket.get_public_url(filename)
 
-            user = self.get_user_by_id(user_id)
-            if not user:
+            result = (
+                get_supabase()
+                .table("users")
+                .update({"avatar_url": public_url})
+                .eq("user_id", str(user_id))
+                .execute()
+            )
+            if not result.data:
+                bucket.remove([filename])
+                os.remove(path)
                 return None
-
-            user.avatar_url = public_url
-            self.update_user(user)
-
-            return public_url
         except Exception as e:
             print(f"Upload failed: {e}")
+            os.remove(path)
             return None
 
+        bump_user_versions([user_id])
+        avatar_thumbnailer.submit(path, filename)
+        return public_url
+
     def get_all_users(self) -> List[User]:
         result = get_supabase().table("users").select("*").execute()
         users = result.data or []
@@ -144,3 +172,150 @@ class UserRepository(IUserRepository):
         except Exception as e:
             print(f"Login error: {e}")
             return None
+
+
+class AsyncUserRepository(IAsyncUserRepository):
+    """Table access goes through the pooled async client; storage and auth
+    still use the sync client and are pushed to the threadpool."""
+
+    async def create_user(self, user: User) -> Optional[User]:
+        data = {
+            "email": user.email,
+            "full_name": user.full_name,
+            "phonenumber": user.phonenumber,
+            "data_of_birth": (
+                user.data_of_birth.isoformat() if user.data_of_birth else None
+            ),
+            "avatar_url": user.avatar_url,
+            "password": user.password,
+        }
+        response = await get_async_postgrest().table("users").insert(data).execute()
+        if response.data:
+            await abump_user_versions(row["user_id"] for row in response.data)
+            return user
+        return None
+
+    async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
+        result = await (
+            get_async_postgrest()
+            .table("users")
+            .select("*")
+            .eq("user_id", str(user_id))
+            .single()
+            .execute()
+        )
+        if not result.data:
+            return None
+        return _row_to_user(result.data)
+
+    async def update_user(self, user: User) -> Optional[User]:
+        data_of_birth = user.data_of_birth
+        if isinstance(data_of_birth, str):
+            data_of_birth = datetime.fromisoformat(data_of_birth).date()
+
+        user_data = {
+            "email": user.email,
+            "full_name": user.full_name,
+            "phonenumber": user.phonenumber,
+            "data_of_birth": data_of_birth.isoformat() if data_of_birth else None,
+            "avatar_url": user.avatar_url,
+            "password": user.password,
+        }
+
+        result = await (
+            get_async_postgrest()
+            .table("users")
+            .update(user_data)
+            .eq("user_id", str(user.user_id))
+            .execute()
+        )
+        if not result.data:
+            return None
+        await abump_user_versions([user.user_id])
+        return user
+
+    async def delete_user(self, user_id: UUID) -> bool:
+        try:
+            result = await (
+                get_async_postgrest()
+                .table("users")
+                .delete()
+                .eq("user_id", str(user_id))
+                .execute()
+            )
+            if result.data:
+                await abump_user_versions([user_id])
+            return bool(result.data)
+        except Exception as e:
+            print(f"Delete error: {e}")
+            return False
+
+    async def upload_avatar(self, user_id: UUID, file: UploadFile) -> Optional[str]:
+        # Raises ValueError for files over the cap or in no supported format
+        path, ext, content_type = await run_in_threadpool(
+            spool_avatar, file.file, settings.AVATAR_MAX_BYTES
+        )
+        filename = f"{uuid4()}.{ext}"
+        bucket = get_supabase().storage.from_(AVATAR_BUCKET)
+
+        try:
+            # Storage streams the spooled file from disk
+            await run_in_threadpool(
+                bucket.upload,
+                path=filename,
+                file=path,
+                file_options={"content-type": content_type},
+            )
+            public_url = bucket.get_public_url(filename)
+
+            result = await (
+                get_async_postgrest()
+                .table("users")
+                .update({"avatar_url": public_url})
+                .eq("user_id", str(user_id))
+                .execute()
+            )
+            if not result.data:
+                await run_in_threadpool(bucket.remove, [filename])
+                os.remove(path)
+                return None
+        except Exception as e:
+            print(f"Upload failed: {e}")
+            os.remove(path)
+            return None
+
+        await abump_user_versions([user_id])
+        avatar_thumbnailer.submit(path, filename)
+        return public_url
+
+    async def get_all_users(self) -> List[User]:
+        result = await get_async_postgrest().table("users").select("*").execute()
+        users = result.data or []
+        return [
+            User(
+                user_id=UUID(user["user_id"]),
+                email=user["email"],
+                full_name=user["full_name"],
+                phonenumber=user.get("phonenumber"),
+                data_of_birth=user.get("data_of_birth"),
+                avatar_url=user.get("avatar_url"),
+                password=user.get("password"),
+            )
+            for user in users
+        ]
+
+    async def login(self, email: str, password: str) -> Optional[dict]:
+        try:
+            result = await run_in_threadpool(
+                get_supabase().auth.sign_in_with_password,
+                {"email": email, "password": password},
+            )
+            if result.session:
+                return {
+                    "access_token": result.session.access_token,
+                    "refresh_token": result.session.refresh_token,
+                }
+            return None
+        except Exception as e:
+            print(f"Login error: {e}")
+            return None
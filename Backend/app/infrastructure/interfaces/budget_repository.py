@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
-from app.domain.budget import Budget
+from app.domain.budget import Budget, BudgetSpending
 
 
 class IBudgetRepository(ABC):
@@ -32,3 +33,45 @@ class IBudgetRepository(ABC):
     @abstractmethod
     def get_budget_by_category_id(self, category_id: UUID) -> List[Budget]:
         pass
+
+    @abstractmethod
+    def get_budget_spending(
+        self, user_id: UUID, period_start: datetime, period_end: datetime
+    ) -> List[BudgetSpending]:
+        pass
+
+
+class IAsyncBudgetRepository(ABC):
+    @abstractmethod
+    async def create_budget(self, budget: Budget) -> Optional[Budget]:
+        pass
+
+    @abstractmethod
+    async def get_all_budgets(self) -> List[Budget]:
+        pass
+
+    @abstractmethod
+    async def get_budget_by_id(self, budget_id) -> Optional[Budget]:
+        pass
+
+    @abstractmethod
+    async def get_budgets_by_user(self, user_id) -> List[Budget]:
+        pass
+
+    @abstractmethod
+    async def update_budget(self, budget: Budget) -> Optional[Budget]:
+        pass
+
+    @abstractmethod
+    async def delete_budget(self, budget_id) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_budget_by_category_id(self, category_id: UUID) -> List[Budget]:
+        pass
+
+    @abstractmethod
+    async def get_budget_spending(
+        self, user_id: UUID, period_start: datetime, period_end: datetime
+    ) -> List[BudgetSpending]:
+        pass
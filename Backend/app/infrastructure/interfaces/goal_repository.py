@@ -24,3 +24,25 @@ class IGoalRepository(ABC):
     @abstractmethod
     def delete_goal(self, goal_id: UUID) -> bool:
         pass
+
+
+class IAsyncGoalRepository(ABC):
+    @abstractmethod
+    async def create_goal(self, goal: Goal) -> Optional[Goal]:
+        pass
+
+    @abstractmethod
+    async def get_goal(self, goal_id: UUID) -> Optional[Goal]:
+        pass
+
+    @abstractmethod
+    async def get_goals_by_user(self, user_id: UUID) -> List[Goal]:
+        pass
+
+    @abstractmethod
+    async def update_goal(self, goal_id: UUID, goal_data: dict) -> Optional[Goal]:
+        pass
+
+    @abstractmethod
+    async def delete_goal(self, goal_id: UUID) -> bool:
+        pass
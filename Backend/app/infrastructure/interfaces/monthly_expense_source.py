@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class IMonthlyExpenseSource(ABC):
+    """Contract of the `monthly_category_expenses` database function."""
+
+    @abstractmethod
+    async def monthly_category_expenses(
+        self, user_ids: List[str], months: int, lookback_months: int
+    ) -> List[dict]:
+        """Rows of {user_id, month, category_name, total} for the most recent
+        `months` complete months with expenses, within `lookback_months`."""
+        pass
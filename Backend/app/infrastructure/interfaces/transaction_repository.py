@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import UUID
+from app.core.pagination import Keyset
 from app.domain.transaction import Transaction
 
 
@@ -32,4 +33,57 @@ class ITransactionRepository(ABC):
     @abstractmethod
     def get_transactions_by_category_id(self, category_id: UUID) -> List[Transaction]:
         pass
-    
+
+
+class IAsyncTransactionRepository(ABC):
+    @abstractmethod
+    async def create_transaction(
+        self, transaction: Transaction
+    ) -> Optional[Transaction]:
+        pass
+
+    @abstractmethod
+    async def create_transactions(self, transactions: List[Transaction]) -> int:
+        pass
+
+    @abstractmethod
+    async def get_transaction_by_id(
+        self, transaction_id: UUID
+    ) -> Optional[Transaction]:
+        pass
+
+    @abstractmethod
+    async def get_transactions_by_user_id(self, user_id: UUID) -> List[Transaction]:
+        pass
+
+    @abstractmethod
+    async def get_all_transactions(self) -> List[Transaction]:
+        pass
+
+    @abstractmethod
+    async def update_transaction(
+        self, transaction: Transaction
+    ) -> Optional[Transaction]:
+        pass
+
+    @abstractmethod
+    async def delete_transaction(self, transaction_id: UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_transactions_by_category_id(
+        self, category_id: UUID
+    ) -> List[Transaction]:
+        pass
+
+    @abstractmethod
+    async def list_transactions(
+        self, filters: Dict[str, str], limit: int, after: Optional[Keyset] = None
+    ) -> List[dict]:
+        pass
+
+    @abstractmethod
+    def stream_transactions(
+        self, filters: Dict[str, str], page_size: int, after: Optional[Keyset] = None
+    ) -> AsyncIterator[List[dict]]:
+        pass
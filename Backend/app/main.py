@@ -1,15 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from dotenv import load_dotenv
 
-from app.api.v1 import user, chat, transactions, budget, goal ,time_series
+from app.api.v1 import user, chat, transactions, budget, goal ,time_series, health
+from app.core.avatars import avatar_thumbnailer
+from app.core.config import settings
+from app.core.ledger import ledger_reconciler
+from app.core.password_hasher import password_hasher
+from app.core.providers import providers
+from app.core.supabase import close_async_postgrest
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm in the background so the API answers while models load
+    background = [
+        asyncio.create_task(providers[name].warm())
+        for name in settings.WARMUP_PROVIDERS
+        if name in providers
+    ]
+    if settings.LEDGER_RECONCILE_INTERVAL > 0:
+        background.append(asyncio.create_task(ledger_reconciler.run_forever()))
+    yield
+    for task in background:
+        task.cancel()
+    password_hasher.shutdown()
+    avatar_thumbnailer.shutdown()
+    await close_async_postgrest()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Personal Finance Management App",
     version="1.0",
     description="Mobile Application help users Track spending, set goals, get insights.",
+    lifespan=lifespan,
 )
 
 # Router prefix
@@ -27,3 +55,5 @@ app.include_router(budget.router, prefix=api_v1_prefix + "/budgets", tags=["Budg
 app.include_router(time_series.router, prefix="/forecast", tags=["Forecasting"])
 
 app.include_router(goal.router, prefix=api_v1_prefix + "/goals", tags=["Goals"])
+
+app.include_router(health.router, prefix="/health", tags=["Health"])
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -21,3 +21,28 @@ class BudgetResponse(BaseModel):
     category_id: UUID
     allocated_amount: float
     created_at: Optional[datetime] = None
+
+
+class BudgetCategoryStatus(BaseModel):
+    budget_id: UUID
+    category_id: UUID
+    category_name: Optional[str] = None
+    allocated_amount: float
+    spent: float
+    remaining: float
+    percent_used: float
+    # Average spend per elapsed day, and where that pace ends the period
+    daily_burn_rate: float
+    projected_spend: float
+
+
+class BudgetStatusResponse(BaseModel):
+    user_id: UUID
+    period_start: datetime
+    period_end: datetime
+    days_elapsed: float
+    days_in_period: int
+    total_allocated: float
+    total_spent: float
+    total_remaining: float
+    budgets: List[BudgetCategoryStatus]
@@ -0,0 +1,18 @@
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+from app.domain.import_job import ImportStatus
+
+
+class ImportJobResponse(BaseModel):
+    job_id: UUID
+    user_id: UUID
+    status: ImportStatus
+    progress: float
+    rows_read: int
+    rows_inserted: int
+    rows_rejected: int
+    rows_per_second: float
+    elapsed_seconds: float
+    errors: List[str] = []
+    detail: Optional[str] = None
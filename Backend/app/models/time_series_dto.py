@@ -1,5 +1,5 @@
-from typing import Dict, List
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
 from datetime import date
 
 
@@ -25,3 +25,13 @@ class TimeSeriesPredictionResponse(BaseModel):
     month: str  # month label "2025-07"
     predicted_total_expense: float
     history: List[MonthlyExpense]
+
+
+class BatchPredictionRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+
+class BatchPredictionItem(BaseModel):
+    user_id: str
+    prediction: Optional[TimeSeriesPredictionResponse] = None
+    error: Optional[str] = None  # set instead of prediction, e.g. too little data
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from uuid import UUID
 from datetime import datetime
@@ -26,6 +26,11 @@ class TransactionResponse(BaseModel):
     feedback: Optional[str] = None
 
 
+class TransactionPage(BaseModel):
+    items: List[TransactionResponse]
+    next_cursor: Optional[str] = None
+
+
 class UpdateTransactionRequest(BaseModel):
     transaction_id: str
     user_id: str
@@ -1,17 +1,84 @@
 from uuid import UUID, uuid4
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime, timezone
 
-from app.services.interfaces.budget_service import IBudgetService
+from app.services.interfaces.budget_service import IBudgetService, IAsyncBudgetService
 from app.models.budget_dto import (
     CreateBudgetRequest,
     UpdateBudgetRequest,
     BudgetResponse,
+    BudgetCategoryStatus,
+    BudgetStatusResponse,
+)
+from app.domain.budget import Budget, BudgetSpending
+from app.infrastructure.interfaces.budget_repository import (
+    IBudgetRepository,
+    IAsyncBudgetRepository,
 )
-from app.domain.budget import Budget
-from app.infrastructure.interfaces.budget_repository import IBudgetRepository
 from datetime import datetime
 
+SECONDS_PER_DAY = 86400
+
+
+def budget_period(now: datetime) -> Tuple[datetime, datetime]:
+    """The calendar month (UTC) containing `now`, as [start, end)."""
+    start = now.astimezone(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
+
+def build_budget_status(
+    user_id: UUID,
+    rows: List[BudgetSpending],
+    now: datetime,
+    period: Tuple[datetime, datetime],
+) -> BudgetStatusResponse:
+    start, end = period
+    days_in_period = round((end - start).total_seconds() / SECONDS_PER_DAY)
+    # Count at least one day so the first hours of a period do not explode the rate
+    days_elapsed = min(
+        max((now - start).total_seconds() / SECONDS_PER_DAY, 1.0), days_in_period
+    )
+    budgets = []
+    for row in rows:
+        spent = row.spent or 0.0
+        burn_rate = spent / days_elapsed
+        budgets.append(
+            BudgetCategoryStatus(
+                budget_id=row.budget_id,
+                category_id=row.category_id,
+                category_name=row.category_name,
+                allocated_amount=row.allocated_amount,
+                spent=spent,
+                remaining=row.allocated_amount - spent,
+                percent_used=(
+                    round(spent / row.allocated_amount * 100, 2)
+                    if row.allocated_amount
+                    else 0.0
+                ),
+                daily_burn_rate=round(burn_rate, 2),
+                projected_spend=round(burn_rate * days_in_period, 2),
+            )
+        )
+    total_allocated = sum(b.allocated_amount for b in budgets)
+    total_spent = sum(b.spent for b in budgets)
+    return BudgetStatusResponse(
+        user_id=user_id,
+        period_start=start,
+        period_end=end,
+        days_elapsed=round(days_elapsed, 2),
+        days_in_period=days_in_period,
+        total_allocated=total_allocated,
+        total_spent=total_spent,
+        total_remaining=total_allocated - total_spent,
+        budgets=budgets,
+    )
+
 
 class BudgetService(IBudgetService):
     def __init__(self, budget_repo: IBudgetRepository):
@@ -62,3 +129,72 @@ class BudgetService(IBudgetService):
     def get_budget_by_category_id(self, category_id: UUID) -> List[BudgetResponse]:
         budgets = self.budget_repo.get_budget_by_category_id(category_id)
         return [BudgetResponse(**budget.__dict__) for budget in budgets]
+
+    def get_budget_status(self, user_id: UUID) -> BudgetStatusResponse:
+        now = datetime.now(timezone.utc)
+        period = budget_period(now)
+        rows = self.budget_repo.get_budget_spending(user_id, *period)
+        return build_budget_status(user_id, rows, now, period)
+
+
+class AsyncBudgetService(IAsyncBudgetService):
+    def __init__(self, budget_repo: IAsyncBudgetRepository):
+        self.budget_repo = budget_repo
+
+    async def create_budget(
+        self, data: CreateBudgetRequest
+    ) -> Optional[BudgetResponse]:
+        budget = Budget(
+            budget_id=uuid4(),
+            user_id=data.user_id,
+            category_id=data.category_id,
+            allocated_amount=data.allocated_amount,
+            created_at=datetime.now(timezone.utc),
+        )
+        created = await self.budget_repo.create_budget(budget)
+        if not created:
+            return None
+        return BudgetResponse(**created.__dict__)
+
+    async def get_all_budgets(self) -> List[BudgetResponse]:
+        budgets = await self.budget_repo.get_all_budgets()
+        return [BudgetResponse(**b.__dict__) for b in budgets]
+
+    async def get_budget_by_id(self, budget_id) -> Optional[BudgetResponse]:
+        budget = await self.budget_repo.get_budget_by_id(budget_id)
+        return BudgetResponse(**budget.__dict__) if budget else None
+
+    async def get_budgets_by_user(self, user_id) -> List[BudgetResponse]:
+        budgets = await self.budget_repo.get_budgets_by_user(user_id)
+        return [BudgetResponse(**b.__dict__) for b in budgets]
+
+    async def update_budget(
+        self, data: UpdateBudgetRequest
+    ) -> Optional[BudgetResponse]:
+        existing = await self.budget_repo.get_budget_by_id(data.budget_id)
+        if not existing:
+            return None
+        updated = Budget(
+            budget_id=data.budget_id,
+            user_id=existing.user_id,
+            category_id=existing.category_id,
+            allocated_amount=data.allocated_amount,
+            created_at=existing.created_at,
+        )
+        saved = await self.budget_repo.update_budget(updated)
+        return BudgetResponse(**saved.__dict__) if saved else None
+
+    async def delete_budget(self, budget_id) -> bool:
+        return await self.budget_repo.delete_budget(budget_id)
+
+    async def get_budget_by_category_id(
+        self, category_id: UUID
+    ) -> List[BudgetResponse]:
+        budgets = await self.budget_repo.get_budget_by_category_id(category_id)
+        return [BudgetResponse(**budget.__dict__) for budget in budgets]
+
+    async def get_budget_status(self, user_id: UUID) -> BudgetStatusResponse:
+        now = datetime.now(timezone.utc)
+        period = budget_period(now)
+        rows = await self.budget_repo.get_budget_spending(user_id, *period)
+        return build_budget_status(user_id, rows, now, period)
@@ -1,10 +1,28 @@
+from typing import AsyncIterator
+
 from app.services.interfaces.chat_service import IChatService
-from app.core.rag_model import get_chat_response
+from app.core.llm_gateway import llm_gateway
+from app.core.providers import rag_chatbot
 
 
 class ChatService(IChatService):
-    def get_response(self, user_id: str, message: str) -> str:
-        result = get_chat_response(message, user_id)
+    async def get_response(self, user_id: str, message: str) -> str:
+        # First call builds the RAG stack unless it was warmed at startup
+        chatbot = await llm_gateway.run_blocking(rag_chatbot.get)
+        result = await chatbot.aget_chat_response(message, user_id)
         if "error" in result:
             return f"Error: {result['error']}"
         return result["answer"]
+
+    async def stream_response(self, user_id: str, message: str) -> AsyncIterator[str]:
+        chatbot = await llm_gateway.run_blocking(rag_chatbot.get)
+        async for token in chatbot.astream_chat_response(message, user_id):
+            yield token
+
+    def get_metrics(self) -> dict:
+        if not rag_chatbot.ready:
+            return {
+                "rag_chatbot": rag_chatbot.status(),
+                "llm_gateway": llm_gateway.stats(),
+            }
+        return rag_chatbot.get().metrics()
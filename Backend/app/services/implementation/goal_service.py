@@ -1,9 +1,12 @@
 from typing import List, Optional
 from uuid import uuid4, UUID
 from app.domain.goal import Goal
-from app.services.interfaces.goal_service import IGoalService
+from app.services.interfaces.goal_service import IGoalService, IAsyncGoalService
 from app.models.goal_dto import CreateGoalRequest, UpdateGoalRequest, GoalResponse
-from app.infrastructure.interfaces.goal_repository import IGoalRepository
+from app.infrastructure.interfaces.goal_repository import (
+    IGoalRepository,
+    IAsyncGoalRepository,
+)
 from datetime import datetime
 
 
@@ -42,3 +45,40 @@ class GoalService(IGoalService):
 
     def delete_goal(self, goal_id: UUID) -> bool:
         return self.goal_repository.delete_goal(goal_id)
+
+
+class AsyncGoalService(IAsyncGoalService):
+    def __init__(self, goal_repository: IAsyncGoalRepository):
+        self.goal_repository = goal_repository
+
+    async def create_goal(self, data: CreateGoalRequest) -> Optional[GoalResponse]:
+        goal = Goal(
+            goal_id=uuid4(),
+            user_id=data.user_id,
+            goal_name=data.goal_name,
+            target_amount=data.target_amount,
+            amount_saved=0.0,
+            created_at=datetime.utcnow(),
+        )
+        result = await self.goal_repository.create_goal(goal)
+        return GoalResponse(**vars(result)) if result else None
+
+    async def get_goal(self, goal_id: UUID) -> Optional[GoalResponse]:
+        goal = await self.goal_repository.get_goal(goal_id)
+        return GoalResponse(**vars(goal)) if goal else None
+
+    async def get_user_goals(self, user_id: UUID) -> List[GoalResponse]:
+        return [
+            GoalResponse(**vars(g))
+            for g in await self.goal_repository.get_goals_by_user(user_id)
+        ]
+
+    async def update_goal(
+        self, goal_id: UUID, data: UpdateGoalRequest
+    ) -> Optional[GoalResponse]:
+        update_data = {k: v for k, v in data.dict().items() if v is not None}
+        goal = await self.goal_repository.update_goal(goal_id, update_data)
+        return GoalResponse(**vars(goal)) if goal else None
+
+    async def delete_goal(self, goal_id: UUID) -> bool:
+        return await self.goal_repository.delete_goal(goal_id)
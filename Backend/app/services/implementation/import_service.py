@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import tempfile
+from collections import OrderedDict
+from typing import BinaryIO, Optional
+from uuid import UUID, uuid4
+from starlette.concurrency import run_in_threadpool
+
+from app.core.category_catalog import category_catalog
+from app.core.config import settings
+from app.core.csv_import import CsvTransactionReader, MAX_REPORTED_ERRORS
+from app.domain.import_job import ImportJob, ImportStatus
+from app.infrastructure.interfaces.transaction_repository import (
+    IAsyncTransactionRepository,
+)
+from app.services.interfaces.import_service import IImportService
+
+logger = logging.getLogger(__name__)
+
+
+def _spool_upload(upload: BinaryIO, max_bytes: int) -> BinaryIO:
+    """Copy the upload to a private temp file the background job can own."""
+    spool = tempfile.TemporaryFile()
+    copied = 0
+    while chunk := upload.read(1024 * 1024):
+        copied += len(chunk)
+        if copied > max_bytes:
+            spool.close()
+            raise ValueError(f"File is larger than {max_bytes} bytes")
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+class ImportService(IImportService):
+    """Runs CSV imports as background tasks of this worker.
+
+    Job state lives in memory, so progress is only visible on the worker that
+    accepted the upload.
+    """
+
+    def __init__(self, transaction_repository: IAsyncTransactionRepository):
+        self.transaction_repository = transaction_repository
+        self.jobs: "OrderedDict[UUID, ImportJob]" = OrderedDict()
+        self._tasks = set()
+
+    async def start_import(self, user_id: UUID, upload: BinaryIO) -> ImportJob:
+        spool = await run_in_threadpool(
+            _spool_upload, upload, settings.IMPORT_MAX_BYTES
+        )
+        total_bytes = spool.seek(0, 2)
+        spool.seek(0)
+        await category_catalog.aensure_fresh()
+        try:
+            reader = CsvTransactionReader(
+                spool,
+                user_id,
+                category_catalog.resolve,
+                chunk_rows=settings.IMPORT_BATCH_SIZE,
+            )
+        except (ValueError, UnicodeDecodeError) as e:
+            spool.close()
+            raise ValueError(f"Invalid CSV: {e}")
+
+        job = ImportJob(job_id=uuid4(), user_id=user_id, total_bytes=total_bytes)
+        self.jobs[job.job_id] = job
+        while len(self.jobs) > settings.IMPORT_MAX_JOBS:
+            self.jobs.popitem(last=False)
+
+        task = asyncio.create_task(self._run(job, reader))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get_job(self, job_id: UUID) -> Optional[ImportJob]:
+        return self.jobs.get(job_id)
+
+    async def _run(self, job: ImportJob, reader: CsvTransactionReader) -> None:
+        chunks = reader.chunks()
+        insert: Optional[asyncio.Future] = None
+        try:
+            while True:
+                # Parse the next chunk while the previous batch is being inserted
+                chunk = await run_in_threadpool(next, chunks, None)
+                if insert is not None:
+                    job.rows_inserted += await insert
+                    insert = None
+                if chunk is None:
+                    break
+                transactions, errors = chunk
+                job.rows_read += len(transactions) + len(errors)
+                job.rows_rejected += len(errors)
+                job.bytes_read = reader.bytes_read
+                room = MAX_REPORTED_ERRORS - len(job.errors)
+                job.errors.extend(errors[: max(room, 0)])
+                if transactions:
+                    insert = asyncio.ensure_future(
+                        self.transaction_repository.create_transactions(transactions)
+                    )
+            job.finish(ImportStatus.COMPLETED)
+        except Exception as e:
+            if insert is not None:
+                insert.cancel()
+            logger.error(f"Import {job.job_id} failed: {e}")
+            job.finish(ImportStatus.FAILED, detail=str(e))
+        finally:
+            reader.stream.close()
+        logger.info(
+            f"Import {job.job_id}: {job.rows_inserted} rows in "
+            f"{job.elapsed_seconds:.2f}s ({job.rows_per_second:.0f} rows/s)"
+        )
@@ -1,6 +1,16 @@
-from app.services.interfaces.time_series_service import ITimeSeriesService
-from app.infrastructure.interfaces.time_series_repository import ITimeSeriesRepository
-from app.models.time_series_dto import TimeSeriesPredictionResponse
+from app.services.interfaces.time_series_service import (
+    ITimeSeriesService,
+    IAsyncTimeSeriesService,
+)
+from app.infrastructure.interfaces.time_series_repository import (
+    ITimeSeriesRepository,
+    IAsyncTimeSeriesRepository,
+)
+from typing import List
+from app.models.time_series_dto import (
+    TimeSeriesPredictionResponse,
+    BatchPredictionItem,
+)
 
 
 class TimeSeriesService(ITimeSeriesService):
@@ -9,3 +19,19 @@ class TimeSeriesService(ITimeSeriesService):
 
     def get_next_month_prediction(self, user_id: str) -> TimeSeriesPredictionResponse:
         return self.repo.get_next_month_prediction(user_id)
+
+
+class AsyncTimeSeriesService(IAsyncTimeSeriesService):
+    def __init__(self, repo: IAsyncTimeSeriesRepository):
+        self.repo = repo
+
+    async def get_next_month_prediction(
+        self, user_id: str
+    ) -> TimeSeriesPredictionResponse:
+        return await self.repo.get_next_month_prediction(user_id)
+
+    async def get_next_month_predictions(
+        self, user_ids: List[str]
+    ) -> List[BatchPredictionItem]:
+        # Keep order, drop duplicates
+        return await self.repo.get_next_month_predictions(list(dict.fromkeys(user_ids)))
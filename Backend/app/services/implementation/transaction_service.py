@@ -1,17 +1,55 @@
-from typing import List, Optional
+import time
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import UUID, uuid4
 from datetime import datetime
 
-from app.core.supabase import get_supabase
-from app.services.interfaces.transaction_service import ITransactionService
-from app.models.transaction_dto import CreateTransactionRequest, TransactionResponse
+from app.core.category_catalog import category_catalog
+from app.core.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.services.interfaces.transaction_service import (
+    ITransactionService,
+    IAsyncTransactionService,
+)
+from app.models.transaction_dto import (
+    CreateTransactionRequest,
+    TransactionResponse,
+    TransactionPage,
+)
 from app.domain.transaction import Transaction, TransactionType
-from app.infrastructure.interfaces.transaction_repository import ITransactionRepository
+from app.infrastructure.interfaces.transaction_repository import (
+    ITransactionRepository,
+    IAsyncTransactionRepository,
+)
 from app.core.Add_Trans import (
     process_transaction_with_llm,
+    aprocess_transaction_with_llm,
     parse_llm_response,
-    get_category_id,
+    aextract_transactions_batch,
 )
+from app.core.batch_predictor import MicroBatcher
+from app.core.extraction_cache import extraction_cache
+from app.core.fast_extract import fast_extractor
+from app.core.llm_gateway import llm_gateway
+
+
+def _first_transaction(parsed_list: List[dict]) -> dict:
+    if not parsed_list:
+        raise ValueError("No transaction found in LLM response")
+    return parsed_list[0]
+
+
+def _parse_transaction_type(parsed: dict) -> TransactionType:
+    if "error" in parsed:
+        raise ValueError(parsed["error"])
+    transaction_type_str = parsed.get("transaction_type")
+    if not transaction_type_str:
+        raise ValueError("Missing transaction_type from LLM response")
+
+    try:
+        # Handle case-insensitive enum value
+        return TransactionType(transaction_type_str.capitalize())
+    except ValueError:
+        raise ValueError(f"Invalid transaction_type: {transaction_type_str}")
 
 
 class TransactionService(ITransactionService):
@@ -22,23 +60,24 @@ class TransactionService(ITransactionService):
         self, data: CreateTransactionRequest
     ) -> Optional[TransactionResponse]:
 
-        # Step 1: Get LLM raw response and parse
-        raw_response = process_transaction_with_llm(data.input_text)
-        parsed = parse_llm_response(raw_response)
+        # Step 1: Rule-based extraction, a cached extraction of the same
+        # message today, else LLM raw response and parse
+        parsed_list = fast_extractor.extract(data.input_text)
+        if parsed_list is None:
+            parsed_list = extraction_cache.get(data.input_text)
+        if parsed_list is None:
+            start = time.perf_counter()
+            raw_response = process_transaction_with_llm(data.input_text)
+            fast_extractor.record_llm_call(time.perf_counter() - start)
+            parsed_list = parse_llm_response(raw_response)
+            extraction_cache.put(data.input_text, parsed_list)
+        parsed = _first_transaction(parsed_list)
 
         # Step 2: Validate transaction_type
-        transaction_type_str = parsed.get("transaction_type")
-        if not transaction_type_str:
-            raise ValueError("Missing transaction_type from LLM response")
+        transaction_type = _parse_transaction_type(parsed)
 
-        try:
-            # Handle case-insensitive enum value
-            transaction_type = TransactionType(transaction_type_str.capitalize())
-        except ValueError:
-            raise ValueError(f"Invalid transaction_type: {transaction_type_str}")
-
-        # Step 3: Get category ID using Supabase
-        category_id = get_category_id(parsed["category"], get_supabase())
+        # Step 3: Resolve category ID from the in-process catalog
+        category_id = category_catalog.resolve(parsed["category"])
 
         # Step 4: Create domain model
         transaction = Transaction(
@@ -93,3 +132,155 @@ class TransactionService(ITransactionService):
     ) -> List[TransactionResponse]:
         txs = self.transaction_repository.get_transactions_by_category_id(category_id)
         return [TransactionResponse(**tx.__dict__) for tx in txs]
+
+
+class AsyncTransactionService(IAsyncTransactionService):
+    def __init__(self, transaction_repository: IAsyncTransactionRepository):
+        self.transaction_repository = transaction_repository
+        # With LLM_BATCH_MAX_MESSAGES > 1, messages that arrive together
+        # share one LLM call; as many batch calls run at once as the LLM
+        # gateway lets through
+        self.extraction_batcher = MicroBatcher(
+            aextract_transactions_batch,
+            max_batch_size=settings.LLM_BATCH_MAX_MESSAGES,
+            max_wait_ms=settings.LLM_BATCH_MAX_WAIT_MS,
+            max_in_flight=settings.LLM_MAX_CONCURRENCY,
+        )
+
+    async def _extract(self, input_text: str) -> List[dict]:
+        """Parsed transactions of one message; the LLM only when rules are unsure."""
+        parsed_list = fast_extractor.extract(input_text)
+        if parsed_list is None:
+            parsed_list = extraction_cache.get(input_text)
+        if parsed_list is not None:
+            return parsed_list
+
+        start = time.perf_counter()
+        if settings.LLM_BATCH_MAX_MESSAGES > 1:
+            parsed_list = await self.extraction_batcher.submit(input_text)
+        else:
+            raw_response = await aprocess_transaction_with_llm(input_text)
+            parsed_list = parse_llm_response(raw_response)
+        fast_extractor.record_llm_call(time.perf_counter() - start)
+        extraction_cache.put(input_text, parsed_list)
+        return parsed_list
+
+    def get_extraction_metrics(self) -> dict:
+        return {
+            "fast_path": fast_extractor.stats(),
+            "cache": extraction_cache.stats(),
+            "llm_batching": self.extraction_batcher.stats(),
+            "llm_gateway": llm_gateway.stats(),
+        }
+
+    async def _to_transaction(self, user_id: str, parsed: dict) -> Transaction:
+        # Validate transaction_type, then resolve the category in-process
+        transaction_type = _parse_transaction_type(parsed)
+        category_id = await category_catalog.aresolve(parsed["category"])
+        return Transaction(
+            transaction_id=uuid4(),
+            user_id=user_id,
+            category_id=category_id,
+            description=parsed["description"],
+            created_at=datetime.strptime(parsed["created_at"], "%Y-%m-%d %H:%M:%S+00"),
+            amount=parsed["amount"],
+            transaction_type=transaction_type,
+        )
+
+    async def create_transaction(
+        self, data: CreateTransactionRequest
+    ) -> Optional[TransactionResponse]:
+        # Only the first transaction is kept; see create_transactions
+        parsed = _first_transaction(await self._extract(data.input_text))
+        transaction = await self._to_transaction(data.user_id, parsed)
+
+        response = await self.transaction_repository.create_transaction(transaction)
+        if not response:
+            return None
+        return TransactionResponse(**response.__dict__, feedback=parsed["feedback"])
+
+    async def create_transactions(
+        self, data: CreateTransactionRequest
+    ) -> List[TransactionResponse]:
+        parsed_list = await self._extract(data.input_text)
+        created, problems = [], []
+        for parsed in parsed_list:
+            try:
+                created.append(
+                    (await self._to_transaction(data.user_id, parsed), parsed)
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                problems.append(str(e))
+        if not created:
+            raise ValueError(
+                problems[0] if problems else "No transaction found in LLM response"
+            )
+
+        # Every transaction of the message goes in with one insert
+        await self.transaction_repository.create_transactions(
+            [tx for tx, _ in created]
+        )
+        return [
+            TransactionResponse(**tx.__dict__, feedback=parsed["feedback"])
+            for tx, parsed in created
+        ]
+
+    async def get_transaction_by_id(
+        self, transaction_id: UUID
+    ) -> Optional[TransactionResponse]:
+        tx = await self.transaction_repository.get_transaction_by_id(transaction_id)
+        return TransactionResponse(**tx.__dict__) if tx else None
+
+    async def get_transactions_by_user_id(
+        self, user_id: UUID
+    ) -> List[TransactionResponse]:
+        txs = await self.transaction_repository.get_transactions_by_user_id(user_id)
+        return [TransactionResponse(**tx.__dict__) for tx in txs]
+
+    async def get_all_transactions(self) -> List[TransactionResponse]:
+        txs = await self.transaction_repository.get_all_transactions()
+        return [TransactionResponse(**tx.__dict__) for tx in txs]
+
+    async def update_transaction(
+        self, transaction: Transaction
+    ) -> Optional[TransactionResponse]:
+        updated = await self.transaction_repository.update_transaction(transaction)
+        return TransactionResponse(**updated.__dict__) if updated else None
+
+    async def delete_transaction(self, transaction_id: UUID) -> bool:
+        return await self.transaction_repository.delete_transaction(transaction_id)
+
+    async def get_transactions_by_category_id(
+        self, category_id: UUID
+    ) -> List[TransactionResponse]:
+        txs = await self.transaction_repository.get_transactions_by_category_id(
+            category_id
+        )
+        return [TransactionResponse(**tx.__dict__) for tx in txs]
+
+    async def get_transactions_page(
+        self, filters: Dict[str, str], limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        after = decode_cursor(cursor) if cursor else None
+        # One extra row tells whether there is a next page
+        rows = await self.transaction_repository.list_transactions(
+            filters, limit + 1, after
+        )
+        page, more = rows[:limit], len(rows) > limit
+        return TransactionPage(
+            items=[TransactionResponse(**row) for row in page],
+            next_cursor=(
+                encode_cursor(page[-1]["created_at"], page[-1]["transaction_id"])
+                if more
+                else None
+            ),
+        )
+
+    def stream_transactions(
+        self, filters: Dict[str, str], cursor: Optional[str] = None
+    ) -> AsyncIterator[List[dict]]:
+        # Not a generator itself, so a bad cursor fails before streaming starts
+        after = decode_cursor(cursor) if cursor else None
+        return self.transaction_repository.stream_transactions(
+            filters, settings.TRANSACTIONS_STREAM_PAGE_SIZE, after
+        )
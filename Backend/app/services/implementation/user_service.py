@@ -1,5 +1,8 @@
-from app.infrastructure.interfaces.user_repository import IUserRepository
-from app.services.interfaces.user_service import IUserService
+from app.infrastructure.interfaces.user_repository import (
+    IUserRepository,
+    IAsyncUserRepository,
+)
+from app.services.interfaces.user_service import IUserService, IAsyncUserService
 from app.domain.user import User
 from typing import List, Optional
 from uuid import UUID, uuid4
@@ -30,3 +33,29 @@ class UserService(IUserService):
 
     def login(self, email: str, password: str) -> Optional[dict]:
         return self.repo.login(email, password)
+
+
+class AsyncUserService(IAsyncUserService):
+    def __init__(self, repo: IAsyncUserRepository):
+        self.repo = repo
+
+    async def create_user(self, user: User) -> Optional[User]:
+        return await self.repo.create_user(user)
+
+    async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
+        return await self.repo.get_user_by_id(user_id)
+
+    async def update_user(self, user: User) -> Optional[User]:
+        return await self.repo.update_user(user)
+
+    async def delete_user(self, user_id: UUID) -> bool:
+        return await self.repo.delete_user(user_id)
+
+    async def upload_avatar(self, user_id: UUID, file: UploadFile) -> Optional[str]:
+        return await self.repo.upload_avatar(user_id, file)
+
+    async def get_all_users(self) -> List[User]:
+        return await self.repo.get_all_users()
+
+    async def login(self, email: str, password: str) -> Optional[dict]:
+        return await self.repo.login(email, password)
@@ -5,6 +5,7 @@ from app.models.budget_dto import (
     CreateBudgetRequest,
     UpdateBudgetRequest,
     BudgetResponse,
+    BudgetStatusResponse,
 )
 
 
@@ -36,3 +37,47 @@ class IBudgetService(ABC):
     @abstractmethod
     def get_budget_by_category_id(self, category_id: UUID) -> List[BudgetResponse]:
         pass
+
+    @abstractmethod
+    def get_budget_status(self, user_id: UUID) -> BudgetStatusResponse:
+        pass
+
+
+class IAsyncBudgetService(ABC):
+    @abstractmethod
+    async def create_budget(
+        self, data: CreateBudgetRequest
+    ) -> Optional[BudgetResponse]:
+        pass
+
+    @abstractmethod
+    async def get_all_budgets(self) -> List[BudgetResponse]:
+        pass
+
+    @abstractmethod
+    async def get_budget_by_id(self, budget_id: UUID) -> Optional[BudgetResponse]:
+        pass
+
+    @abstractmethod
+    async def get_budgets_by_user(self, user_id: UUID) -> List[BudgetResponse]:
+        pass
+
+    @abstractmethod
+    async def update_budget(
+        self, data: UpdateBudgetRequest
+    ) -> Optional[BudgetResponse]:
+        pass
+
+    @abstractmethod
+    async def delete_budget(self, budget_id: UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_budget_by_category_id(
+        self, category_id: UUID
+    ) -> List[BudgetResponse]:
+        pass
+
+    @abstractmethod
+    async def get_budget_status(self, user_id: UUID) -> BudgetStatusResponse:
+        pass
@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class IChatService(ABC):
     @abstractmethod
-    def get_response(self, user_id: str, message: str) -> str:
+    async def get_response(self, user_id: str, message: str) -> str:
+        pass
+
+    @abstractmethod
+    def stream_response(self, user_id: str, message: str) -> AsyncIterator[str]:
+        pass
+
+    @abstractmethod
+    def get_metrics(self) -> dict:
         pass
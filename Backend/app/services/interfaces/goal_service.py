@@ -26,3 +26,27 @@ class IGoalService(ABC):
     @abstractmethod
     def delete_goal(self, goal_id: UUID) -> bool:
         pass
+
+
+class IAsyncGoalService(ABC):
+    @abstractmethod
+    async def create_goal(self, data: CreateGoalRequest) -> Optional[GoalResponse]:
+        pass
+
+    @abstractmethod
+    async def get_goal(self, goal_id: UUID) -> Optional[GoalResponse]:
+        pass
+
+    @abstractmethod
+    async def get_user_goals(self, user_id: UUID) -> List[GoalResponse]:
+        pass
+
+    @abstractmethod
+    async def update_goal(
+        self, goal_id: UUID, data: UpdateGoalRequest
+    ) -> Optional[GoalResponse]:
+        pass
+
+    @abstractmethod
+    async def delete_goal(self, goal_id: UUID) -> bool:
+        pass
@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+from uuid import UUID
+from app.domain.import_job import ImportJob
+
+
+class IImportService(ABC):
+    @abstractmethod
+    async def start_import(self, user_id: UUID, upload: BinaryIO) -> ImportJob:
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: UUID) -> Optional[ImportJob]:
+        pass
@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
-from app.models.time_series_dto import TimeSeriesPredictionResponse
+from typing import List
+from app.models.time_series_dto import (
+    TimeSeriesPredictionResponse,
+    BatchPredictionItem,
+)
 
 
 class ITimeSeriesService(ABC):
@@ -7,3 +11,18 @@ class ITimeSeriesService(ABC):
     @abstractmethod
     def get_next_month_prediction(self, user_id: str) -> TimeSeriesPredictionResponse:
         pass
+
+
+class IAsyncTimeSeriesService(ABC):
+
+    @abstractmethod
+    async def get_next_month_prediction(
+        self, user_id: str
+    ) -> TimeSeriesPredictionResponse:
+        pass
+
+    @abstractmethod
+    async def get_next_month_predictions(
+        self, user_ids: List[str]
+    ) -> List[BatchPredictionItem]:
+        pass
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional
 from uuid import UUID
-from app.models.transaction_dto import CreateTransactionRequest, TransactionResponse
+from app.models.transaction_dto import (
+    CreateTransactionRequest,
+    TransactionResponse,
+    TransactionPage,
+)
 from app.domain.transaction import Transaction
 
 
@@ -39,3 +43,65 @@ class ITransactionService(ABC):
     @abstractmethod
     def get_transactions_by_category_id(self, category_id: UUID) -> List[TransactionResponse]:
         pass
+
+
+class IAsyncTransactionService(ABC):
+    @abstractmethod
+    async def create_transaction(
+        self, data: CreateTransactionRequest
+    ) -> Optional[TransactionResponse]:
+        pass
+
+    @abstractmethod
+    async def create_transactions(
+        self, data: CreateTransactionRequest
+    ) -> List[TransactionResponse]:
+        pass
+
+    @abstractmethod
+    def get_extraction_metrics(self) -> dict:
+        pass
+
+    @abstractmethod
+    async def get_transaction_by_id(
+        self, transaction_id: UUID
+    ) -> Optional[TransactionResponse]:
+        pass
+
+    @abstractmethod
+    async def get_transactions_by_user_id(
+        self, user_id: UUID
+    ) -> List[TransactionResponse]:
+        pass
+
+    @abstractmethod
+    async def get_all_transactions(self) -> List[TransactionResponse]:
+        pass
+
+    @abstractmethod
+    async def update_transaction(
+        self, transaction: Transaction
+    ) -> Optional[TransactionResponse]:
+        pass
+
+    @abstractmethod
+    async def delete_transaction(self, transaction_id: UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def get_transactions_by_category_id(
+        self, category_id: UUID
+    ) -> List[TransactionResponse]:
+        pass
+
+    @abstractmethod
+    async def get_transactions_page(
+        self, filters: Dict[str, str], limit: int, cursor: Optional[str] = None
+    ) -> TransactionPage:
+        pass
+
+    @abstractmethod
+    def stream_transactions(
+        self, filters: Dict[str, str], cursor: Optional[str] = None
+    ) -> AsyncIterator[List[dict]]:
+        pass
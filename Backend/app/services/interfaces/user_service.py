@@ -38,3 +38,33 @@ class IUserService(ABC):
     @abstractmethod
     def login(self, email: str, password: str) -> Optional[dict]:
         pass
+
+
+class IAsyncUserService(ABC):
+    @abstractmethod
+    async def create_user(self, user: User) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def get_user_by_id(self, user_id: UUID) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def update_user(self, user: User) -> Optional[User]:
+        pass
+
+    @abstractmethod
+    async def delete_user(self, user_id: UUID) -> bool:
+        pass
+
+    @abstractmethod
+    async def upload_avatar(self, user_id: UUID, file: UploadFile) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    async def get_all_users(self) -> List[User]:
+        pass
+
+    @abstractmethod
+    async def login(self, email: str, password: str) -> Optional[dict]:
+        pass
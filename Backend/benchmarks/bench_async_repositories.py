@@ -0,0 +1,127 @@
+"""
+Requests/sec of the sync (threadpool) vs async (pooled client) repository path.
+
+A small Starlette app stands in for PostgREST so the numbers measure our own
+stack and not Supabase. Every stand-in query sleeps for --db-latency seconds to
+mimic a network round trip.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_async_repositories --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+from uuid import uuid4
+
+STANDIN_HOST = "127.0.0.1"
+STANDIN_PORT = 54321
+
+# Settings are read at import time, so point them at the stand-in first.
+os.environ["SUPABASE_URL"] = f"http://{STANDIN_HOST}:{STANDIN_PORT}"
+os.environ["SUPABASE_KEY"] = "bench.bench.bench"
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.infrastructure.implementation.budget_repository import (
+    BudgetRepository,
+    AsyncBudgetRepository,
+)
+from app.core.supabase import close_async_postgrest
+
+
+def build_postgrest_standin(latency: float, rows: int) -> Starlette:
+    user_id = str(uuid4())
+    payload = [
+        {
+            "budget_id": str(uuid4()),
+            "user_id": user_id,
+            "category_id": str(uuid4()),
+            "allocated_amount": 100.0 + i,
+        }
+        for i in range(rows)
+    ]
+
+    async def table(request):
+        await asyncio.sleep(latency)
+        return JSONResponse(payload)
+
+    return Starlette(routes=[Route("/rest/v1/{table}", table)])
+
+
+def start_standin(app: Starlette) -> uvicorn.Server:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=STANDIN_HOST, port=STANDIN_PORT, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def build_api() -> FastAPI:
+    api = FastAPI()
+    sync_repo = BudgetRepository()
+    async_repo = AsyncBudgetRepository()
+
+    @api.get("/sync/{user_id}")
+    def sync_route(user_id: str):
+        return len(sync_repo.get_budgets_by_user(user_id))
+
+    @api.get("/async/{user_id}")
+    async def async_route(user_id: str):
+        return len(await async_repo.get_budgets_by_user(user_id))
+
+    return api
+
+
+async def drive(api: FastAPI, path: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        queue = asyncio.Queue()
+        for _ in range(total):
+            queue.put_nowait(f"/{path}/{uuid4()}")
+
+        async def worker():
+            while not queue.empty():
+                resp = await c.get(queue.get_nowait())
+                resp.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - start)
+
+
+async def main(args):
+    api = build_api()
+    # Warm both paths so connection setup is not part of the measurement
+    await drive(api, "sync", 20, 10)
+    await drive(api, "async", 20, 10)
+
+    print(f"{'path':<8}{'req/s':>10}")
+    for path in ("sync", "async"):
+        rps = await drive(api, path, args.requests, args.concurrency)
+        print(f"{path:<8}{rps:>10.1f}")
+    await close_async_postgrest()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--db-latency", type=float, default=0.02)
+    parser.add_argument("--rows", type=int, default=20)
+    args = parser.parse_args()
+
+    server = start_standin(build_postgrest_standin(args.db_latency, args.rows))
+    try:
+        asyncio.run(main(args))
+    finally:
+        server.should_exit = True
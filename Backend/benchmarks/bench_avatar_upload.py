@@ -0,0 +1,132 @@
+"""
+Memory held by concurrent avatar uploads, and the thumbnail work moved off them.
+
+--uploads clients post the same --megapixels JPEG at once to two routes that
+hand the image to a storage stand-in which reads what it is given in 1 MB
+chunks:
+- buffered: the old path, `await file.read()` and the whole image passed on
+- streamed: app.core.avatars.spool_avatar, then the spooled file passed on
+and the peak Python heap (tracemalloc) over the burst is reported for each.
+Then render_thumbnails builds the AVATAR_THUMBNAIL_SIZES variants of every
+upload on the thumbnailer's thread count, the work the streamed route leaves
+to the background.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_avatar_upload --uploads 8 --megapixels 12
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+import httpx
+from fastapi import FastAPI, File, UploadFile
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
+
+from app.core.avatars import render_thumbnails, spool_avatar
+from app.core.config import settings
+
+
+def store(file) -> int:
+    """Stands in for the storage upload: reads the body the way httpx sends it."""
+    if isinstance(file, bytes):
+        return len(file)
+    stored = 0
+    with open(file, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            stored += len(chunk)
+    return stored
+
+
+def build_api(spooled: list) -> FastAPI:
+    api = FastAPI()
+
+    @api.post("/buffered")
+    async def buffered_route(file: UploadFile = File(...)):
+        data = await file.read()
+        return {"stored": await run_in_threadpool(store, data)}
+
+    @api.post("/streamed")
+    async def streamed_route(file: UploadFile = File(...)):
+        path, _, _ = await run_in_threadpool(
+            spool_avatar, file.file, settings.AVATAR_MAX_BYTES
+        )
+        spooled.append(path)
+        return {"stored": await run_in_threadpool(store, path)}
+
+    return api
+
+
+def make_photo(megapixels: float) -> str:
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    noise = Image.effect_noise((width, height), 64).convert("RGB")
+    path = tempfile.NamedTemporaryFile(suffix=".jpg", delete=False).name
+    noise.save(path, format="JPEG", quality=92)
+    return path
+
+
+async def burst(api: FastAPI, route: str, photo: str, uploads: int):
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as c:
+        files = [open(photo, "rb") for _ in range(uploads)]
+        tracemalloc.start()
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(c.post(f"/{route}", files={"file": ("me.jpg", f)}) for f in files)
+        )
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        for f in files:
+            f.close()
+    for r in responses:
+        r.raise_for_status()
+    return peak, seconds
+
+
+async def main(args):
+    photo = make_photo(args.megapixels)
+    size_mb = os.path.getsize(photo) / 2**20
+    print(f"{args.uploads} uploads of a {args.megapixels} MP JPEG ({size_mb:.1f} MB)")
+    spooled = []
+    api = build_api(spooled)
+    print(f"{'route':<10}{'peak heap MB':>14}{'burst s':>10}")
+    for route in ("buffered", "streamed"):
+        peak, seconds = await burst(api, route, photo, args.uploads)
+        print(f"{route:<10}{peak / 2**20:>14.1f}{seconds:>10.2f}")
+
+    sizes = settings.AVATAR_THUMBNAIL_SIZES
+    start = time.perf_counter()
+    with ThreadPoolExecutor(settings.AVATAR_THUMBNAIL_WORKERS) as pool:
+        rendered = list(pool.map(lambda p: render_thumbnails(p, sizes), spooled))
+    seconds = time.perf_counter() - start
+    for size, data in rendered[0].items():
+        with Image.open(io.BytesIO(data)) as thumb:
+            assert max(thumb.size) == size, (size, thumb.size)
+    print(
+        f"thumbnails {sizes} for {len(spooled)} uploads on "
+        f"{settings.AVATAR_THUMBNAIL_WORKERS} threads: {seconds:.2f} s "
+        f"({sum(len(d) for d in rendered[0].values()) / 1024:.0f} KB each)"
+    )
+    for path in spooled + [photo]:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--megapixels", type=float, default=12)
+    args = parser.parse_args()
+    asyncio.run(main(args))
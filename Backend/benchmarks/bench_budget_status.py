@@ -0,0 +1,201 @@
+"""
+Payload size and latency of budget progress, client-side sums vs one grouped query.
+
+Seeds a local SQLite copy of the budgets/categories/transactions tables with a
+growing transaction history for one user and compares, per history size:
+- client: download every transaction of the user (what the app fetched from
+  /transactions/user/{user_id}) and sum this month's expenses per category
+- grouped: the `budget_status` query from sql/budget_status.sql, fed through
+  AsyncBudgetService.get_budget_status
+Both paths must report the same spent amount per budget, or the run fails.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_budget_status --history 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+# Settings are read at import time; the stand-in needs no Supabase
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from app.domain.budget import BudgetSpending
+from app.services.implementation.budget_service import (
+    AsyncBudgetService,
+    budget_period,
+)
+
+SCHEMA = """
+CREATE TABLE categories (category_id TEXT PRIMARY KEY, category_name TEXT);
+CREATE TABLE budgets (
+    budget_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    category_id TEXT,
+    allocated_amount REAL NOT NULL
+);
+CREATE TABLE transactions (
+    transaction_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    category_id TEXT,
+    description TEXT,
+    created_at TEXT,
+    amount REAL,
+    transaction_type TEXT
+);
+CREATE INDEX transactions_user_type_created_at_idx
+    ON transactions (user_id, transaction_type, created_at);
+CREATE INDEX budgets_user_id_idx ON budgets (user_id);
+"""
+
+# sql/budget_status.sql over raw transactions; created_at is UTC ISO-8601 text
+STATUS_QUERY = """
+WITH spending AS (
+    SELECT t.category_id, SUM(t.amount) AS spent
+    FROM transactions t
+    WHERE t.user_id = :user_id
+      AND t.transaction_type = 'Expense'
+      AND t.created_at >= :start
+      AND t.created_at < :end
+    GROUP BY t.category_id
+)
+SELECT b.budget_id, b.category_id, c.category_name, b.allocated_amount,
+       COALESCE(s.spent, 0) AS spent
+FROM budgets b
+LEFT JOIN categories c ON c.category_id = b.category_id
+LEFT JOIN spending s ON s.category_id = b.category_id
+WHERE b.user_id = :user_id
+ORDER BY c.category_name, b.budget_id
+"""
+
+CATEGORIES = [
+    "Education",
+    "Entertainment",
+    "Fashion",
+    "Food",
+    "Health",
+    "Transportation",
+]
+
+
+class SqliteBudgetRepository:
+    """Only the method AsyncBudgetService.get_budget_status needs."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    async def get_budget_spending(self, user_id, period_start, period_end):
+        rows = self.db.execute(
+            STATUS_QUERY,
+            {
+                "user_id": str(user_id),
+                "start": period_start.isoformat(),
+                "end": period_end.isoformat(),
+            },
+        )
+        self.payload = [dict(r) for r in rows]
+        return [BudgetSpending(**row) for row in self.payload]
+
+
+def seed(db: sqlite3.Connection, user_id: str, rows: int) -> None:
+    rng = random.Random(7)
+    categories = [(str(uuid4()), name) for name in CATEGORIES]
+    db.executemany("INSERT INTO categories VALUES (?, ?)", categories)
+    db.executemany(
+        "INSERT INTO budgets VALUES (?, ?, ?, ?)",
+        [(str(uuid4()), user_id, cid, 2000.0) for cid, _ in categories[:4]],
+    )
+    now = datetime.now(timezone.utc)
+    # Two years of history, up to and including this month
+    span = timedelta(days=730)
+    db.executemany(
+        "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                str(uuid4()),
+                user_id,
+                rng.choice(categories)[0],
+                "bench",
+                (now - span * rng.random()).isoformat(),
+                round(rng.uniform(5, 500), 2),
+                "Expense" if rng.random() < 0.9 else "Income",
+            )
+            for _ in range(rows)
+        ),
+    )
+    db.commit()
+
+
+def client_path(db: sqlite3.Connection, user_id: str):
+    """Previous behaviour: ship every transaction and sum on the device."""
+    rows = [
+        dict(r)
+        for r in db.execute("SELECT * FROM transactions WHERE user_id = ?", (user_id,))
+    ]
+    payload = json.dumps(rows)
+    start, end = budget_period(datetime.now(timezone.utc))
+    spent = defaultdict(float)
+    for tx in json.loads(payload):
+        created = datetime.fromisoformat(tx["created_at"])
+        if tx["transaction_type"] == "Expense" and start <= created < end:
+            spent[tx["category_id"]] += tx["amount"]
+    budgets = db.execute(
+        "SELECT category_id FROM budgets WHERE user_id = ?", (user_id,)
+    ).fetchall()
+    by_budget = {b["category_id"]: spent.get(b["category_id"], 0.0) for b in budgets}
+    return by_budget, len(payload)
+
+
+def grouped_path(service: AsyncBudgetService, user_id: str):
+    status = asyncio.run(service.get_budget_status(user_id))
+    payload = status.model_dump_json()
+    return {str(b.category_id): b.spent for b in status.budgets}, len(payload)
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--history", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'rows':>8}{'client KB':>12}{'client ms':>12}"
+        f"{'grouped KB':>12}{'grouped ms':>12}"
+    )
+    for history in args.history:
+        db = sqlite3.connect(":memory:")
+        db.row_factory = sqlite3.Row
+        db.executescript(SCHEMA)
+        user_id = str(uuid4())
+        seed(db, user_id, history)
+        service = AsyncBudgetService(SqliteBudgetRepository(db))
+
+        (client, client_bytes), client_ms = timed(
+            lambda: client_path(db, user_id), args.repeat
+        )
+        (grouped, grouped_bytes), grouped_ms = timed(
+            lambda: grouped_path(service, user_id), args.repeat
+        )
+        for category_id, spent in client.items():
+            assert abs(grouped[category_id] - spent) < 1e-6, (category_id, spent)
+        print(
+            f"{history:>8}{client_bytes / 1024:>12.1f}{client_ms:>12.2f}"
+            f"{grouped_bytes / 1024:>12.1f}{grouped_ms:>12.2f}"
+        )
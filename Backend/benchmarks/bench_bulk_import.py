@@ -0,0 +1,165 @@
+"""
+Rows/sec of the bulk CSV import vs one insert request per transaction.
+
+A small Starlette app stands in for PostgREST (same idea as
+bench_async_repositories): every request sleeps for --db-latency seconds and
+the stand-in counts the rows it receives. The import goes through the real
+POST /transactions/import route with a generated file in the Kaggle budget
+layout (date, category, amount), then polls the job until it finishes.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_bulk_import --rows 50000 --single-rows 500
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+STANDIN_HOST = "127.0.0.1"
+STANDIN_PORT = 54322
+
+# Settings are read at import time, so point them at the stand-in first.
+os.environ["SUPABASE_URL"] = f"http://{STANDIN_HOST}:{STANDIN_PORT}"
+os.environ["SUPABASE_KEY"] = "bench.bench.bench"
+os.environ.setdefault("API_KEY", "bench")
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from app.api.v1 import transactions
+from app.core.csv_import import KAGGLE_CATEGORY_MAP
+from app.core.supabase import close_async_postgrest
+from app.domain.transaction import Transaction, TransactionType
+
+CATEGORIES = sorted(set(KAGGLE_CATEGORY_MAP.values())) + ["Uncategorized"]
+
+
+def build_postgrest_standin(latency: float, counter: dict) -> Starlette:
+    categories = [
+        {"category_id": str(uuid4()), "category_name": name} for name in CATEGORIES
+    ]
+
+    async def table(request):
+        await asyncio.sleep(latency)
+        if request.method == "POST":
+            body = await request.json()
+            counter["rows"] += len(body) if isinstance(body, list) else 1
+            counter["requests"] += 1
+            return JSONResponse([] if isinstance(body, list) else [body], 201)
+        if request.path_params["table"] == "categories":
+            return JSONResponse(categories)
+        return Response(status_code=404)
+
+    return Starlette(
+        routes=[Route("/rest/v1/{table}", table, methods=["GET", "POST"])]
+    )
+
+
+def start_standin(app: Starlette) -> uvicorn.Server:
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=STANDIN_HOST, port=STANDIN_PORT, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def kaggle_csv(rows: int) -> bytes:
+    rng = random.Random(3)
+    subs = list(KAGGLE_CATEGORY_MAP)
+    start = datetime.now(timezone.utc) - timedelta(days=3 * 365)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["date", "category", "amount"])
+    for _ in range(rows):
+        when = start + timedelta(seconds=rng.randrange(3 * 365 * 86400))
+        writer.writerow(
+            [
+                when.strftime("%Y-%m-%d %H:%M:%S +0000"),
+                rng.choice(subs),
+                f"{rng.uniform(1, 300):.2f}",
+            ]
+        )
+    return out.getvalue().encode()
+
+
+async def single_inserts(rows: int) -> float:
+    """Baseline: one create_transaction request per row, as the API did."""
+    repo = transactions.transaction_repository
+    start = time.perf_counter()
+    for _ in range(rows):
+        await repo.create_transaction(
+            Transaction(
+                transaction_id=uuid4(),
+                user_id=uuid4(),
+                category_id=uuid4(),
+                description="bench",
+                created_at=datetime.now(timezone.utc),
+                amount=10.0,
+                transaction_type=TransactionType.EXPENSE,
+            )
+        )
+    return rows / (time.perf_counter() - start)
+
+
+async def bulk_import(rows: int) -> dict:
+    api = FastAPI()
+    api.include_router(transactions.router, prefix="/transactions")
+    payload = kaggle_csv(rows)
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        resp = await c.post(
+            "/transactions/import",
+            params={"user_id": str(uuid4())},
+            files={"file": ("budget_data.csv", payload, "text/csv")},
+        )
+        resp.raise_for_status()
+        job = resp.json()
+        while job["status"] == "running":
+            await asyncio.sleep(0.05)
+            job = (await c.get(f"/transactions/import/{job['job_id']}")).json()
+    job["file_mb"] = len(payload) / 1e6
+    return job
+
+
+async def main(args, counter: dict):
+    single_rps = await single_inserts(args.single_rows)
+    counter.update(rows=0, requests=0)
+    job = await bulk_import(args.rows)
+    await close_async_postgrest()
+
+    print(f"single inserts : {single_rps:>10.1f} rows/s ({args.single_rows} rows)")
+    print(
+        f"bulk import    : {job['rows_per_second']:>10.1f} rows/s "
+        f"({job['rows_inserted']} rows, {job['file_mb']:.1f} MB, "
+        f"{counter['requests']} insert requests, status {job['status']})"
+    )
+    if job["status"] != "completed" or counter["rows"] != job["rows_inserted"]:
+        raise SystemExit(f"Import did not complete cleanly: {job}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--single-rows", type=int, default=500)
+    parser.add_argument("--db-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    counter = {"rows": 0, "requests": 0}
+    server = start_standin(build_postgrest_standin(args.db_latency, counter))
+    try:
+        asyncio.run(main(args, counter))
+    finally:
+        server.should_exit = True
@@ -0,0 +1,244 @@
+"""
+Correctness and read cost of the incrementally maintained monthly ledger totals.
+
+Runs the repository write path against a local SQLite copy of `transactions`
+and `ledger_monthly_totals`: every create, edit and delete sends the deltas
+from app.core.ledger.ledger_deltas, applied with the same upsert as
+sql/ledger_monthly_totals.sql. After a random mix of writes, the ledger is
+reconciled against a full rebuild from raw rows and the run fails on any
+drift. Then, per history size, it compares the cost of reading one month's
+per-category expense totals:
+- raw: GROUP BY over the user's transactions of that month (indexed)
+- ledger: read the month's rows from ledger_monthly_totals
+
+Run from the Backend folder:
+    python -m benchmarks.bench_ledger_totals --history 1000 10000 100000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+# Settings are read at import time; the stand-in needs no Supabase
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+from app.core.ledger import ledger_deltas, ledger_month
+
+SCHEMA = """
+CREATE TABLE transactions (
+    transaction_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    category_id TEXT,
+    description TEXT,
+    created_at TEXT,
+    amount REAL,
+    transaction_type TEXT
+);
+CREATE INDEX transactions_user_type_created_at_idx
+    ON transactions (user_id, transaction_type, created_at);
+CREATE TABLE ledger_monthly_totals (
+    user_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    category_id TEXT NOT NULL,
+    transaction_type TEXT NOT NULL,
+    total REAL NOT NULL DEFAULT 0,
+    tx_count INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (user_id, month, category_id, transaction_type)
+);
+"""
+
+APPLY = """
+INSERT INTO ledger_monthly_totals
+    (user_id, month, category_id, transaction_type, total, tx_count)
+VALUES (:user_id, :month, :category_id, :transaction_type, :amount, :tx_count)
+ON CONFLICT (user_id, month, category_id, transaction_type) DO UPDATE
+    SET total = total + excluded.total, tx_count = tx_count + excluded.tx_count
+"""
+
+REBUILD = """
+SELECT user_id, strftime('%Y-%m-01', created_at) AS month, category_id,
+       transaction_type, SUM(amount) AS total, COUNT(*) AS tx_count
+FROM transactions
+GROUP BY 1, 2, 3, 4
+"""
+
+RAW_MONTH = """
+SELECT category_id, SUM(amount) AS total
+FROM transactions
+WHERE user_id = :user_id AND transaction_type = 'Expense'
+  AND created_at >= :start AND created_at < :end
+GROUP BY category_id
+"""
+
+LEDGER_MONTH = """
+SELECT category_id, total
+FROM ledger_monthly_totals
+WHERE user_id = :user_id AND transaction_type = 'Expense' AND month = :month
+"""
+
+COLUMNS = "user_id, category_id, created_at, amount, transaction_type"
+
+
+class SqliteLedger:
+    """The three repository writes, each followed by its ledger deltas."""
+
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def _apply(self, deltas) -> None:
+        if deltas:
+            self.db.executemany(APPLY, deltas)
+            self.db.execute("DELETE FROM ledger_monthly_totals WHERE tx_count <= 0")
+
+    def _row(self, transaction_id: str):
+        return [
+            dict(r)
+            for r in self.db.execute(
+                f"SELECT {COLUMNS} FROM transactions WHERE transaction_id = ?",
+                (transaction_id,),
+            )
+        ]
+
+    def create(self, rows) -> None:
+        self.db.executemany(
+            "INSERT INTO transactions VALUES (:transaction_id, :user_id, "
+            ":category_id, :description, :created_at, :amount, :transaction_type)",
+            rows,
+        )
+        self._apply(ledger_deltas(added=rows))
+
+    def update(self, transaction_id: str, changes: dict) -> None:
+        before = self._row(transaction_id)
+        sets = ", ".join(f"{column} = :{column}" for column in changes)
+        self.db.execute(
+            f"UPDATE transactions SET {sets} WHERE transaction_id = :transaction_id",
+            {**changes, "transaction_id": transaction_id},
+        )
+        self._apply(ledger_deltas(added=self._row(transaction_id), removed=before))
+
+    def delete(self, transaction_id: str) -> None:
+        before = self._row(transaction_id)
+        self.db.execute(
+            "DELETE FROM transactions WHERE transaction_id = ?", (transaction_id,)
+        )
+        self._apply(ledger_deltas(removed=before))
+
+    def drift(self) -> int:
+        expected = {
+            tuple(r)[:4]: (r["total"], r["tx_count"]) for r in self.db.execute(REBUILD)
+        }
+        actual = {
+            tuple(r)[:4]: (r["total"], r["tx_count"])
+            for r in self.db.execute(
+                "SELECT user_id, month, category_id, transaction_type, total, "
+                "tx_count FROM ledger_monthly_totals"
+            )
+        }
+        return sum(
+            1
+            for key in expected.keys() | actual.keys()
+            if key not in expected
+            or key not in actual
+            or expected[key][1] != actual[key][1]
+            or abs(expected[key][0] - actual[key][0]) > 0.005
+        )
+
+
+def random_row(rng: random.Random, user_id: str, categories, now: datetime) -> dict:
+    return {
+        "transaction_id": str(uuid4()),
+        "user_id": user_id,
+        "category_id": rng.choice(categories),
+        "description": "bench",
+        "created_at": (now - timedelta(days=730) * rng.random()).isoformat(),
+        "amount": round(rng.uniform(5, 500), 2),
+        "transaction_type": "Expense" if rng.random() < 0.9 else "Income",
+    }
+
+
+def check_writes(writes: int) -> int:
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    ledger = SqliteLedger()
+    users = [str(uuid4()) for _ in range(3)]
+    categories = [str(uuid4()) for _ in range(6)]
+    live = []
+    for _ in range(writes):
+        op = rng.random()
+        if op < 0.6 or not live:
+            row = random_row(rng, rng.choice(users), categories, now)
+            ledger.create([row])
+            live.append(row["transaction_id"])
+        elif op < 0.85:
+            other = random_row(rng, "", categories, now)
+            field = rng.choice(
+                [
+                    "amount",
+                    "category_id",
+                    "transaction_type",
+                    "created_at",
+                    "description",
+                ]
+            )
+            ledger.update(rng.choice(live), {field: other[field]})
+        else:
+            ledger.delete(live.pop(rng.randrange(len(live))))
+    return ledger.drift()
+
+
+def timed(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--history", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--writes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    drift = check_writes(args.writes)
+    print(f"{args.writes} random creates/edits/deletes: {drift} drifted keys")
+    assert drift == 0
+
+    print(f"{'rows':>8}{'raw ms':>10}{'ledger ms':>12}")
+    for history in args.history:
+        rng = random.Random(7)
+        now = datetime.now(timezone.utc)
+        ledger = SqliteLedger()
+        user_id = str(uuid4())
+        categories = [str(uuid4()) for _ in range(6)]
+        ledger.create(
+            [random_row(rng, user_id, categories, now) for _ in range(history)]
+        )
+
+        start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        end = (start + timedelta(days=32)).replace(day=1)
+        params = {
+            "user_id": user_id,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "month": ledger_month(now),
+        }
+        raw, raw_ms = timed(
+            lambda: dict(ledger.db.execute(RAW_MONTH, params).fetchall()), args.repeat
+        )
+        totals, ledger_ms = timed(
+            lambda: dict(ledger.db.execute(LEDGER_MONTH, params).fetchall()),
+            args.repeat,
+        )
+        for category_id, total in raw.items():
+            assert abs(totals[category_id] - total) < 1e-6, (category_id, total)
+        print(f"{history:>8}{raw_ms:>10.3f}{ledger_ms:>12.3f}")
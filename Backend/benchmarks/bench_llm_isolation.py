@@ -0,0 +1,129 @@
+"""
+Latency of a plain CRUD route while LLM extraction requests are in flight.
+
+The Fireworks LLM is replaced by a stand-in whose calls take --llm-latency
+seconds (a blocking sleep for `invoke`, an async sleep for `ainvoke`), so the
+numbers measure our own stack. --llm-requests extraction requests run
+against either the old path (blocking `process_transaction_with_llm` in the
+request threadpool) or the LLM gateway (`aprocess_transaction_with_llm`),
+while a sync CRUD route is polled and its p50/p99 latency recorded.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_llm_isolation --llm-requests 200 --llm-latency 2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+os.environ.setdefault("API_KEY", "bench")
+
+import httpx
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from app.core import Add_Trans
+from app.core.llm_gateway import llm_gateway
+
+RESPONSE = """MESSAGE: 1
+CREATED_AT: 2024-01-29T00:00:00Z
+AMOUNT: 150
+TYPE: Expense
+CATEGORY: Food
+DESCRIPTION: dinner
+FEEDBACK: Enjoy your meal.
+"""
+
+
+class StandinLLM:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def invoke(self, prompt):
+        time.sleep(self.latency)
+        return RESPONSE
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency)
+        return RESPONSE
+
+
+def build_api() -> FastAPI:
+    api = FastAPI()
+
+    @api.post("/threadpool")
+    async def threadpool_route():
+        raw = await run_in_threadpool(
+            Add_Trans.process_transaction_with_llm, "Had dinner for 150 last night"
+        )
+        return Add_Trans.parse_llm_response(raw)
+
+    @api.post("/gateway")
+    async def gateway_route():
+        raw = await Add_Trans.aprocess_transaction_with_llm(
+            "Had dinner for 150 last night"
+        )
+        return Add_Trans.parse_llm_response(raw)
+
+    @api.get("/crud")
+    def crud_route():
+        # A sync handler, like any route still served from the threadpool
+        time.sleep(0.002)
+        return {"ok": True}
+
+    return api
+
+
+async def run(api: FastAPI, path: str, args) -> dict:
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as c:
+        llm_calls = [
+            asyncio.create_task(c.post(f"/{path}")) for _ in range(args.llm_requests)
+        ]
+        await asyncio.sleep(0.1)
+
+        latencies = []
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.duration:
+            t0 = time.perf_counter()
+            (await c.get("/crud")).raise_for_status()
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(0.01)
+        llm_statuses = [r.status_code for r in await asyncio.gather(*llm_calls)]
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "crud_requests": len(latencies),
+        "llm_ok": llm_statuses.count(200),
+    }
+
+
+async def main(args):
+    Add_Trans.llm = StandinLLM(args.llm_latency)
+    api = build_api()
+    print(f"{'path':<12}{'crud p50 ms':>12}{'crud p99 ms':>12}{'crud reqs':>10}")
+    for path in ("threadpool", "gateway"):
+        result = await run(api, path, args)
+        print(
+            f"{path:<12}{result['p50_ms']:>12.1f}{result['p99_ms']:>12.1f}"
+            f"{result['crud_requests']:>10}  "
+            f"({result['llm_ok']}/{args.llm_requests} LLM requests ok)"
+        )
+    print(f"gateway: {llm_gateway.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--llm-requests", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(main(args))
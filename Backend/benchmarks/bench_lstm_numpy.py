@@ -0,0 +1,132 @@
+"""
+Parity, latency and memory of the NumPy LSTM against Keras.
+
+Each backend runs in its own subprocess so its import cost and peak RSS are
+measured in isolation. Both get the same seeded inputs; the run fails if any
+prediction differs by more than --rtol (relative) / --atol (absolute).
+
+Run from the Backend folder (the Keras side needs TensorFlow installed):
+    python -m benchmarks.bench_lstm_numpy --batch-sizes 1 8 64 --repeats 200
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.path.join(BACKEND_DIR, "app", "core", "TimeSeries")
+
+
+def sample_inputs(n: int) -> np.ndarray:
+    # Monthly category totals in the range the app actually sees
+    rng = np.random.default_rng(42)
+    return rng.uniform(0, 2500, size=(n, 3, 7))
+
+
+def run_worker(backend: str, batch_sizes, repeats: int, n_parity: int) -> dict:
+    start = time.perf_counter()
+    if backend == "keras":
+        import joblib
+        from tensorflow.keras.models import load_model
+
+        model = load_model(os.path.join(MODEL_DIR, "lstm.h5"))
+        scaler = joblib.load(os.path.join(MODEL_DIR, "scaler.save"))
+
+        def predict(x):
+            return model.predict(x, verbose=0)
+
+    else:
+        from app.core.lstm_numpy import load_npz
+
+        model, scaler = load_npz(os.path.join(MODEL_DIR, "lstm.npz"))
+        predict = model.predict
+    load_seconds = time.perf_counter() - start
+
+    raw = sample_inputs(n_parity)
+    scaled = scaler.transform(raw.reshape(-1, 7)).reshape(raw.shape)
+    predictions = np.asarray(predict(scaled)).ravel().tolist()
+
+    latency_ms = {}
+    for size in batch_sizes:
+        batch = np.resize(scaled, (size, 3, 7))
+        predict(batch)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            predict(batch)
+        latency_ms[size] = (time.perf_counter() - start) / repeats * 1000
+
+    return {
+        "load_seconds": load_seconds,
+        "latency_ms": latency_ms,
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "predictions": predictions,
+    }
+
+
+def spawn(backend: str, args) -> dict:
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_lstm_numpy",
+        "--worker",
+        backend,
+        "--repeats",
+        str(args.repeats),
+        "--parity-samples",
+        str(args.parity_samples),
+        "--batch-sizes",
+        *map(str, args.batch_sizes),
+    ]
+    proc = subprocess.run(cmd, cwd=BACKEND_DIR, capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit(f"{backend} worker failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--worker", choices=["keras", "numpy"])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--parity-samples", type=int, default=512)
+    parser.add_argument("--rtol", type=float, default=1e-4)
+    parser.add_argument("--atol", type=float, default=1e-2)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(
+            args.worker, args.batch_sizes, args.repeats, args.parity_samples
+        )
+        print(json.dumps(result))
+        return
+
+    results = {backend: spawn(backend, args) for backend in ("keras", "numpy")}
+
+    keras_pred = np.array(results["keras"]["predictions"])
+    numpy_pred = np.array(results["numpy"]["predictions"])
+    max_abs = float(np.max(np.abs(keras_pred - numpy_pred)))
+    ok = np.allclose(numpy_pred, keras_pred, rtol=args.rtol, atol=args.atol)
+    print(f"parity over {len(keras_pred)} inputs: max |diff| = {max_abs:.6f}")
+
+    print(f"\n{'':<22}{'keras':>12}{'numpy':>12}")
+    for key, label in (("load_seconds", "load (s)"), ("peak_rss_mb", "peak RSS (MB)")):
+        k, n = results["keras"][key], results["numpy"][key]
+        print(f"{label:<22}{k:>12.2f}{n:>12.2f}")
+    for size in args.batch_sizes:
+        k = results["keras"]["latency_ms"][str(size)]
+        n = results["numpy"]["latency_ms"][str(size)]
+        print(f"{f'predict batch={size} (ms)':<22}{k:>12.3f}{n:>12.3f}")
+
+    if not ok:
+        sys.exit(f"\nParity check FAILED (rtol={args.rtol}, atol={args.atol})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Payload size and latency of the forecast input, raw rows vs database aggregation.
+
+Seeds the SQLite stand-in of `monthly_category_expenses` with a growing
+expense history for one user and compares, per history size:
+- raw: select every expense row, serialise it, aggregate with pandas
+  (what the forecast did before)
+- rpc: run the monthly aggregation in the database and pivot the result
+Both paths must produce the same 3-month feature window, or the run fails.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_monthly_aggregation --history 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+# Settings are read at import time; the stand-in needs no Supabase
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.infrastructure.implementation.monthly_expense_source import (
+    SqliteMonthlyExpenseSource,
+)
+from app.infrastructure.implementation.time_series_repository import (
+    AsyncTimeSeriesRepository,
+    EXPECTED_CATEGORIES,
+    HISTORY_MONTHS,
+)
+
+
+def seed(
+    source: SqliteMonthlyExpenseSource, user_id: str, rows: int, years: int
+) -> None:
+    categories = [
+        {"category_id": str(uuid4()), "category_name": name}
+        for name in EXPECTED_CATEGORIES + ["Salary", "Uncategorized"]
+    ]
+    source.insert_categories(categories)
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    # Spread the history over the past years, up to and including this month
+    span = timedelta(days=365 * years)
+    source.insert_transactions(
+        {
+            "transaction_id": str(uuid4()),
+            "user_id": user_id,
+            "category_id": rng.choice(categories)["category_id"],
+            "created_at": (now - span * rng.random()).isoformat(),
+            "amount": round(rng.uniform(5, 500), 2),
+            "transaction_type": "Expense" if rng.random() < 0.9 else "Income",
+        }
+        for _ in range(rows)
+    )
+
+
+def raw_path(source: SqliteMonthlyExpenseSource, user_id: str):
+    """Previous behaviour: ship every expense row and aggregate in pandas."""
+    with source._lock:
+        rows = [
+            dict(r)
+            for r in source._db.execute(
+                "SELECT category_id, amount, created_at FROM transactions "
+                "WHERE user_id = ? AND transaction_type = 'Expense' "
+                "ORDER BY created_at",
+                (user_id,),
+            )
+        ]
+        cat_map = [
+            dict(r)
+            for r in source._db.execute(
+                "SELECT category_id, category_name FROM categories"
+            )
+        ]
+    rows_payload, cat_payload = json.dumps(rows), json.dumps(cat_map)
+
+    df = pd.DataFrame(json.loads(rows_payload))
+    df["created_at"] = (
+        pd.to_datetime(df["created_at"], utc=True)
+        .dt.tz_localize(None)
+        .dt.to_period("M")
+        .dt.to_timestamp()
+    )
+    cat_df = pd.DataFrame(json.loads(cat_payload))
+    df = df.merge(cat_df, on="category_id", how="left").dropna(
+        subset=["category_name"]
+    )
+    grouped = (
+        df.groupby(["created_at", "category_name"])["amount"]
+        .sum()
+        .unstack(fill_value=0)
+        .sort_index()
+    )
+    X = pd.DataFrame(index=grouped.index)
+    for col in EXPECTED_CATEGORIES:
+        X[col] = grouped.get(col, 0)
+    this_month = pd.Timestamp(datetime.now(timezone.utc).date()).to_period("M")
+    X = X[X.index.to_period("M") < this_month]
+    return X.tail(HISTORY_MONTHS), len(rows_payload) + len(cat_payload)
+
+
+def rpc_path(source: SqliteMonthlyExpenseSource, user_id: str, repo):
+    rows = asyncio.run(
+        source.monthly_category_expenses(
+            [user_id], HISTORY_MONTHS, settings.FORECAST_LOOKBACK_MONTHS
+        )
+    )
+    payload = json.dumps(rows)
+    last3, _ = repo._prepare_features(pd.DataFrame(json.loads(payload)))
+    return last3[EXPECTED_CATEGORIES], len(payload)
+
+
+def timed(fn, repeats: int):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--history", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    repo = AsyncTimeSeriesRepository()
+    print(
+        f"{'rows':>8}{'raw bytes':>12}{'rpc bytes':>12}"
+        f"{'raw ms':>10}{'rpc ms':>10}"
+    )
+    for size in args.history:
+        source = SqliteMonthlyExpenseSource()
+        user_id = str(uuid4())
+        seed(source, user_id, size, args.years)
+
+        (raw_x, raw_bytes), raw_ms = timed(
+            lambda: raw_path(source, user_id), args.repeats
+        )
+        (rpc_x, rpc_bytes), rpc_ms = timed(
+            lambda: rpc_path(source, user_id, repo), args.repeats
+        )
+        same_months = list(raw_x.index) == list(rpc_x.index)
+        if not same_months or not np.allclose(raw_x.to_numpy(), rpc_x.to_numpy()):
+            raise SystemExit(f"Feature mismatch at {size} rows")
+        print(
+            f"{size:>8}{raw_bytes:>12}{rpc_bytes:>12}"
+            f"{raw_ms:>10.2f}{rpc_ms:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
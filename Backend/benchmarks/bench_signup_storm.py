@@ -0,0 +1,118 @@
+"""
+Latency of a plain CRUD route during a signup storm.
+
+--signups concurrent signups hash their password at --rounds bcrypt cost,
+either the old way (passlib in the request threadpool) or on the password
+hasher's process pool, while a sync CRUD route is polled and its p50/p99
+latency recorded. Signups the hasher turns away (HTTP 503) are counted.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_signup_storm --signups 100 --rounds 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.core.password_hasher import PasswordHasherBusy, password_hasher
+
+
+def build_api(rounds: int) -> FastAPI:
+    api = FastAPI()
+    pwd_context = CryptContext(
+        schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds
+    )
+
+    @api.post("/threadpool")
+    async def threadpool_route():
+        return {"hash": await run_in_threadpool(pwd_context.hash, "s3cret-pass")}
+
+    @api.post("/pool")
+    async def pool_route():
+        try:
+            return {"hash": await password_hasher.hash("s3cret-pass")}
+        except PasswordHasherBusy as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+    @api.get("/crud")
+    def crud_route():
+        # A sync handler, like any route still served from the threadpool
+        time.sleep(0.002)
+        return {"ok": True}
+
+    return api
+
+
+async def run(api: FastAPI, path: str, args) -> dict:
+    transport = httpx.ASGITransport(app=api)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as c:
+        storm_start = time.perf_counter()
+        signups = [
+            asyncio.create_task(c.post(f"/{path}")) for _ in range(args.signups)
+        ]
+        await asyncio.sleep(0.05)
+
+        latencies = []
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.duration:
+            t0 = time.perf_counter()
+            (await c.get("/crud")).raise_for_status()
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(0.01)
+        statuses = [r.status_code for r in await asyncio.gather(*signups)]
+        storm_seconds = time.perf_counter() - storm_start
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+        "crud_requests": len(latencies),
+        "signups_ok": statuses.count(200),
+        "signups_busy": statuses.count(503),
+        "storm_s": storm_seconds,
+    }
+
+
+async def main(args):
+    password_hasher.rounds = args.rounds
+    password_hasher.max_pending = args.max_pending
+    # Spawn the pool processes before the clock starts
+    await password_hasher.hash("warm-up")
+    api = build_api(args.rounds)
+    print(
+        f"{'path':<12}{'crud p50 ms':>12}{'crud p99 ms':>12}{'crud reqs':>10}"
+        f"{'ok':>6}{'503':>6}{'storm s':>9}"
+    )
+    for path in ("threadpool", "pool"):
+        r = await run(api, path, args)
+        print(
+            f"{path:<12}{r['p50_ms']:>12.1f}{r['p99_ms']:>12.1f}"
+            f"{r['crud_requests']:>10}{r['signups_ok']:>6}{r['signups_busy']:>6}"
+            f"{r['storm_s']:>9.1f}"
+        )
+    print(f"hasher: {password_hasher.stats()}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--signups", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument(
+        "--max-pending", type=int, default=password_hasher.max_pending
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args))
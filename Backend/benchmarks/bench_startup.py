@@ -0,0 +1,73 @@
+"""
+Startup cost of `import app.main`, measured with `python -X importtime`.
+
+Prints the wall time of the import and the slowest top-level packages by
+cumulative import time, so regressions (e.g. TensorFlow or LangChain being
+pulled in at startup again) show up immediately.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_startup --runs 3 --top 15
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once():
+    env = dict(os.environ)
+    # Importing must not need real credentials or network access
+    env.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+    env.setdefault("SUPABASE_KEY", "bench.bench.bench")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+
+    # Cumulative time of top-level packages (lines with no nesting indent)
+    per_package = defaultdict(int)
+    for match in LINE.finditer(proc.stderr):
+        _, cumulative, indent, module = match.groups()
+        if len(indent) == 1:
+            per_package[module.split(".")[0]] += int(cumulative)
+    return wall, per_package
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    walls, last = [], {}
+    for _ in range(args.runs):
+        wall, last = run_once()
+        walls.append(wall)
+
+    median = statistics.median(walls)
+    print(f"import app.main: median {median:.2f}s over {args.runs} runs")
+    print(f"{'package':<30}{'cumulative ms':>15}")
+    for module, micros in sorted(last.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"{module:<30}{micros / 1000:>15.1f}")
+    heavy = [m for m in ("tensorflow", "keras", "langchain", "faiss") if m in last]
+    if heavy:
+        print(f"\nWARNING: imported at startup: {', '.join(heavy)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Memory and latency of one FAISS store per user vs the shared transaction index.
+
+Embeddings are random vectors of --dim floats, so the numbers measure the
+index layouts and not the embedding provider. Each layout is built in a fresh
+process and measured by the growth of its resident set size; search latency
+is a per-user top-3 query, averaged over --queries random users.
+
+Run from the Backend folder:
+    python -m benchmarks.bench_transaction_index --users 2000 --per-user 50
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from typing import List
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench.bench.bench")
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+class RandomEmbeddings(Embeddings):
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.rng = np.random.default_rng(0)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.rng.standard_normal((len(texts), self.dim), dtype=np.float32)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def user_rows(user: int, per_user: int) -> List[dict]:
+    return [
+        {
+            "transaction_id": f"{user}-{i}",
+            "created_at": f"2026-01-01T00:00:{i % 60:02d}",
+            "transaction_type": "Expense",
+            "amount": i,
+            "category_id": "food",
+            "description": "bench",
+        }
+        for i in range(per_user)
+    ]
+
+
+def build(layout: str, args) -> dict:
+    from langchain_community.vectorstores import FAISS
+
+    from app.core.transaction_index import (
+        SharedTransactionIndex,
+        transaction_document,
+    )
+
+    embeddings = RandomEmbeddings(args.dim)
+    before = rss_mb()
+    start = time.perf_counter()
+    if layout == "per-user":
+        stores = {}
+        for user in range(args.users):
+            rows = user_rows(user, args.per_user)
+            docs = [transaction_document(tx, str(user)) for tx in rows]
+            texts = [doc.page_content for doc in docs]
+            stores[str(user)] = FAISS.from_embeddings(
+                list(zip(texts, embeddings.embed_documents(texts))),
+                embeddings,
+                metadatas=[doc.metadata for doc in docs],
+            )
+
+        def search(user: str):
+            return stores[user].similarity_search("bench", k=3)
+
+    else:
+        index = SharedTransactionIndex(embeddings, tempfile.mkdtemp())
+        for user in range(args.users):
+            index.sync(str(user), user_rows(user, args.per_user))
+
+        def search(user: str):
+            return index.search(user, "bench", 3)
+
+    build_seconds = time.perf_counter() - start
+    grown = rss_mb() - before
+
+    users = [str(random.randrange(args.users)) for _ in range(args.queries)]
+    start = time.perf_counter()
+    for user in users:
+        assert len(search(user)) == 3
+    search_ms = (time.perf_counter() - start) / len(users) * 1000
+    return {"rss_mb": grown, "build_s": build_seconds, "search_ms": search_ms}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--per-user", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    vectors = args.users * args.per_user
+    print(
+        f"{args.users} users x {args.per_user} transactions = {vectors} vectors, "
+        f"raw float32 size {vectors * args.dim * 4 / 1e6:.1f} MB"
+    )
+    print(f"{'layout':<10}{'RSS MB':>10}{'build s':>10}{'search ms':>12}")
+    ctx = multiprocessing.get_context("spawn")
+    for layout in ("per-user", "shared"):
+        with ctx.Pool(1) as pool:
+            result = pool.apply(build, (layout, args))
+        print(
+            f"{layout:<10}{result['rss_mb']:>10.1f}{result['build_s']:>10.2f}"
+            f"{result['search_ms']:>12.3f}"
+        )
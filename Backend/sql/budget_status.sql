@@ -0,0 +1,50 @@
+-- Budget-vs-actual for one user and one budget period.
+--
+-- Returns one row per budget of p_user_id with the user's expenses in that
+-- budget's category between p_period_start (inclusive) and p_period_end
+-- (exclusive). Both must be UTC month boundaries. Spending is read from
+-- ledger_monthly_totals (see ledger_monthly_totals.sql), so the cost follows
+-- the number of months and categories in the period, not the number of
+-- transactions.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+CREATE INDEX IF NOT EXISTS budgets_user_id_idx
+  ON public.budgets (user_id);
+
+CREATE OR REPLACE FUNCTION public.budget_status(
+  p_user_id uuid,
+  p_period_start timestamptz,
+  p_period_end timestamptz
+)
+RETURNS TABLE (
+  budget_id uuid,
+  category_id uuid,
+  category_name text,
+  allocated_amount double precision,
+  spent double precision
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH spending AS (
+    SELECT l.category_id, sum(l.total) AS spent
+    FROM public.ledger_monthly_totals l
+    WHERE l.user_id = p_user_id
+      AND l.transaction_type = 'Expense'
+      AND l.month >= (p_period_start AT TIME ZONE 'UTC')::date
+      AND l.month < (p_period_end AT TIME ZONE 'UTC')::date
+    GROUP BY l.category_id
+  )
+  SELECT
+    b.budget_id,
+    b.category_id,
+    c.category_name::text AS category_name,
+    b.allocated_amount,
+    coalesce(s.spent, 0) AS spent
+  FROM public.budgets b
+  LEFT JOIN public.categories c ON c.category_id = b.category_id
+  LEFT JOIN spending s ON s.category_id = b.category_id
+  WHERE b.user_id = p_user_id
+  ORDER BY c.category_name, b.budget_id;
+$$;
@@ -0,0 +1,150 @@
+-- Per-user monthly ledger totals, kept up to date by the transaction writes.
+--
+-- ledger_monthly_totals holds one row per (user, UTC month, category, type)
+-- with the summed amount and the number of transactions. The repositories in
+-- app/infrastructure/implementation/transaction_repository.py send signed
+-- deltas after every write (+row on create, -old +new on edit, -row on
+-- delete) and apply_ledger_deltas adds them atomically. Totals can then be
+-- read in O(months x categories) instead of scanning transactions.
+--
+-- reconcile_ledger_totals recomputes the totals from transactions, returns
+-- every key that drifted and, with p_fix, rewrites those keys. It runs at
+-- startup and then periodically from app/core/ledger.py. The last statement
+-- of this file runs it once, which backfills the totals of every existing
+-- transaction.
+--
+-- Apply with the Supabase SQL editor or `psql -f`, before budget_status.sql
+-- and monthly_category_expenses.sql, which read from this table.
+
+CREATE TABLE IF NOT EXISTS public.ledger_monthly_totals (
+  user_id uuid NOT NULL,
+  month date,
+  category_id uuid,
+  transaction_type text,
+  total double precision NOT NULL DEFAULT 0,
+  tx_count integer NOT NULL DEFAULT 0,
+  CONSTRAINT ledger_monthly_totals_key
+    UNIQUE NULLS NOT DISTINCT (user_id, month, category_id, transaction_type),
+  CONSTRAINT ledger_monthly_totals_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES public.users(user_id) ON DELETE CASCADE
+);
+
+-- p_deltas: [{user_id, month, category_id, transaction_type, amount, tx_count}]
+CREATE OR REPLACE FUNCTION public.apply_ledger_deltas(p_deltas jsonb)
+RETURNS void
+LANGUAGE sql
+VOLATILE
+AS $$
+  INSERT INTO public.ledger_monthly_totals AS l
+    (user_id, month, category_id, transaction_type, total, tx_count)
+  SELECT
+    d.user_id, d.month, d.category_id, d.transaction_type,
+    sum(d.amount), sum(d.tx_count)
+  FROM jsonb_to_recordset(p_deltas) AS d(
+    user_id uuid,
+    month date,
+    category_id uuid,
+    transaction_type text,
+    amount double precision,
+    tx_count integer
+  )
+  GROUP BY 1, 2, 3, 4
+  ON CONFLICT ON CONSTRAINT ledger_monthly_totals_key DO UPDATE
+    SET total = l.total + excluded.total,
+        tx_count = l.tx_count + excluded.tx_count;
+
+  -- Keys whose last transaction moved away or was deleted
+  DELETE FROM public.ledger_monthly_totals l
+  WHERE l.tx_count <= 0
+    AND l.user_id IN (
+      SELECT (d ->> 'user_id')::uuid FROM jsonb_array_elements(p_deltas) d
+    );
+$$;
+
+-- Writes that land while a pass runs can be reported as drift, and a fix can
+-- then miss them; the next pass settles them. Concurrent passes (one per
+-- worker) skip while another holds the lock.
+CREATE OR REPLACE FUNCTION public.reconcile_ledger_totals(
+  p_user_id uuid DEFAULT NULL,
+  p_fix boolean DEFAULT true
+)
+RETURNS TABLE (
+  user_id uuid,
+  month date,
+  category_id uuid,
+  transaction_type text,
+  ledger_total double precision,
+  actual_total double precision,
+  ledger_count integer,
+  actual_count integer
+)
+LANGUAGE plpgsql
+VOLATILE
+AS $$
+#variable_conflict use_column
+BEGIN
+  IF NOT pg_try_advisory_xact_lock(hashtext('reconcile_ledger_totals')) THEN
+    RETURN;
+  END IF;
+
+  DROP TABLE IF EXISTS ledger_drift;
+  -- UNION ALL + GROUP BY rather than a FULL JOIN, so NULL keys still match
+  CREATE TEMP TABLE ledger_drift ON COMMIT DROP AS
+  SELECT *
+  FROM (
+    SELECT
+      u.user_id, u.month, u.category_id, u.transaction_type,
+      sum(u.total) FILTER (WHERE u.src = 'ledger') AS ledger_total,
+      sum(u.total) FILTER (WHERE u.src = 'actual') AS actual_total,
+      coalesce(sum(u.n) FILTER (WHERE u.src = 'ledger'), 0)::integer
+        AS ledger_count,
+      coalesce(sum(u.n) FILTER (WHERE u.src = 'actual'), 0)::integer
+        AS actual_count
+    FROM (
+      SELECT
+        'actual' AS src,
+        t.user_id,
+        date_trunc('month', t.created_at AT TIME ZONE 'UTC')::date AS month,
+        t.category_id,
+        t.transaction_type,
+        t.amount AS total,
+        1 AS n
+      FROM public.transactions t
+      WHERE p_user_id IS NULL OR t.user_id = p_user_id
+      UNION ALL
+      SELECT
+        'ledger', l.user_id, l.month, l.category_id, l.transaction_type,
+        l.total, l.tx_count
+      FROM public.ledger_monthly_totals l
+      WHERE p_user_id IS NULL OR l.user_id = p_user_id
+    ) u
+    GROUP BY 1, 2, 3, 4
+  ) diff
+  WHERE diff.ledger_count <> diff.actual_count
+     OR abs(coalesce(diff.ledger_total, 0) - coalesce(diff.actual_total, 0))
+        > 0.005;
+
+  IF p_fix THEN
+    DELETE FROM public.ledger_monthly_totals l
+    USING ledger_drift d
+    WHERE l.user_id = d.user_id
+      AND l.month IS NOT DISTINCT FROM d.month
+      AND l.category_id IS NOT DISTINCT FROM d.category_id
+      AND l.transaction_type IS NOT DISTINCT FROM d.transaction_type;
+
+    INSERT INTO public.ledger_monthly_totals
+      (user_id, month, category_id, transaction_type, total, tx_count)
+    SELECT
+      d.user_id, d.month, d.category_id, d.transaction_type,
+      d.actual_total, d.actual_count
+    FROM ledger_drift d
+    WHERE d.actual_count > 0;
+  END IF;
+
+  RETURN QUERY SELECT * FROM ledger_drift;
+END;
+$$;
+
+-- Backfill, so the read paths see existing transactions as soon as they move
+-- to this table
+SELECT count(*) AS backfilled_keys FROM public.reconcile_ledger_totals();
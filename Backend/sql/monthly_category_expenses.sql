@@ -0,0 +1,56 @@
+-- Monthly per-category expense totals used by the expense forecast.
+--
+-- Returns, for each requested user, the sums of the most recent p_months
+-- complete months that have expenses, looking back at most p_lookback_months.
+-- The result is at most users x p_months x categories rows, however long the
+-- transaction history is. The sums are read from ledger_monthly_totals (see
+-- ledger_monthly_totals.sql), so the query itself is O(months x categories).
+-- The SQLite stand-in in
+-- app/infrastructure/implementation/monthly_expense_source.py implements the
+-- same contract over raw transactions.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+CREATE INDEX IF NOT EXISTS transactions_user_type_created_at_idx
+  ON public.transactions (user_id, transaction_type, created_at);
+
+CREATE OR REPLACE FUNCTION public.monthly_category_expenses(
+  p_user_ids uuid[],
+  p_months integer DEFAULT 3,
+  p_lookback_months integer DEFAULT 24
+)
+RETURNS TABLE (
+  user_id uuid,
+  month date,
+  category_name text,
+  total double precision
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH monthly AS (
+    SELECT
+      l.user_id,
+      l.month,
+      c.category_name::text AS category_name,
+      sum(l.total) AS total
+    FROM public.ledger_monthly_totals l
+    JOIN public.categories c ON c.category_id = l.category_id
+    WHERE l.user_id = ANY (p_user_ids)
+      AND l.transaction_type = 'Expense'
+      AND l.month >= (date_trunc('month', now() AT TIME ZONE 'UTC')
+                      - make_interval(months => p_lookback_months))::date
+      AND l.month < date_trunc('month', now() AT TIME ZONE 'UTC')::date
+    GROUP BY 1, 2, 3
+  ),
+  ranked AS (
+    SELECT
+      m.*,
+      dense_rank() OVER (PARTITION BY m.user_id ORDER BY m.month DESC) AS recency
+    FROM monthly m
+  )
+  SELECT r.user_id, r.month, r.category_name, r.total
+  FROM ranked r
+  WHERE r.recency <= p_months
+  ORDER BY r.user_id, r.month, r.category_name;
+$$;
@@ -0,0 +1,16 @@
+-- Indexes behind keyset pagination of the transaction listings.
+--
+-- Listings are ordered by (created_at DESC NULLS LAST, transaction_id DESC)
+-- and resume after the last row of the previous page, so each page is an
+-- index range scan whatever its depth. See app/core/pagination.py.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+CREATE INDEX IF NOT EXISTS transactions_keyset_idx
+  ON public.transactions (created_at DESC NULLS LAST, transaction_id DESC);
+
+CREATE INDEX IF NOT EXISTS transactions_user_keyset_idx
+  ON public.transactions (user_id, created_at DESC NULLS LAST, transaction_id DESC);
+
+CREATE INDEX IF NOT EXISTS transactions_category_keyset_idx
+  ON public.transactions (category_id, created_at DESC NULLS LAST, transaction_id DESC);
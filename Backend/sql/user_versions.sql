@@ -0,0 +1,27 @@
+-- Per-user data version behind the ETags of the user-scoped read endpoints.
+--
+-- Every write through the repositories calls bump_user_versions for the users
+-- it touched. A bump sets the user's version to the next value of a global
+-- sequence, so a value is never handed out twice, even to a deleted and
+-- recreated user. Users without a row have version 0. Reads look the version
+-- up by primary key before fetching any rows; see app/core/user_versions.py.
+--
+-- Apply with the Supabase SQL editor or `psql -f`.
+
+CREATE SEQUENCE IF NOT EXISTS public.user_version_seq;
+
+CREATE TABLE IF NOT EXISTS public.user_versions (
+  user_id uuid PRIMARY KEY,
+  version bigint NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION public.bump_user_versions(p_user_ids uuid[])
+RETURNS void
+LANGUAGE sql
+VOLATILE
+AS $$
+  INSERT INTO public.user_versions (user_id, version)
+  SELECT u.user_id, nextval('public.user_version_seq')
+  FROM (SELECT DISTINCT unnest(p_user_ids) AS user_id) u
+  ON CONFLICT (user_id) DO UPDATE SET version = excluded.version;
+$$;
@@ -0,0 +1,96 @@
+"""
+Which chat questions may be answered from the shared answer cache.
+
+Run from the Backend folder:
+    python -m pytest tests
+"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "test.test.test")
+
+from app.core.answer_cache import SemanticAnswerCache, is_general_question
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "What is the 50/30/20 rule?",
+        "How does compound interest work?",
+        "What are good ways to build an emergency fund?",
+        "Explain the difference between a Roth and a traditional IRA",
+    ],
+)
+def test_general_questions_are_cacheable(question):
+    assert is_general_question(question)
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "How much can I save each month?",
+        "Can I buy a car next year?",
+        "Should I cut back on food?",
+        "What did we spend on groceries?",
+        "Is our budget too tight?",
+        "How much did I spend last month?",
+        "What's my biggest expense?",
+        "Give us a savings plan",
+        "I'm saving for a house, any tips?",
+    ],
+)
+def test_personal_questions_bypass_the_cache(question):
+    assert not is_general_question(question)
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "Explain that in more detail please",
+        "Can you elaborate on the second point?",
+        "What about the other option?",
+        "Tell me more about that",
+        "Why is that a good idea?",
+    ],
+)
+def test_follow_ups_bypass_the_cache(question):
+    assert not is_general_question(question)
+
+
+def test_mid_conversation_questions_bypass_the_cache(monkeypatch):
+    pytest.importorskip("langchain_fireworks")
+    os.environ.setdefault("API_KEY", "test")
+    from app.core.rag_model import FinancialChatbot
+
+    bot = FinancialChatbot.__new__(FinancialChatbot)
+    bot.general_chain = object()
+    bot.answer_cache = SemanticAnswerCache(threshold=0.9, ttl=60, max_entries=10)
+    history = {"u1": [("question", "answer")], "u2": []}
+    bot.user_sessions = SimpleNamespace(
+        get=lambda user_id: {
+            "memory": SimpleNamespace(
+                chat_memory=SimpleNamespace(messages=history[user_id])
+            )
+        }
+        if user_id in history
+        else None
+    )
+    embedded = []
+    monkeypatch.setattr(
+        "app.core.rag_model.embeddings",
+        SimpleNamespace(
+            embed_query=lambda question: embedded.append(question) or [1.0, 0.0]
+        ),
+    )
+    monkeypatch.setattr("app.core.rag_model.pdf_index_fingerprint", lambda: "pdfs")
+
+    question = "What is the 50/30/20 rule?"
+    assert bot._general_question_vector(question, "u1") is None
+    assert bot._general_question_vector(question, "u2") is not None
+    assert bot._general_question_vector(question, "new-user") is not None
+    assert embedded == [question, question]
+    assert bot.answer_cache.stats()["bypassed"] == 1
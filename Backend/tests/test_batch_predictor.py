@@ -0,0 +1,74 @@
+"""
+Concurrency of micro-batched calls.
+
+Run from the Backend folder:
+    python -m pytest tests
+"""
+
+import asyncio
+
+import numpy as np
+
+from app.core.batch_predictor import BatchPredictor, MicroBatcher
+
+
+def run_batcher(batcher, items):
+    async def main():
+        return await asyncio.gather(*(batcher.submit(item) for item in items))
+
+    return asyncio.run(main())
+
+
+def slow_batch_fn(delay, calls):
+    async def batch_fn(inputs):
+        calls["running"] += 1
+        calls["peak"] = max(calls["peak"], calls["running"])
+        await asyncio.sleep(delay)
+        calls["running"] -= 1
+        return [x * 2 for x in inputs]
+
+    return batch_fn
+
+
+def test_batch_calls_overlap_up_to_max_in_flight():
+    calls = {"running": 0, "peak": 0}
+    batcher = MicroBatcher(
+        slow_batch_fn(0.05, calls), max_batch_size=4, max_wait_ms=1, max_in_flight=3
+    )
+    assert run_batcher(batcher, range(40)) == [x * 2 for x in range(40)]
+    assert calls["peak"] == 3
+    assert batcher.stats()["items"] == 40
+
+
+def test_batch_calls_run_one_at_a_time_by_default():
+    calls = {"running": 0, "peak": 0}
+    batcher = MicroBatcher(slow_batch_fn(0.01, calls), max_batch_size=4, max_wait_ms=1)
+    assert run_batcher(batcher, range(12)) == [x * 2 for x in range(12)]
+    assert calls["peak"] == 1
+
+
+def test_failed_batch_fails_only_its_inputs():
+    async def batch_fn(inputs):
+        if 0 in inputs:
+            raise ValueError("bad batch")
+        return inputs
+
+    async def main():
+        batcher = MicroBatcher(
+            batch_fn, max_batch_size=1, max_wait_ms=1, max_in_flight=2
+        )
+        return await asyncio.gather(
+            batcher.submit(0), batcher.submit(1), return_exceptions=True
+        )
+
+    failed, ok = asyncio.run(main())
+    assert isinstance(failed, ValueError)
+    assert ok == 1
+
+
+def test_batch_predictor_stacks_inputs():
+    predictor = BatchPredictor(
+        lambda x: x.sum(axis=(1, 2))[:, None], max_batch_size=8, max_wait_ms=1
+    )
+    xs = [np.full((3, 1), i, dtype=np.float32) for i in range(5)]
+    assert run_batcher(predictor, xs) == [3.0 * i for i in range(5)]
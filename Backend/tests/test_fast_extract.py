@@ -0,0 +1,97 @@
+"""
+Dates the rule-based extraction resolves itself, and the ones it leaves to
+the LLM.
+
+Run from the Backend folder:
+    python -m pytest tests
+"""
+
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+os.environ.setdefault("SUPABASE_URL", "http://127.0.0.1:54321")
+os.environ.setdefault("SUPABASE_KEY", "test.test.test")
+
+from app.core.fast_extract import extract_rule_based
+
+NOW = datetime(2026, 10, 18, 15, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize(
+    "text, created_at",
+    [
+        ("lunch 50 today", "2026-10-18 15:30:00+00"),
+        ("lunch 50 yesterday", "2026-10-17 15:30:00+00"),
+        ("lunch 50 31/12", "2025-12-31 00:00:00+00"),
+        ("lunch 50 15/10", "2026-10-15 00:00:00+00"),
+        ("lunch 50 20/10", "2025-10-20 00:00:00+00"),
+        ("lunch 50 3/3/26", "2026-03-03 00:00:00+00"),
+        ("lunch 50 2026-09-01", "2026-09-01 00:00:00+00"),
+    ],
+)
+def test_dates(text, created_at):
+    result = extract_rule_based(text, NOW)
+    assert result is not None
+    assert result["created_at"] == created_at
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Not a valid day-first date; once read as October 12th, 1931
+        "lunch 50 12/31",
+        # Either March 5th or May 3rd
+        "lunch 50 5/3",
+        "lunch 50 31/02",
+        "lunch 50 2026-13-01",
+        # More than a year ago, or in the future
+        "lunch 50 2024-10-01",
+        "lunch 50 1/1/2020",
+        "lunch 50 2026-12-01",
+        "lunch 50 25/12/26",
+    ],
+)
+def test_doubtful_dates_go_to_the_llm(text):
+    assert extract_rule_based(text, NOW) is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # A spending verb next to an income keyword
+        "spent 200 on stocks today",
+        "paid 3000 wages yesterday",
+        "paid client 200 yesterday",
+        "paid 200 loan interest yesterday",
+        "paid 200 interest on loan",
+        # An income verb next to an expense keyword
+        "received 500 for lunch today",
+        # Words that are paid as often as earned
+        "interest 200 today",
+        "stocks 1000 yesterday",
+    ],
+)
+def test_contradicting_or_ambiguous_type_goes_to_the_llm(text):
+    assert extract_rule_based(text, NOW) is None
+
+
+@pytest.mark.parametrize(
+    "text, transaction_type, category",
+    [
+        ("spent 200 on lunch today", "Expense", "Food"),
+        ("paid 150 for a taxi yesterday", "Expense", "Transportation"),
+        ("received salary 8000 today", "Income", "Salary"),
+        ("earned 300 freelance yesterday", "Income", "Freelance"),
+        ("dividends 120 today", "Income", "Investments"),
+    ],
+)
+def test_direction_verbs_agreeing_with_the_keyword(text, transaction_type, category):
+    result = extract_rule_based(text, NOW)
+    assert result is not None
+    assert (result["transaction_type"], result["category"]) == (
+        transaction_type,
+        category,
+    )
+    assert result["confidence"] == 1.0
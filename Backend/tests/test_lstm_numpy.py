@@ -0,0 +1,55 @@
+"""
+The NumPy LSTM that serves forecasts against Keras.
+
+The stored check uses the Keras predictions saved in lstm.npz at export time;
+the live one needs TensorFlow and is skipped without it.
+
+Run from the Backend folder:
+    python -m pytest tests
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from app.core.lstm_numpy import load_npz, load_reference, reference_inputs
+
+MODEL_DIR = os.path.join("app", "core", "TimeSeries")
+NPZ_PATH = os.path.join(MODEL_DIR, "lstm.npz")
+# Predictions are around 1700; float32 vs Keras kernels differ in the 4th decimal
+RTOL, ATOL = 1e-4, 1e-2
+
+
+def numpy_predict(raw: np.ndarray) -> np.ndarray:
+    model, scaler = load_npz(NPZ_PATH)
+    scaled = scaler.transform(raw.reshape(-1, raw.shape[-1])).reshape(raw.shape)
+    return model.predict(scaled)
+
+
+def test_matches_stored_keras_outputs():
+    reference = load_reference(NPZ_PATH)
+    assert reference is not None, "re-export lstm.npz with TensorFlow installed"
+    raw, expected = reference
+    np.testing.assert_allclose(numpy_predict(raw), expected, rtol=RTOL, atol=ATOL)
+
+
+def test_batched_and_single_predictions_agree():
+    raw = reference_inputs(8)
+    batched = numpy_predict(raw)
+    single = np.concatenate([numpy_predict(raw[i : i + 1]) for i in range(len(raw))])
+    assert batched.shape == (8, 1)
+    np.testing.assert_allclose(batched, single, rtol=1e-6)
+
+
+def test_matches_live_keras():
+    pytest.importorskip("tensorflow")
+    import joblib
+    from tensorflow.keras.models import load_model
+
+    model = load_model(os.path.join(MODEL_DIR, "lstm.h5"))
+    scaler = joblib.load(os.path.join(MODEL_DIR, "scaler.save"))
+    raw = reference_inputs(16)
+    scaled = scaler.transform(raw.reshape(-1, raw.shape[-1])).reshape(raw.shape)
+    expected = model.predict(scaled, verbose=0)
+    np.testing.assert_allclose(numpy_predict(raw), expected, rtol=RTOL, atol=ATOL)
@@ -0,0 +1,73 @@
+"""
+Incremental rebuilds of the saved PDF index.
+
+Run from the Backend folder:
+    python -m pytest tests
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("langchain_community")
+
+from langchain.schema import Document
+
+from app.core import pdf_index
+from app.core.pdf_index import load_or_build_pdf_index, pdf_index_fingerprint
+
+
+class FakeEmbeddings:
+    model = "fake"
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+
+class TextLoader:
+    """Reads the test "PDFs", which are plain text files."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            return [Document(page_content=f.read(), metadata={"page": 0})]
+
+
+@pytest.fixture
+def pdfs(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_index, "PyPDFLoader", TextLoader)
+
+    def write(name, text):
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    return write
+
+
+def test_identical_pdfs_are_both_indexed(tmp_path, pdfs):
+    paths = [pdfs("a.pdf", "Save 20% of income."), pdfs("b.pdf", "Save 20% of income.")]
+    store = load_or_build_pdf_index(paths, FakeEmbeddings(), str(tmp_path / "idx"))
+    sources = {doc.metadata["source"] for doc in store.docstore._dict.values()}
+    assert sources == {"a.pdf", "b.pdf"}
+
+
+def test_removing_every_pdf_clears_the_saved_index(tmp_path, pdfs):
+    index_dir = str(tmp_path / "idx")
+    path = pdfs("a.pdf", "Pay yourself first.")
+    assert load_or_build_pdf_index([path], FakeEmbeddings(), index_dir) is not None
+    assert pdf_index_fingerprint(index_dir) is not None
+
+    os.remove(path)
+    assert load_or_build_pdf_index([path], FakeEmbeddings(), index_dir) is None
+    assert pdf_index_fingerprint(index_dir) is None
+    assert not os.path.exists(os.path.join(index_dir, "index.faiss"))
+
+    pdfs("a.pdf", "Pay yourself first.")
+    assert load_or_build_pdf_index([path], FakeEmbeddings(), index_dir) is not None
@@ -0,0 +1,79 @@
+"""
+Incremental sync of the shared transaction index.
+
+Run from the Backend folder:
+    python -m pytest tests
+"""
+
+import pytest
+
+pytest.importorskip("faiss")
+pytest.importorskip("langchain")
+
+from app.core.transaction_index import SharedTransactionIndex
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.fail = False
+        self.embedded = 0
+
+    def _vector(self, text):
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+    def embed_documents(self, texts):
+        if self.fail:
+            raise RuntimeError("embedding provider down")
+        self.embedded += len(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._vector(text)
+
+
+def rows(*amounts):
+    return [
+        {
+            "transaction_id": f"tx{i}",
+            "created_at": f"2026-10-{i + 1:02d}T10:00:00+00:00",
+            "amount": amount,
+            "transaction_type": "Expense",
+            "description": "lunch",
+        }
+        for i, amount in enumerate(amounts)
+    ]
+
+
+def test_sync_embeds_only_new_and_edited_transactions():
+    embeddings = FakeEmbeddings()
+    index = SharedTransactionIndex(embeddings)
+    assert index.sync("u1", rows(10, 20)) == (2, 0)
+    assert index.sync("u1", rows(10, 20)) == (0, 0)
+    assert index.sync("u1", rows(10, 25, 30)) == (2, 0)
+    assert index.sync("u1", rows(10)) == (0, 2)
+    assert len(index.search("u1", "lunch", 5)) == 1
+
+
+def test_failed_embedding_is_retried_on_the_next_sync():
+    embeddings = FakeEmbeddings()
+    index = SharedTransactionIndex(embeddings)
+    embeddings.fail = True
+    with pytest.raises(RuntimeError):
+        index.sync("u1", rows(10, 20))
+    assert index.stats()["transactions"] == 0
+
+    embeddings.fail = False
+    assert index.sync("u1", rows(10, 20)) == (2, 0)
+    assert len(index.search("u1", "lunch", 5)) == 2
+
+
+def test_failed_edit_keeps_the_old_vectors_and_is_retried():
+    embeddings = FakeEmbeddings()
+    index = SharedTransactionIndex(embeddings)
+    index.sync("u1", rows(10, 20))
+    embeddings.fail = True
+    with pytest.raises(RuntimeError):
+        index.sync("u1", rows(10, 99))
+    embeddings.fail = False
+    assert index.sync("u1", rows(10, 99)) == (1, 0)
+    assert any("99" in d.page_content for d in index.search("u1", "lunch", 5))